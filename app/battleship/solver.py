@@ -8,6 +8,8 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from dpll.solver import solve, get_vars
+from dpll.cardinality import ExactlyOne
+from dpll.batch import solve_many
 from app.battleship.backtracking import solve_battleship as backtracking_solve
 from app.battleship.backtracking import UNKNOWN, WATER, SHIP
 
@@ -78,11 +80,8 @@ def generate_battleship_clauses(board, fleet):
     for i in range(len(fleet)):
         ship_vars = vars_by_ship[i]
         
-        clauses.append(ship_vars)
-        
-        for idx1 in range(len(ship_vars)):
-            for idx2 in range(idx1 + 1, len(ship_vars)):
-                clauses.append([f"-{ship_vars[idx1]}", f"-{ship_vars[idx2]}"])
+        # Each ship takes exactly one placement
+        clauses.append(ExactlyOne(ship_vars))
         
     for i in range(len(fleet)):
         for j in range(i + 1, len(fleet)):
@@ -108,11 +107,11 @@ def solve_battleship(board, fleet, heuristics_list):
                         board[r][c] = WATER
         return result
     
-    clauses = generate_battleship_clauses(board, fleet)
-    vars_list = get_vars(clauses)
-    
+    vars_list, clauses = battleship_formula(board, fleet)
     model = solve(vars_list, clauses, heuristics_list)
-    
+    return place_ships(board, fleet, model)
+
+def place_ships(board, fleet, model):
     if model is False:
         return False
     
@@ -140,6 +139,17 @@ def solve_battleship(board, fleet, heuristics_list):
 
     return True
 
+def battleship_formula(board, fleet):
+    clauses = generate_battleship_clauses(board, fleet)
+    return get_vars(clauses), clauses
+
+def solve_battleship_batch(puzzles, heuristics_list, workers=None, chunksize=8):
+    # puzzles holds (board, fleet) pairs; boards are filled in place in input order
+    puzzles = list(puzzles)
+    formulas = (battleship_formula(board, fleet) for board, fleet in puzzles)
+    results = solve_many(formulas, heuristics_list, workers, chunksize)
+    return [place_ships(board, fleet, model) for (board, fleet), model in zip(puzzles, results)]
+
 def print_board(board):
     GREY = '\033[90m'
     BLUE = '\033[94m'
@@ -182,7 +192,7 @@ if __name__ == "__main__":
     heuristics = sys.argv[1:]
     
     if not heuristics:
-        heuristics = ["unit"]
+        heuristics = ["auto"]
 
     print("heuristics:", heuristics)
         
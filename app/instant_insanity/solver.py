@@ -9,6 +9,8 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from dpll.solver import solve, get_vars
+from dpll.cardinality import ExactlyOne
+from dpll.batch import solve_many
 
 # ==============================================================================
 # 1. CUBE GEOMETRY & UTILS
@@ -85,13 +87,8 @@ def generate_insanity_clauses(cubes):
     
     # 1. State Constraints: Each cube must be in exactly one state
     for i in range(num_cubes):
-        # At least one state
-        clauses.append([variable(i, s) for s in range(num_states)])
-        
-        # At most one state (pairwise exclusion)
-        for s1 in range(num_states):
-            for s2 in range(s1 + 1, num_states):
-                clauses.append([f"-{variable(i, s1)}", f"-{variable(i, s2)}"])
+        # Native exactly-one instead of 276 pairwise exclusions per cube
+        clauses.append(ExactlyOne([variable(i, s) for s in range(num_states)]))
 
     # 2. Puzzle Constraints: Sides must have unique colors
     # For every pair of cubes, if their chosen states put the SAME color 
@@ -136,13 +133,13 @@ def generate_insanity_clauses(cubes):
 
 def solve_instant_insanity(cubes, heuristics_list=None):
     if heuristics_list is None:
-        heuristics_list = ["unit"]
+        heuristics_list = ["auto"]
 
-    clauses = generate_insanity_clauses(cubes)
-    vars_list = get_vars(clauses)
-    
+    vars_list, clauses = insanity_formula(cubes)
     model = solve(vars_list, clauses, heuristics_list)
-    
+    return decode_solution(cubes, model)
+
+def decode_solution(cubes, model):
     if model is False:
         return False
     
@@ -168,6 +165,18 @@ def solve_instant_insanity(cubes, heuristics_list=None):
             
     return solution
 
+def insanity_formula(cubes):
+    clauses = generate_insanity_clauses(cubes)
+    return get_vars(clauses), clauses
+
+def solve_instant_insanity_batch(puzzles, heuristics_list=None, workers=None, chunksize=8):
+    # One solution (or False) per puzzle, in input order
+    if heuristics_list is None:
+        heuristics_list = ["auto"]
+    puzzles = list(puzzles)
+    results = solve_many((insanity_formula(cubes) for cubes in puzzles), heuristics_list, workers, chunksize)
+    return [decode_solution(cubes, model) for cubes, model in zip(puzzles, results)]
+
 def print_solution(solution):
     print("\nSOLUTION FOUND:")
     print("Stack configuration (Top to Bottom):")
@@ -218,7 +227,7 @@ if __name__ == "__main__":
     # Note: If your input strings are different (e.g., standard unfolding), 
     # you simply map them to the [F, B, L, R, T, B] indices before passing here.
     
-    heuristics = sys.argv[1:] if len(sys.argv) > 1 else ["unit"]
+    heuristics = sys.argv[1:] if len(sys.argv) > 1 else ["auto"]
     
     print("Instant Insanity Solver")
     print(f"Heuristics: {heuristics}")
@@ -8,33 +8,29 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from dpll.solver import solve, get_vars
+from dpll.cardinality import ExactlyOne
+from dpll.incremental import Solver
+from dpll.batch import solve_many
 from app.sudoku.backtracking import solve_sudoku as backtracking_solve
 
 def variable(r, c, n):
     return f"{r}-{c}-{n}"
 
 def generate_sudoku_clauses():
+    # Every group is an exactly-one constraint: the watched-literal engines
+    # propagate it natively, the others expand it to pairwise clauses
     clauses = []
     
     for r in range(9):
         for c in range(9):
-            clauses.append([variable(r, c, n) for n in range(1, 10)])
-            for n1 in range(1, 10):
-                for n2 in range(n1 + 1, 10):
-                    clauses.append([f"-{variable(r, c, n1)}", f"-{variable(r, c, n2)}"])
+            clauses.append(ExactlyOne([variable(r, c, n) for n in range(1, 10)]))
 
     for n in range(1, 10):
         for r in range(9):
-            clauses.append([variable(r, c, n) for c in range(9)])
-            for c1 in range(9):
-                for c2 in range(c1 + 1, 9):
-                    clauses.append([f"-{variable(r, c1, n)}", f"-{variable(r, c2, n)}"])
+            clauses.append(ExactlyOne([variable(r, c, n) for c in range(9)]))
         
         for c in range(9):
-            clauses.append([variable(r, c, n) for r in range(9)])
-            for r1 in range(9):
-                for r2 in range(r1 + 1, 9):
-                    clauses.append([f"-{variable(r1, c, n)}", f"-{variable(r2, c, n)}"])
+            clauses.append(ExactlyOne([variable(r, c, n) for r in range(9)]))
 
     for br in range(3):
         for bc in range(3):
@@ -44,29 +40,26 @@ def generate_sudoku_clauses():
                     for c_offset in range(3):
                         cells_in_box.append(variable(br * 3 + r_offset, bc * 3 + c_offset, n))
                 
-                clauses.append(cells_in_box)
-                for i in range(len(cells_in_box)):
-                    for j in range(i + 1, len(cells_in_box)):
-                        clauses.append([f"-{cells_in_box[i]}", f"-{cells_in_box[j]}"])
+                clauses.append(ExactlyOne(cells_in_box))
                         
     return clauses
 
 BASE_SUDOKU_CLAUSES = generate_sudoku_clauses()
 
-def solve_sudoku(board, heuristics_list):
-    if "backtracking" in heuristics_list:
-        return backtracking_solve(board)
-    
+# One incremental solver per branching heuristic, loaded with the rules once
+INCREMENTAL_SOLVERS = {}
+
+def incremental_solver(heuristic="vsids"):
+    if heuristic not in INCREMENTAL_SOLVERS:
+        INCREMENTAL_SOLVERS[heuristic] = Solver(BASE_SUDOKU_CLAUSES, heuristic)
+    return INCREMENTAL_SOLVERS[heuristic]
+
+def sudoku_formula(board):
     clauses = copy.deepcopy(BASE_SUDOKU_CLAUSES)
-    
-    for r in range(9):
-        for c in range(9):
-            if board[r][c] != 0:
-                clauses.append([variable(r, c, board[r][c])])
+    clauses.extend([variable(r, c, board[r][c])] for r in range(9) for c in range(9) if board[r][c] != 0)
+    return get_vars(clauses), clauses
 
-    vars_list = get_vars(clauses)
-    model = solve(vars_list, clauses, heuristics_list)
-    
+def fill_board(board, model):
     if not model or model is False:
         return False
     
@@ -80,6 +73,27 @@ def solve_sudoku(board, heuristics_list):
                         break
     return True
 
+def solve_sudoku(board, heuristics_list):
+    if "backtracking" in heuristics_list:
+        return backtracking_solve(board)
+    
+    if heuristics_list and heuristics_list[0] == "incremental":
+        # The givens are assumptions, so clauses learned on one board stay valid for the next
+        givens = [variable(r, c, board[r][c]) for r in range(9) for c in range(9) if board[r][c] != 0]
+        heuristic = heuristics_list[1] if len(heuristics_list) > 1 else "vsids"
+        model = incremental_solver(heuristic).solve(givens)
+    else:
+        vars_list, clauses = sudoku_formula(board)
+        model = solve(vars_list, clauses, heuristics_list)
+    
+    return fill_board(board, model)
+
+def solve_sudoku_batch(boards, heuristics_list, workers=None, chunksize=64):
+    # Boards are encoded here, solved in worker processes and filled in place in input order
+    boards = list(boards)
+    results = solve_many((sudoku_formula(board) for board in boards), heuristics_list, workers, chunksize)
+    return [fill_board(board, model) for board, model in zip(boards, results)]
+
 def print_board(board, original_board=None):
     GREY = '\033[90m'
     GREEN = '\033[92m'
@@ -127,7 +141,7 @@ if __name__ == "__main__":
     heuristics = sys.argv[1:]
     
     if not heuristics:
-        heuristics = ["unit"]
+        heuristics = ["auto"]
 
     print("heuristics:", heuristics)
         
@@ -15,6 +15,8 @@ from app.vertexcover.solver import (
     example_graph_2,
     example_graph_3
 )
+from dpll.budget import Budget, UNKNOWN
+from dpll.encodings import ENCODINGS
 
 def visualize_graph(graph, cover=None, title="Vertex Cover", layout="spring"):
     """Visualize graph with matplotlib and networkx."""
@@ -196,8 +198,8 @@ def print_graph_info(graph):
 
 def main():
     parser = argparse.ArgumentParser(description='Vertex Cover Solver')
-    parser.add_argument('heuristics', nargs='*', default=['unit'],
-                       help='SAT heuristics: unit, pure, backtracking, etc.')
+    parser.add_argument('heuristics', nargs='*', default=['auto'],
+                       help='SAT heuristics: auto (default), unit, pure, cdcl, backtracking, etc.')
     parser.add_argument('--visualize', '-v', action='store_true',
                        help='Show graph visualization')
     parser.add_argument('--graph', '-g', type=int, default=2, choices=[1, 2, 3],
@@ -207,6 +209,10 @@ def main():
                        help='Graph layout algorithm')
     parser.add_argument('--no-text', action='store_true',
                        help='Skip text output (visualization only)')
+    parser.add_argument('--timeout', '-t', type=float, default=None,
+                       help='Give up after this many seconds')
+    parser.add_argument('--encoding', '-e', default='totalizer', choices=list(ENCODINGS),
+                       help='Cardinality encoding for the cover size')
     
     args = parser.parse_args()
     
@@ -220,6 +226,7 @@ def main():
     print("=" * 60)
     print(f"Heuristics: {args.heuristics}")
     print(f"Graph: example_{args.graph}")
+    print(f"Encoding: {args.encoding}")
     
     if not args.no_text:
         print_graph_info(graph)
@@ -230,11 +237,17 @@ def main():
     print("=" * 60)
     
     start_time = time.time()
-    cover = solve_vertex_cover(graph, k=None, heuristics_list=args.heuristics)
+    budget = None if args.timeout is None else Budget(args.timeout)
+    cover = solve_vertex_cover(graph, k=None, heuristics_list=args.heuristics, budget=budget,
+                               encoding=args.encoding)
     elapsed_time = time.time() - start_time
     
     # Print results
-    if cover is not False:
+    if cover is UNKNOWN:
+        print(f"\n\033[93mtimed out :|\033[0m")
+        print(f"time: {elapsed_time:.6f}s")
+        return
+    elif cover is not False:
         print(f"\n\033[92msolved :)\033[0m")
         print(f"time: {elapsed_time:.6f}s")
         
@@ -7,17 +7,22 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from dpll.solver import solve, get_vars
+from dpll.incremental import Solver
+from dpll.budget import UNKNOWN
+from dpll.encodings import AuxiliaryVariables, exactly_k, negate, unary_counter
 from app.vertexcover.backtracking import find_minimum_vertex_cover as backtracking_solve
 
 def variable(vertex):
     """Variable representing vertex in cover."""
     return f"v{vertex}"
 
-def generate_vertex_cover_clauses(graph, k):
+def generate_vertex_cover_clauses(graph, k, encoding="totalizer"):
     """
     Generate SAT clauses for vertex cover of size k.
     - For each edge (u,v): at least one of u or v must be in cover
     - Exactly k vertices in the cover (using at-most-k and at-least-k)
+    The cardinality part uses the named encoding from dpll.encodings;
+    'binomial' is the auxiliary-free one, one clause per (k+1)-subset.
     """
     clauses = []
     n = len(graph)
@@ -28,38 +33,77 @@ def generate_vertex_cover_clauses(graph, k):
             if u < v:  # Each edge once
                 clauses.append([variable(u), variable(v)])
     
-    # At-most-k constraint: no more than k vertices
-    # For all combinations of (k+1) vertices, at least one must be false
-    if k < n:
-        from itertools import combinations
-        for combo in combinations(range(n), k + 1):
-            clauses.append([f"-{variable(v)}" for v in combo])
-    
-    # At-least-k constraint: at least k vertices must be true
-    # This is harder to encode efficiently, but for small k we can use:
-    # "At most (n-k) vertices are NOT in the cover"
-    if k > 0:
-        from itertools import combinations
-        for combo in combinations(range(n), n - k + 1):
-            clauses.append([variable(v) for v in combo])
+    # Exactly k vertices: at most k in the cover and at most n-k outside it
+    clauses.extend(exactly_k([variable(v) for v in range(n)], k, encoding, AuxiliaryVariables("a")))
     
     return clauses
 
-def solve_vertex_cover(graph, k=None, heuristics_list=None):
+def solve_vertex_cover_incremental(graph, k=None, heuristic="vsids", budget=None):
+    """
+    Solve vertex cover with one incremental solver.
+    The edge clauses and a dpll.encodings.unary_counter over the vertex
+    variables are built once; the bound on the cover size is an
+    assumption on one counter output, so learned clauses carry over
+    between bounds.
+    With k None every model found lowers the bound below its own cover
+    size, until the solver proves no smaller cover exists.
+    An optional dpll.budget.Budget limits all the solver calls together.
+
+    Returns: list of vertex indices in cover, False if no solution, or
+    UNKNOWN if the budget ran out first
+    """
+    n = len(graph)
+    solver = Solver(heuristic=heuristic)
+    for u in range(n):
+        solver.add_variable(variable(u))
+        for v in graph[u]:
+            if u < v:
+                solver.add_clause([variable(u), variable(v)])
+    clauses, counts = unary_counter([variable(v) for v in range(n)], AuxiliaryVariables("s"))
+    for clause in clauses:
+        solver.add_clause(clause)
+
+    def at_most(bound):
+        return [negate(counts[bound])] if bound < n else []
+
+    best = False
+    bound = n if k is None else k
+    while bound >= 0:
+        model = solver.solve(at_most(bound), budget)
+        if model is UNKNOWN:
+            return UNKNOWN
+        if model is False:
+            break
+        best = [v for v in range(n) if model[variable(v)] is True]
+        if k is not None:
+            break
+        bound = len(best) - 1
+    return best
+
+def solve_vertex_cover(graph, k=None, heuristics_list=None, budget=None, encoding="totalizer"):
     """
     Solve vertex cover problem.
     If k is None, find minimum k.
     If 'backtracking' in heuristics_list, use backtracking algorithm.
+    encoding names the cardinality encoding (see dpll.encodings.ENCODINGS);
+    the incremental solver always bounds a dpll.encodings.unary_counter.
+    An optional dpll.budget.Budget limits all the SAT calls together; the
+    backtracking algorithm ignores it.
     
-    Returns: list of vertex indices in cover, or False if no solution
+    Returns: list of vertex indices in cover, False if no solution, or
+    UNKNOWN if the budget ran out first
     """
     if heuristics_list is None:
-        heuristics_list = ["unit"]
+        heuristics_list = ["auto"]
     
     if "backtracking" in heuristics_list:
         cover = backtracking_solve(graph)
         return cover if cover else False
     
+    if heuristics_list and heuristics_list[0] == "incremental":
+        heuristic = heuristics_list[1] if len(heuristics_list) > 1 else "vsids"
+        return solve_vertex_cover_incremental(graph, k, heuristic, budget)
+    
     n = len(graph)
     
     # If k not specified, find minimum k by trying incrementally
@@ -69,10 +113,12 @@ def solve_vertex_cover(graph, k=None, heuristics_list=None):
         
         # Try to find minimum k
         for test_k in range(lower, upper + 1):
-            clauses = generate_vertex_cover_clauses(graph, test_k)
+            clauses = generate_vertex_cover_clauses(graph, test_k, encoding)
             vars_list = get_vars(clauses)
-            model = solve(vars_list, clauses, heuristics_list)
+            model = solve(vars_list, clauses, heuristics_list, budget=budget)
             
+            if model is UNKNOWN:
+                return UNKNOWN
             if model is not False:
                 cover = [v for v in range(n) if variable(v) in model and model[variable(v)] is True]
                 return cover
@@ -80,12 +126,12 @@ def solve_vertex_cover(graph, k=None, heuristics_list=None):
         return False
     
     # Solve for specific k
-    clauses = generate_vertex_cover_clauses(graph, k)
+    clauses = generate_vertex_cover_clauses(graph, k, encoding)
     vars_list = get_vars(clauses)
-    model = solve(vars_list, clauses, heuristics_list)
+    model = solve(vars_list, clauses, heuristics_list, budget=budget)
     
-    if model is False:
-        return False
+    if model is UNKNOWN or model is False:
+        return model
     
     cover = [v for v in range(n) if variable(v) in model and model[variable(v)] is True]
     return cover
@@ -132,7 +178,7 @@ if __name__ == "__main__":
     # Simple test when run directly
     import time
     
-    heuristics = sys.argv[1:] if len(sys.argv) > 1 else ["unit"]
+    heuristics = sys.argv[1:] if len(sys.argv) > 1 else ["auto"]
     graph = example_graph_2
     
     print("heuristics:", heuristics)
@@ -1,6 +1,9 @@
 import sys
 import os
 import copy
+import math
+import time
+import tracemalloc
 import pytest
 import pdb
 
@@ -8,12 +11,25 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from dpll.solver import solve, get_vars
-from app.sudoku.solver import solve_sudoku, example_board
+from dpll.solver import solve, solve_with_stats, get_vars
+from dpll.algorithms import solve_iterative, solve_cdcl
+from dpll.restarts import make_restart_policy
+from dpll.heuristics import VSIDSScorer, Rephaser, make_branching_heuristic
+from dpll.preprocess import Preprocessor
+from dpll.inprocess import Prober
+from dpll.portfolio import solve_portfolio, DEFAULT_PORTFOLIO
+from dpll.cube import solve_cube_and_conquer
+from dpll.batch import solve_many
+from dpll.encodings import ENCODINGS
+from dpll.budget import Budget
+from dpll.verifier import CompiledFormula
+from dpll.watched_literals import WatchedFormula
+from dpll.arena import ArenaFormula
+from app.sudoku.solver import solve_sudoku, solve_sudoku_batch, example_board
 from app.sudoku.backtracking import solve_sudoku as backtracking_solve_sudoku
-from app.vertexcover.solver import solve_vertex_cover
+from app.vertexcover.solver import solve_vertex_cover, generate_vertex_cover_clauses
 from app.vertexcover.backtracking import find_minimum_vertex_cover as backtracking_solve_vertex_cover
-from app.battleship.solver import solve_battleship
+from app.battleship.solver import solve_battleship, solve_battleship_batch
 from app.battleship.backtracking import solve_battleship as backtracking_solve_battleship
 from app.battleship.backtracking import UNKNOWN, WATER, SHIP
 from parser.cnf_parser import parse_dimacs_cnf
@@ -33,6 +49,9 @@ SUDOKU_HEURISTICS = [
     ["2wl"],
     ["2wli"],
     ["restarts"],
+    ["cdcl"],
+    ["incremental"],
+    ["auto"],
 ]
 
 # Battleship heuristic combinations to benchmark
@@ -43,6 +62,9 @@ BATTLESHIP_HEURISTICS = [
     ["2wl"],
     ["2wli"],
     ["restarts"],
+    ["cdcl"],
+    ["probe"],
+    ["auto"],
 ]
 
 # Vertex Cover heuristic combinations to benchmark
@@ -55,6 +77,8 @@ VERTEXCOVER_HEURISTICS = [
     ["vsids"],
     ["pure"],
     ["unit", "pure"],
+    ["incremental"],
+    ["auto"],
 ]
 
 # DPLL heuristic combinations to benchmark
@@ -67,6 +91,8 @@ DPLL_HEURISTICS = [
     ["vsids"],
     ["pure"],
     ["unit", "pure"],
+    ["bitset"],
+    ["auto"],
 ]
 
 
@@ -240,6 +266,42 @@ def test_vertexcover_dpll(benchmark, clq_files, heuristics):
 
     benchmark.pedantic(run_all_mvcs, rounds=1, iterations=1)
 
+def matching_cover_size(graph):
+    """Size of the cover made of both ends of a maximal matching (at most twice the minimum)"""
+    cover = set()
+    for u in range(len(graph)):
+        for v in graph[u]:
+            if u < v and u not in cover and v not in cover:
+                cover.update((u, v))
+    return len(cover)
+
+# The binomial encoding needs C(n, k+1) clauses; skip graphs where that explodes
+BINOMIAL_CLAUSE_LIMIT = 100000
+
+@pytest.mark.vertexcover
+@pytest.mark.benchmark(group="vertexcover-encodings")
+@pytest.mark.parametrize("encoding", list(ENCODINGS))
+def test_vertexcover_encodings(benchmark, clq_files, encoding):
+    """Benchmark cardinality encodings on covers of the matching size; clause counts go to extra_info"""
+    instances = []
+    for filepath in clq_files:
+        graph = parse_dimacs_clq(filepath)
+        n, k = len(graph), matching_cover_size(graph)
+        if encoding == "binomial" and math.comb(n, k + 1) + math.comb(n, n - k + 1) > BINOMIAL_CLAUSE_LIMIT:
+            continue
+        instances.append((os.path.basename(filepath), graph, k))
+    
+    clause_counts = {}
+    def run_all_mvcs():
+        for name, graph, k in instances:
+            clauses = generate_vertex_cover_clauses(graph, k, encoding)
+            clause_counts[name] = len(clauses)
+            solve_vertex_cover(graph, k, ["cdcl"], encoding=encoding)
+    
+    benchmark.pedantic(run_all_mvcs, rounds=1, iterations=1)
+    benchmark.extra_info.update(instances=len(instances), clauses=sum(clause_counts.values()),
+                                clauses_per_graph=clause_counts)
+
 @pytest.mark.vertexcover
 @pytest.mark.benchmark(group="vertexcover-backtracking")
 def test_vertexcover_backtracking(benchmark, clq_files):
@@ -282,10 +344,19 @@ def get_cnf_files(config):
 def load_cnf(filepath):
     """Load and prepare CNF problem"""
     num_vars, num_clauses, clauses = parse_dimacs_cnf(filepath)
-    # Convert integer literals to strings
-    clauses_str = [[str(lit) for lit in clause] for clause in clauses]
-    vars_list = get_vars(clauses_str)
-    return vars_list, clauses_str
+    # The solver takes DIMACS integer literals directly
+    vars_list = get_vars(clauses)
+    return vars_list, clauses
+
+
+def verify_results(problems, results):
+    """Check every model against its formula after the timed run; returns how many were verified"""
+    verified = 0
+    for (vars_list, clauses), result in zip(problems, results):
+        if isinstance(result, dict):
+            assert CompiledFormula(clauses).verify(result), "solver returned a model that violates its formula"
+            verified += 1
+    return verified
 
 
 @pytest.fixture
@@ -305,10 +376,373 @@ def test_dpll(benchmark, cnf_files, heuristics, request):
     # Load all problems once
     problems = [load_cnf(filepath) for filepath in cnf_files]
     
+    results = []
+    
     def run_all_problems():
         """Run solver on all problems"""
+        results.clear()
         for vars_list, clauses_original in problems:
             clauses = copy.deepcopy(clauses_original)
-            solve(vars_list, clauses, heuristics)
+            results.append(solve(vars_list, clauses, heuristics))
+    
+    benchmark.pedantic(run_all_problems, rounds=rounds, iterations=1)
+    benchmark.extra_info.update(verified=verify_results(problems, results))
+
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="stats")
+@pytest.mark.parametrize("collect", [False, True], ids=["off", "on"])
+@pytest.mark.parametrize("heuristics", [["unit"], ["2wl"], ["vsids"], ["cdcl"]], ids="_".join)
+def test_stats_overhead(benchmark, cnf_files, heuristics, collect):
+    """Benchmark the cost of collecting search statistics; the totals go to extra_info"""
+    problems = [load_cnf(filepath) for filepath in cnf_files]
+    totals = {}
     
-    benchmark.pedantic(run_all_problems, rounds=rounds, iterations=1)
\ No newline at end of file
+    def run_all_problems():
+        totals.clear()
+        for vars_list, clauses in problems:
+            if not collect:
+                solve(vars_list, clauses, heuristics)
+                continue
+            _, stats = solve_with_stats(vars_list, clauses, heuristics)
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+    
+    benchmark.pedantic(run_all_problems, rounds=1, iterations=1)
+    benchmark.extra_info.update(totals, instances=len(problems))
+
+
+# ============================================================================
+# BACKJUMPING BENCHMARKS
+# ============================================================================
+
+# backjump.cnf is refuted by level-0 propagation alone; the other files need
+# real search and show the difference in decisions
+BACKJUMP_FILES = [
+    "backjump.cnf",
+    "gemin1.cnf",
+    os.path.join("Bejing", "2bitcomp_5.cnf"),
+]
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="backjump")
+@pytest.mark.parametrize("backjump", [False, True], ids=["chronological", "backjump"])
+@pytest.mark.parametrize("filename", BACKJUMP_FILES, ids=os.path.basename)
+def test_backjump(benchmark, filename, backjump):
+    """Benchmark conflict-directed backjumping against chronological backtracking"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    stats = {}
+
+    def run_problem():
+        stats.clear()
+        solve_iterative(vars_list, copy.deepcopy(clauses), {}, None, 0, backjump, stats)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    # Decision and conflict counts show up in the saved benchmark JSON
+    benchmark.extra_info.update(stats)
+
+
+# ============================================================================
+# RESTART POLICY BENCHMARKS
+# ============================================================================
+
+RESTART_FILES = [
+    os.path.join("Bejing", "2bitcomp_5.cnf"),
+    os.path.join("Bejing", "2bitmax_6.cnf"),
+    os.path.join("Bejing", "3blocks.cnf"),
+]
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="restarts")
+@pytest.mark.parametrize("policy", [None, "luby", "geometric", "glucose"], ids=lambda p: p or "none")
+@pytest.mark.parametrize("filename", RESTART_FILES, ids=os.path.basename)
+def test_restart_policy(benchmark, filename, policy):
+    """Benchmark in-place restart policies on the CDCL engine"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    stats = {}
+
+    def run_problem():
+        stats.clear()
+        restart_policy = make_restart_policy(policy) if policy else None
+        solve_cdcl(vars_list, copy.deepcopy(clauses), {}, stats=stats, restart_policy=restart_policy)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats)
+
+
+# ============================================================================
+# PHASE SAVING BENCHMARKS
+# ============================================================================
+
+PHASE_BEJING_FILES = [
+    os.path.join(root_dir, "tests", "Bejing", name)
+    for name in ("2bitcomp_5.cnf", "2bitmax_6.cnf", "3blocks.cnf")
+]
+
+PHASE_MODES = {
+    "true-first": dict(phase_saving=False),
+    "saved": dict(phase_saving=True),
+    "rephase": dict(phase_saving=True, rephase=True),
+}
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="phase")
+@pytest.mark.parametrize("mode", list(PHASE_MODES))
+@pytest.mark.parametrize("suite", ["uf20-91", "Bejing"])
+def test_phase_saving(benchmark, cnf_files, suite, mode):
+    """Benchmark phase saving and rephasing in the iterative engine with Luby restarts"""
+    files = cnf_files if suite == "uf20-91" else PHASE_BEJING_FILES
+    problems = [load_cnf(filepath) for filepath in files]
+    options = PHASE_MODES[mode]
+    stats = {}
+
+    def run_all_problems():
+        stats.clear()
+        for vars_list, clauses in problems:
+            rephaser = Rephaser() if options.get("rephase") else None
+            solve_iterative(vars_list, copy.deepcopy(clauses), {}, VSIDSScorer(clauses), stats=stats,
+                            restart_policy=make_restart_policy("luby"),
+                            phase_saving=options["phase_saving"], rephaser=rephaser)
+
+    benchmark.pedantic(run_all_problems, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats)
+
+
+# ============================================================================
+# BRANCHING HEURISTIC BENCHMARKS
+# ============================================================================
+
+BRANCHING_FAMILIES = {
+    "Bejing": [
+        os.path.join(root_dir, "tests", "Bejing", name)
+        for name in ("2bitcomp_5.cnf", "2bitmax_6.cnf", "3blocks.cnf", "4blocksb.cnf")
+    ],
+    "misc": [os.path.join(root_dir, "tests", name) for name in ("backjump.cnf", "gemin1.cnf")],
+}
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="branching")
+@pytest.mark.parametrize("heuristic", ["vsids", "evsids", "lrb", "chb"])
+@pytest.mark.parametrize("family", ["uf20-91", "Bejing", "misc"])
+def test_branching_heuristic(benchmark, cnf_files, family, heuristic):
+    """Benchmark branching heuristics on the CDCL engine per instance family"""
+    files = cnf_files if family == "uf20-91" else BRANCHING_FAMILIES[family]
+    problems = [load_cnf(filepath) for filepath in files]
+    stats = {}
+
+    def run_all_problems():
+        stats.clear()
+        for vars_list, clauses in problems:
+            scorer = make_branching_heuristic(heuristic, clauses)
+            solve_cdcl(vars_list, copy.deepcopy(clauses), {}, scorer, stats=stats,
+                       restart_policy=make_restart_policy("glucose"))
+
+    benchmark.pedantic(run_all_problems, rounds=1, iterations=1)
+    # Totals over the family; divide by instances for per-instance figures
+    benchmark.extra_info.update(stats, instances=len(problems))
+
+
+# ============================================================================
+# PREPROCESSING BENCHMARKS
+# ============================================================================
+
+PREPROCESS_FILES = [
+    os.path.join("Bejing", name)
+    for name in ("2bitcomp_5.cnf", "2bitmax_6.cnf", "3blocks.cnf", "4blocksb.cnf", "e0ddr2-10-by-5-1.cnf")
+]
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="preprocess")
+@pytest.mark.parametrize("heuristics", [["cdcl"], ["cdcl", "preprocess"], ["cdcl", "bce"], ["cdcl", "preprocess", "bce"]],
+                         ids="_".join)
+@pytest.mark.parametrize("filename", PREPROCESS_FILES, ids=os.path.basename)
+def test_preprocess(benchmark, filename, heuristics):
+    """Benchmark CDCL with and without subsumption, variable and blocked clause elimination"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    preprocessor = Preprocessor(clauses)
+    simplified = preprocessor.run(eliminate="preprocess" in heuristics, block="bce" in heuristics) or []
+
+    def run_problem():
+        solve(vars_list, copy.deepcopy(clauses), heuristics)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    benchmark.extra_info.update(preprocessor.stats, clauses=len(clauses), simplified_clauses=len(simplified),
+                                vars=len(vars_list),
+                                simplified_vars=sum(not preprocessor.is_removed(v) for v in vars_list))
+
+
+# ============================================================================
+# PROBING BENCHMARKS
+# ============================================================================
+
+PROBE_FILES = [
+    os.path.join("Bejing", name)
+    for name in ("2bitadd_11.cnf", "2bitadd_12.cnf", "3blocks.cnf")
+]
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="probe")
+@pytest.mark.parametrize("probe", [False, True], ids=["restarts", "probe"])
+@pytest.mark.parametrize("filename", PROBE_FILES, ids=os.path.basename)
+def test_probe(benchmark, filename, probe):
+    """Benchmark failed-literal probing and equivalent-literal substitution at restarts"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    stats = {}
+
+    def run_problem():
+        stats.clear()
+        prober = Prober() if probe else None
+        solve_iterative(vars_list, copy.deepcopy(clauses), {}, VSIDSScorer(clauses), stats=stats,
+                        restart_policy=make_restart_policy("geometric"), prober=prober)
+        if prober is not None:
+            stats.update(prober.stats)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats)
+
+
+# ============================================================================
+# PORTFOLIO BENCHMARKS
+# ============================================================================
+
+PORTFOLIO_FILES = [
+    os.path.join("Bejing", name)
+    for name in ("2bitadd_11.cnf", "2bitadd_12.cnf", "3blocks.cnf", "4blocksb.cnf")
+]
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="portfolio")
+@pytest.mark.parametrize("workers", [0, 2, 4, 8], ids=lambda w: f"workers_{w}" if w else "cdcl")
+@pytest.mark.parametrize("filename", PORTFOLIO_FILES, ids=os.path.basename)
+def test_portfolio(benchmark, filename, workers):
+    """Benchmark a single CDCL run against racing DEFAULT_PORTFOLIO on a process pool"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    winner = {}
+
+    def run_problem():
+        if not workers:
+            solve(vars_list, copy.deepcopy(clauses), ["cdcl"])
+            return
+        _, config = solve_portfolio(vars_list, clauses, DEFAULT_PORTFOLIO, workers=workers, return_config=True)
+        winner.update(config)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    benchmark.extra_info.update(winner, cpus=os.cpu_count())
+
+
+# ============================================================================
+# CUBE-AND-CONQUER BENCHMARKS
+# ============================================================================
+
+CUBE_FILES = [
+    os.path.join("Bejing", name)
+    for name in ("2bitadd_11.cnf", "3blocks.cnf", "4blocksb.cnf", "e0ddr2-10-by-5-1.cnf")
+]
+
+# Single-worker time per (file, method), the baseline for the speedup figures
+CUBE_BASELINES = {}
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="cube")
+@pytest.mark.parametrize("workers", [1, 2, 4, 8], ids=lambda w: f"workers_{w}")
+@pytest.mark.parametrize("method", ["lookahead", "vsids"])
+@pytest.mark.parametrize("filename", CUBE_FILES, ids=os.path.basename)
+def test_cube_and_conquer(benchmark, filename, method, workers):
+    """Benchmark cube-and-conquer speedup over one worker as the worker count grows"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    stats = {}
+    elapsed = []
+
+    def run_problem():
+        stats.clear()
+        start = time.perf_counter()
+        solve_cube_and_conquer(vars_list, clauses, workers=workers, method=method, stats=stats)
+        elapsed.append(time.perf_counter() - start)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    # Workers run in ascending order, so the one-worker baseline is already there
+    baseline = CUBE_BASELINES.setdefault((filename, method), elapsed[0])
+    benchmark.extra_info.update(stats, speedup=round(baseline / elapsed[0], 2), cpus=os.cpu_count())
+
+
+# ============================================================================
+# BATCH BENCHMARKS
+# ============================================================================
+
+BATCH_WORKERS = [1, 2, 4, 8]
+
+@pytest.mark.sudoku
+@pytest.mark.benchmark(group="batch-sudoku")
+@pytest.mark.parametrize("workers", BATCH_WORKERS, ids=lambda w: f"workers_{w}")
+def test_sudoku_batch(benchmark, sudoku_puzzles, workers):
+    """Benchmark solving the Sudoku dataset across worker processes"""
+
+    def run_all_sudokus():
+        solve_sudoku_batch(copy.deepcopy(sudoku_puzzles), ["cdcl"], workers=workers)
+
+    benchmark.pedantic(run_all_sudokus, rounds=1, iterations=1)
+    benchmark.extra_info.update(puzzles=len(sudoku_puzzles), cpus=os.cpu_count())
+
+@pytest.mark.battleship
+@pytest.mark.benchmark(group="batch-battleship")
+@pytest.mark.parametrize("workers", BATCH_WORKERS, ids=lambda w: f"workers_{w}")
+def test_battleship_batch(benchmark, battleship_puzzles, workers):
+    """Benchmark solving the Battleship dataset across worker processes"""
+
+    def run_all_battleships():
+        solve_battleship_batch(copy.deepcopy(battleship_puzzles), ["cdcl"], workers=workers)
+
+    benchmark.pedantic(run_all_battleships, rounds=1, iterations=1)
+    benchmark.extra_info.update(puzzles=len(battleship_puzzles), cpus=os.cpu_count())
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="batch-dpll")
+@pytest.mark.parametrize("workers", BATCH_WORKERS, ids=lambda w: f"workers_{w}")
+def test_dpll_batch(benchmark, cnf_files, workers):
+    """Benchmark solving the CNF suite across worker processes"""
+    problems = [load_cnf(filepath) for filepath in cnf_files]
+
+    results = []
+
+    def run_all_problems():
+        results[:] = solve_many(problems, ["cdcl"], workers=workers, chunksize=32)
+
+    benchmark.pedantic(run_all_problems, rounds=1, iterations=1)
+    benchmark.extra_info.update(instances=len(problems), cpus=os.cpu_count(),
+                                verified=verify_results(problems, results))
+
+
+# ============================================================================
+# CLAUSE STORAGE BENCHMARKS
+# ============================================================================
+
+# The largest Bejing instances, 110k+ clauses each
+STORAGE_FILES = [
+    os.path.join("Bejing", name)
+    for name in ("enddr2-10-by-5-1.cnf", "enddr2-10-by-5-8.cnf", "ewddr2-10-by-5-1.cnf")
+]
+
+# Both storages make the same decisions, so a conflict budget gives them the same search
+STORAGE_CONFLICTS = 300
+
+@pytest.mark.sat
+@pytest.mark.benchmark(group="storage")
+@pytest.mark.parametrize("heuristics", [["2wli"], ["vsids"], ["cdcl"]], ids="_".join)
+@pytest.mark.parametrize("arena", [False, True], ids=["objects", "arena"])
+@pytest.mark.parametrize("filename", STORAGE_FILES, ids=os.path.basename)
+def test_clause_storage(benchmark, filename, arena, heuristics):
+    """Benchmark clause objects against the flat arena; formula memory goes to extra_info"""
+    vars_list, clauses = load_cnf(os.path.join(root_dir, "tests", filename))
+    tracemalloc.start()
+    formula = (ArenaFormula if arena else WatchedFormula)(clauses)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del formula
+    stats = {}
+
+    def run_problem():
+        stats.clear()
+        solve(vars_list, clauses, heuristics, stats=stats, budget=Budget(conflicts=STORAGE_CONFLICTS), arena=arena)
+
+    benchmark.pedantic(run_problem, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats, clauses=len(clauses), formula_bytes=memory)
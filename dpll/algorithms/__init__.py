@@ -6,6 +6,8 @@ from .pure import solve_pure
 from .unit_pure import solve_unit_pure
 from .two_watched_literals import solve_2wl
 from .iterative import solve_iterative, solve_with_restarts
+from .cdcl import solve_cdcl
+from .bitset import solve_bitset
 
 __all__ = [
     'solve_naive',
@@ -15,4 +17,6 @@ __all__ = [
     'solve_2wl',
     'solve_iterative',
     'solve_with_restarts',
+    'solve_cdcl',
+    'solve_bitset',
 ]
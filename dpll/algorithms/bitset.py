@@ -0,0 +1,155 @@
+"""Bit-parallel DPLL for small formulas."""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from ..helpers import add_stat
+    from ..budget import Budget
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from helpers import add_stat
+    from budget import Budget
+
+
+def _propagate(masks: List[Tuple[int, int]], true: int, false: int) -> Tuple[Optional[int], int, int]:
+    """Run unit propagation to a fixpoint on bitmask clauses.
+
+    A clause (pos, neg) is satisfied when pos & true or neg & false is
+    nonzero; its free literals are the bits of pos and neg outside the
+    assigned mask, and exactly one free bit with nothing satisfied makes
+    it unit.
+
+    Args:
+        masks: Clauses as (positive variable mask, negative variable mask) pairs
+        true: Mask (int) of variables assigned True
+        false: Mask (int) of variables assigned False
+
+    Returns:
+        Tuple of (branching literal as a signed single-bit mask, 0 if every
+        clause is satisfied, None on a conflict; true mask; false mask)
+    """
+    while True:
+        assigned = true | false
+        changed = False
+        branch = 0
+        for pos, neg in masks:
+            if pos & true or neg & false:
+                continue
+            free_pos = pos & ~assigned
+            free_neg = neg & ~assigned
+            if free_pos:
+                if not free_neg and not free_pos & (free_pos - 1):
+                    true |= free_pos
+                    assigned |= free_pos
+                    changed = True
+                elif not branch:
+                    branch = free_pos & -free_pos
+            elif free_neg:
+                if not free_neg & (free_neg - 1):
+                    false |= free_neg
+                    assigned |= free_neg
+                    changed = True
+                elif not branch:
+                    branch = -(free_neg & -free_neg)
+            else:
+                return None, true, false
+        if not changed:
+            return branch, true, false
+
+
+def solve_bitset(vars: List[int], clauses: List[List[int]], model: Dict[int, bool],
+                 stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None) -> Optional[Dict[int, bool]]:
+    """Solve SAT problem using DPLL over int bitmasks.
+
+    Variable vars[i] is bit i. Each clause becomes a mask of its positive
+    and a mask of its negative variables, and a partial assignment a mask
+    of true and a mask of false variables, so checking a clause for being
+    satisfied, unit or falsified takes a few bitwise operations and a
+    search state is two ints. Branching picks a free literal of the first
+    unsatisfied clause, trying the polarity that satisfies it first.
+    Propagation rescans every clause, so this only pays off on small
+    formulas (up to a hundred or so variables).
+
+    Args:
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
+        stats: Optional dict updated with 'decisions', 'conflicts' and 'propagations' counts
+        budget: Optional Budget charged for every decision, conflict and propagation round
+
+    Returns:
+        Dict mapping every variable to bool if satisfiable, None otherwise
+    """
+    vars = list(dict.fromkeys(vars))
+    bits = {var: 1 << i for i, var in enumerate(vars)}
+    masks = []
+    for clause in clauses:
+        pos = neg = 0
+        for lit in clause:
+            if lit > 0:
+                if lit not in bits:
+                    bits[lit] = 1 << len(vars)
+                    vars.append(lit)
+                pos |= bits[lit]
+            else:
+                if -lit not in bits:
+                    bits[-lit] = 1 << len(vars)
+                    vars.append(-lit)
+                neg |= bits[-lit]
+        if not pos & neg:
+            masks.append((pos, neg))
+
+    true = false = 0
+    for var, value in model.items():
+        if var not in bits:
+            continue
+        if value:
+            true |= bits[var]
+        else:
+            false |= bits[var]
+
+    decisions = conflicts = propagations = 0
+    counting = stats is not None or budget is not None
+    # Search states: (true mask, false mask, whether a decision led here)
+    stack = [(true, false, False)]
+    try:
+        while stack:
+            true, false, decided = stack.pop()
+            if decided:
+                decisions += 1
+                if budget is not None:
+                    budget.decide()
+            before = true | false
+            branch, true, false = _propagate(masks, true, false)
+            if counting:
+                propagated = bin((true | false) ^ before).count('1')
+                propagations += propagated
+                if budget is not None:
+                    budget.propagated(propagated)
+            if branch is None:
+                conflicts += 1
+                if budget is not None:
+                    budget.conflict()
+                continue
+            if branch == 0:
+                result = dict(model)
+                for var in vars:
+                    if var not in result:
+                        result[var] = bool(true & bits[var])
+                return result
+            bit = branch if branch > 0 else -branch
+            # Popped last-in first-out: the literal that satisfies the clause goes first
+            if branch > 0:
+                stack.append((true, false | bit, True))
+                stack.append((true | bit, false, True))
+            else:
+                stack.append((true | bit, false, True))
+                stack.append((true, false | bit, True))
+        return None
+    finally:
+        if stats is not None:
+            add_stat(stats, 'decisions', decisions)
+            add_stat(stats, 'conflicts', conflicts)
+            add_stat(stats, 'propagations', propagations)
@@ -0,0 +1,321 @@
+"""Conflict-driven clause learning on top of WatchedFormula."""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from ..helpers import add_stat
+    from ..heuristics import BranchingHeuristic, VSIDSScorer
+    from ..watched_literals import WatchedFormula
+    from ..arena import ArenaFormula
+    from ..clause_db import ClauseDatabase
+    from ..restarts import RestartPolicy
+    from ..budget import Budget
+    from ..cardinality import AtMostK
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from helpers import add_stat
+    from heuristics import BranchingHeuristic, VSIDSScorer
+    from watched_literals import WatchedFormula
+    from arena import ArenaFormula
+    from clause_db import ClauseDatabase
+    from restarts import RestartPolicy
+    from budget import Budget
+    from cardinality import AtMostK
+
+
+def _normalize_clauses(clauses: List[List[int]]) -> Optional[List[List[int]]]:
+    """Drop duplicate literals and tautologies before building the formula.
+    
+    Cardinality constraints are passed through untouched.
+    
+    Args:
+        clauses: List of clauses, each clause is a list of literals (int)
+    
+    Returns:
+        Cleaned list of clauses, or None if an empty clause is present
+    """
+    cleaned = []
+    for clause in clauses:
+        if isinstance(clause, AtMostK):
+            cleaned.append(clause)
+            continue
+        if not clause:
+            return None
+        lits = list(dict.fromkeys(clause))
+        if any(-lit in lits for lit in lits):
+            continue
+        cleaned.append(lits)
+    return cleaned
+
+
+def _analyze(formula: WatchedFormula, conflict_idx: int, scorer: BranchingHeuristic, clause_db: Optional[ClauseDatabase] = None) -> Tuple[List[int], int]:
+    """Derive a first-UIP learned clause from a conflict.
+    
+    Walks the implication graph backwards along the trail, resolving away
+    current-level literals until a single one (the first unique implication
+    point) remains.
+    
+    Args:
+        formula: WatchedFormula object managing clauses and the trail
+        conflict_idx: Index (int) of the falsified clause
+        scorer: BranchingHeuristic bumped for every variable involved
+        clause_db: Optional ClauseDatabase bumped for every learned clause involved
+    
+    Returns:
+        Tuple of (learned clause with the asserting literal first and the
+        highest remaining level second (List[int]), backjump level (int))
+    """
+    trail = formula.trail
+    level = formula.level
+    lvl = formula.decision_level()
+    seen = set()
+    learned = [0]
+    counter = 0
+    p = 0
+    idx = len(trail) - 1
+    clause = formula.conflict_clause(conflict_idx)
+    
+    while True:
+        if clause_db is not None:
+            clause_db.bump(clause, level)
+        lits = clause.literals
+        for q in lits:
+            if q == p:
+                continue
+            var = q if q > 0 else -q
+            if var in seen or level[var] == 0:
+                continue
+            seen.add(var)
+            scorer.bump(var)
+            if level[var] == lvl:
+                counter += 1
+            else:
+                learned.append(q)
+        
+        while abs(trail[idx]) not in seen:
+            idx -= 1
+        p = trail[idx]
+        idx -= 1
+        counter -= 1
+        if counter == 0:
+            break
+        clause = formula.reason_clause(abs(p))
+    
+    learned[0] = -p
+    
+    if len(learned) == 1:
+        return learned, 0
+    
+    best = 1
+    for i in range(2, len(learned)):
+        if level[abs(learned[i])] > level[abs(learned[best])]:
+            best = i
+    learned[1], learned[best] = learned[best], learned[1]
+    return learned, level[abs(learned[1])]
+
+
+def _analyze_final(formula: WatchedFormula, literal: int) -> List[int]:
+    """Collect the assumptions that imply a literal.
+    
+    Called when an assumption is found false, so every decision on the trail
+    is an earlier assumption. Walks reasons back from the literal and keeps
+    the decisions it reaches.
+    
+    Args:
+        formula: WatchedFormula object managing clauses and the trail
+        literal: True literal (int), the negation of the failed assumption
+    
+    Returns:
+        Failed assumption subset (List[int]): the failed assumption first,
+        then the assumptions that refute it
+    """
+    core = [-literal]
+    if formula.decision_level() == 0:
+        return core
+    level = formula.level
+    reason = formula.reason
+    trail = formula.trail
+    seen = {abs(literal)}
+    for i in range(len(trail) - 1, formula.trail_lim[0] - 1, -1):
+        lit = trail[i]
+        var = lit if lit > 0 else -lit
+        if var not in seen:
+            continue
+        if reason[var] is None:
+            core.append(lit)
+            continue
+        for q in formula.reason_clause(var).literals:
+            if level[abs(q)] > 0:
+                seen.add(abs(q))
+    return core
+
+
+def cdcl_search(formula: WatchedFormula, model: Dict[int, bool], scorer: BranchingHeuristic,
+                clause_db: ClauseDatabase, restart_policy: Optional[RestartPolicy] = None,
+                assumptions: List[int] = (), stats: Optional[Dict[str, int]] = None,
+                conflicts_before: int = 0, budget: Optional[Budget] = None) -> Tuple[bool, List[int]]:
+    """Run the CDCL loop on a prepared formula until it is decided.
+    
+    The formula keeps everything the search produces (learned clauses,
+    saved phases, level-0 assignments) and the scorer, clause database and
+    restart policy keep their state, so calling this again on the same
+    objects continues from where the last call stopped. Assumptions are
+    decided first, one per decision level, in order; an assumption that is
+    already true gets an empty level of its own.
+    
+    Args:
+        formula: WatchedFormula object managing clauses and the trail
+        model: Variable assignment dict holding the formula's current assignment
+        scorer: BranchingHeuristic for variable selection
+        clause_db: ClauseDatabase controlling learned clause retention
+        restart_policy: Optional RestartPolicy deciding when to restart in place
+        assumptions: Literals (int) that must hold in the model
+        stats: Optional dict updated with 'decisions', 'conflicts', 'propagations',
+            'watch_visits', 'learned', 'deleted' and 'restarts' counts
+        conflicts_before: Conflicts (int) of earlier calls, for the reduction schedule
+        budget: Optional Budget charged for every decision, conflict and propagation
+            round; attached to the formula for this call only
+    
+    Returns:
+        Tuple of (satisfiable (bool), failed assumption subset (List[int]),
+        empty unless the assumptions made the formula unsatisfiable)
+    """
+    decisions = 0
+    conflicts = 0
+    learned_count = 0
+    restarts = 0
+    restart_pending = False
+    deleted_before = clause_db.deleted
+    propagations_before = formula.propagations
+    visits_before = formula.watch_visits
+    formula.budget = budget
+    
+    try:
+        while True:
+            conflict = formula.propagate(model)
+            
+            if conflict is not None:
+                conflicts += 1
+                if formula.decision_level() == 0:
+                    return False, []
+                if budget is not None:
+                    budget.conflict()
+                
+                learned, target = _analyze(formula, conflict, scorer, clause_db)
+                lbd = ClauseDatabase.compute_lbd(learned, formula.level)
+                trail_size = len(formula.trail)
+                scorer.decay()
+                clause_db.decay()
+                formula.backtrack(target, model, scorer)
+                
+                formula.add_clause(learned)
+                learned_count += 1
+                if len(learned) > 1:
+                    clause_db.add(formula.clauses[-1], lbd)
+                formula.assign(learned[0], model, len(formula.clauses) - 1)
+                
+                if restart_policy is not None and restart_policy.on_conflict(lbd, trail_size):
+                    restart_pending = True
+                continue
+            
+            # Restart only once the asserted literal has propagated cleanly
+            if restart_pending:
+                restart_pending = False
+                restart_policy.on_restart()
+                restarts += 1
+                formula.backtrack(0, model, scorer)
+                continue
+            
+            if clause_db.should_reduce(conflicts_before + conflicts):
+                clause_db.reduce(formula, conflicts_before + conflicts)
+            
+            literal = None
+            while formula.decision_level() < len(assumptions):
+                p = assumptions[formula.decision_level()]
+                value = model.get(p if p > 0 else -p)
+                if value is None:
+                    literal = p
+                    break
+                if value != (p > 0):
+                    return False, _analyze_final(formula, -p)
+                formula.new_decision_level()
+            
+            if literal is None:
+                var = scorer.pick_variable(model)
+                if var is None:
+                    return True, []
+                decisions += 1
+                if budget is not None:
+                    budget.decide()
+                literal = formula.phase_literal(var)
+            
+            formula.new_decision_level()
+            formula.assign(literal, model)
+    finally:
+        formula.budget = None
+        if stats is not None:
+            add_stat(stats, 'decisions', decisions)
+            add_stat(stats, 'conflicts', conflicts)
+            add_stat(stats, 'learned', learned_count)
+            add_stat(stats, 'deleted', clause_db.deleted - deleted_before)
+            add_stat(stats, 'restarts', restarts)
+            add_stat(stats, 'propagations', formula.propagations - propagations_before)
+            add_stat(stats, 'watch_visits', formula.watch_visits - visits_before)
+
+
+def solve_cdcl(vars: List[int], clauses: List[List[int]], model: Dict[int, bool], scorer: Optional[BranchingHeuristic] = None,
+               clause_db: Optional[ClauseDatabase] = None, stats: Optional[Dict[str, int]] = None,
+               restart_policy: Optional[RestartPolicy] = None, budget: Optional[Budget] = None,
+               arena: bool = False) -> Optional[Dict[int, bool]]:
+    """Solve SAT problem using conflict-driven clause learning.
+    
+    Every conflict is analysed to its first UIP, the resulting clause is added
+    to the formula through WatchedFormula.add_clause and the search jumps back
+    to the level where the learned clause becomes unit. Learned clauses are
+    tracked by a ClauseDatabase, which periodically deletes the low-value ones
+    so the formula does not grow without bound. With a restart_policy the
+    search backtracks to level 0 on the same formula whenever the policy asks,
+    keeping learned clauses and scorer state. Decisions follow the saved phase
+    of each variable.
+    
+    Args:
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Initial variable assignment mapping variables (int) to bool
+        scorer: Optional BranchingHeuristic for variable selection
+        clause_db: Optional ClauseDatabase controlling learned clause retention
+        stats: Optional dict updated with 'decisions', 'conflicts', 'propagations',
+            'watch_visits', 'learned', 'deleted' and 'restarts' counts
+        restart_policy: Optional RestartPolicy deciding when to restart in place
+        budget: Optional Budget charged for every decision, conflict and propagation round
+        arena: Store the clauses in a flat ArenaFormula instead of clause objects (bool)
+    
+    Returns:
+        Dict mapping variables to bool if satisfiable, None if unsatisfiable
+    """
+    clauses = _normalize_clauses(clauses)
+    if clauses is None:
+        return None
+    if scorer is None:
+        scorer = VSIDSScorer(clauses)
+    if clause_db is None:
+        clause_db = ClauseDatabase()
+    
+    formula = ArenaFormula(clauses) if arena else WatchedFormula(clauses)
+    # A scorer reused from an earlier search may have dropped variables that
+    # search assigned from its heap
+    for var in vars:
+        scorer.unassign(var)
+    if scorer.track_assignments:
+        formula.listener = scorer
+    
+    for var, value in list(model.items()):
+        formula.assign(var if value else -var, model)
+    
+    if not formula.assign_units(model):
+        return None
+    
+    satisfiable, _ = cdcl_search(formula, model, scorer, clause_db, restart_policy, stats=stats, budget=budget)
+    return model if satisfiable else None
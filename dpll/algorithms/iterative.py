@@ -2,28 +2,45 @@
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Union
 
 try:
-    from ..helpers import parse_literal
-    from ..heuristics import VSIDSScorer
+    from ..helpers import add_stat
+    from ..heuristics import BranchingHeuristic, Rephaser
     from ..watched_literals import WatchedFormula
+    from ..arena import ArenaFormula
+    from ..restarts import RestartPolicy, make_restart_policy
+    from ..inprocess import Prober
+    from ..budget import Budget
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from helpers import parse_literal
-    from heuristics import VSIDSScorer
+    from helpers import add_stat
+    from heuristics import BranchingHeuristic, Rephaser
     from watched_literals import WatchedFormula
+    from arena import ArenaFormula
+    from restarts import RestartPolicy, make_restart_policy
+    from inprocess import Prober
+    from budget import Budget
 
 
-def _pick_branching_variable(vars: List[str], model: Dict[str, bool]) -> Optional[str]:
+# Without learned clauses a restart discards the refutations found so far, so
+# in-place restarts stop after this many to keep the search complete.
+MAX_RESTARTS = 1000
+
+# Stands in for the conflict when every variable is assigned but a clause is
+# still false; propagate returns negative indices for constraint conflicts
+_UNSATISFIED = object()
+
+
+def _pick_branching_variable(vars: List[int], model: Dict[int, bool]) -> Optional[int]:
     """Select next unassigned variable for branching.
     
     Args:
-        vars: List of variable names (str)
-        model: Current variable assignment mapping variable names to bool
+        vars: List of variables (int)
+        model: Current variable assignment mapping variables (int) to bool
     
     Returns:
-        Variable name (str) to branch on, or None if all assigned
+        Variable (int) to branch on, or None if all assigned
     """
     for var in vars:
         if var not in model:
@@ -31,146 +48,225 @@ def _pick_branching_variable(vars: List[str], model: Dict[str, bool]) -> Optiona
     return None
 
 
-def _bcp(formula: WatchedFormula, model: Dict[str, bool], trail: List[str]) -> bool:
-    """Boolean constraint propagation for unit clauses.
+def _decide(formula: WatchedFormula, model: Dict[int, bool], literal: int) -> Optional[int]:
+    """Open a decision level for a literal and propagate it.
     
     Args:
-        formula: WatchedFormula object managing clauses
+        formula: WatchedFormula object managing clauses and the trail
         model: Variable assignment dict to update
-        trail: List of assigned variables (str) in order
+        literal: Decision literal (int)
     
     Returns:
-        True if propagation succeeded, False if conflict detected
+        Index (int) of a conflicting clause, or None if propagation succeeded
     """
-    while True:
-        unit_lit = None
-        for clause in formula.clauses:
-            unit = clause.get_unit_literal(model)
-            if unit:
-                unit_lit = unit
-                break
-
-        if unit_lit is None:
-            return True
-
-        var, pos = parse_literal(unit_lit)
-
-        if var in model:
-            if model[var] != pos:
-                return False
-            continue
+    formula.new_decision_level()
+    formula.assign(literal, model)
+    return formula.propagate(model)
 
-        model[var] = pos
-        trail.append(var)
 
-        _, conflict = formula.propagate(unit_lit, model)
-        if conflict:
-            return False
+def _conflict_levels(formula: WatchedFormula, conflict_idx: int, decision_stack: List[list]) -> Set[int]:
+    """Collect the decision levels a conflict depends on.
+    
+    Follows reason clauses back from the conflicting clause. A decision
+    contributes its own level; a flipped decision contributes the levels
+    that refuted its first branch, since those are what forced it.
+    
+    Args:
+        formula: WatchedFormula object managing clauses and the trail
+        conflict_idx: Index (int) of the falsified clause
+        decision_stack: Per-level [literal, tried_flipped, levels] records
+    
+    Returns:
+        Set of decision levels (int) involved in the conflict
+    """
+    levels = set()
+    seen = set()
+    stack = list(formula.conflict_clause(conflict_idx).literals)
+    while stack:
+        var = abs(stack.pop())
+        if var in seen:
+            continue
+        seen.add(var)
+        lvl = formula.level[var]
+        if lvl == 0:
+            continue
+        if formula.reason[var] is not None:
+            stack.extend(formula.reason_clause(var).literals)
+        elif decision_stack[lvl - 1][1]:
+            levels |= decision_stack[lvl - 1][2]
+        else:
+            levels.add(lvl)
+    return levels
 
 
-def solve_iterative(vars: List[str], clauses: List[List[str]], model: Dict[str, bool], scorer: Optional[VSIDSScorer] = None, conflict_limit: int = 0) -> Optional[Dict[str, bool]]:
+def solve_iterative(vars: List[int], clauses: List[List[int]], model: Dict[int, bool], scorer: Optional[BranchingHeuristic] = None, conflict_limit: int = 0, backjump: bool = True, stats: Optional[Dict[str, int]] = None,
+                    restart_policy: Optional[RestartPolicy] = None, phase_saving: bool = True,
+                    rephaser: Optional[Rephaser] = None, prober: Optional[Prober] = None,
+                    budget: Optional[Budget] = None, arena: bool = False) -> Optional[Dict[int, bool]]:
     """Solve SAT problem using iterative DPLL with optional VSIDS scoring.
     
+    Backtracking only pops trail entries (WatchedFormula.backtrack); the watch
+    lists are never copied, so a decision costs the same on any formula size.
+    With backjump enabled a conflict returns straight to the highest decision
+    level it depends on (conflict-directed backjumping), skipping decisions
+    that played no part in it.
+    
+    With a restart_policy the search restarts in place: the trail is unwound
+    to level 0 on the same formula, keeping level-0 assignments and the
+    scorer, whenever the policy asks for it (at most MAX_RESTARTS times).
+    
+    With phase_saving a decision reuses the polarity the variable had when it
+    was last unassigned instead of always trying True first; a rephaser
+    periodically resets those saved phases.
+    
+    With a prober, failed-literal probing and equivalent-literal substitution
+    run at level 0 after every restart, each time within the prober's time
+    budget. Instances solved before the first restart never pay for it.
+    
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Initial variable assignment mapping variable names to bool
-        scorer: Optional VSIDSScorer for variable selection
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Initial variable assignment mapping variables (int) to bool
+        scorer: Optional BranchingHeuristic for variable selection
         conflict_limit: Max conflicts before restart (0 = no limit), int
+        backjump: Jump over decisions unrelated to a conflict (bool), default True
+        stats: Optional dict updated with 'decisions', 'conflicts', 'propagations',
+            'watch_visits' and 'restarts' counts
+        restart_policy: Optional RestartPolicy deciding when to restart in place
+        phase_saving: Decide on the last assigned polarity (bool), default True
+        rephaser: Optional Rephaser resetting saved phases on a conflict schedule
+        prober: Optional Prober simplifying the formula at level 0
+        budget: Optional Budget charged for every decision, conflict and propagation round
+        arena: Store the clauses in a flat ArenaFormula instead of clause objects (bool)
     
     Returns:
         Dict mapping variables to bool if satisfiable, None if unsatisfiable, "restart" if limit reached
     """
-    formula = WatchedFormula(clauses)
+    formula = ArenaFormula(clauses) if arena else WatchedFormula(clauses)
+    formula.budget = budget
+    if scorer:
+        # A scorer reused from an earlier search may have dropped variables
+        # that search assigned from its heap
+        for var in vars:
+            scorer.unassign(var)
+        if scorer.track_assignments:
+            formula.listener = scorer
     conflicts = 0
+    decisions = 0
+    restarts = 0
 
-    trail = []
+    # One [literal, tried_flipped, levels] record per decision level, where levels
+    # is the conflict set that refuted the first branch once it is flipped
     decision_stack = []
 
-    if not _bcp(formula, model, trail):
-        return None
+    for var, value in list(model.items()):
+        formula.assign(var if value else -var, model)
 
-    while True:
-        if formula.is_satisfied(model):
-            return model
+    try:
+        if not formula.assign_units(model) or formula.propagate(model) is not None:
+            return None
 
-        if scorer:
-            var = scorer.pick_variable(model)
-        else:
-            var = _pick_branching_variable(vars, model)
+        while True:
+            if scorer:
+                var = scorer.pick_variable(model)
+            else:
+                var = _pick_branching_variable(vars, model)
 
-        if var is None:
-            if all(c.is_satisfied(model) for c in formula.clauses):
-                return model
-            conflict = True
-        else:
-            saved_state = formula.save_state()
-            model[var] = True
-            trail.append(var)
-            decision_stack.append([var, False, saved_state])
-            conflict = False
+            if var is None:
+                if formula.is_satisfied(model):
+                    if prober is not None:
+                        prober.extend_model(model)
+                    return model
+                conflict = _UNSATISFIED
+            else:
+                decisions += 1
+                if budget is not None:
+                    budget.decide()
+                literal = formula.phase_literal(var) if phase_saving else var
+                decision_stack.append([literal, False, None])
+                conflict = _decide(formula, model, literal)
 
-        if not conflict:
-            if not _bcp(formula, model, trail):
-                conflict = True
+            while conflict is not None:
+                conflicts += 1
+                if budget is not None:
+                    budget.conflict()
+                if conflict_limit > 0 and conflicts >= conflict_limit:
+                    return "restart"
 
-        while conflict:
-            conflicts += 1
-            if conflict_limit > 0 and conflicts >= conflict_limit:
-                return "restart"
+                if backjump and conflict is not _UNSATISFIED:
+                    levels = _conflict_levels(formula, conflict, decision_stack)
+                else:
+                    levels = set(range(1, len(decision_stack) + 1))
 
-            if not decision_stack:
-                return None
+                # Both branches of a flipped level have failed: merge its
+                # refutation into the conflict set and keep unwinding
+                target = max(levels, default=0)
+                while target and decision_stack[target - 1][1]:
+                    levels = (levels | decision_stack[target - 1][2]) - {target}
+                    target = max(levels, default=0)
 
-            last_var, tried_flipped, saved_state = decision_stack[-1]
+                if target == 0:
+                    return None
 
-            if scorer:
-                scorer.bump(last_var)
-                scorer.decay()
-
-            while trail:
-                u_var = trail.pop()
-                if u_var in model:
-                    del model[u_var]
-                if u_var == last_var:
+                rephase = rephaser is not None and rephaser.on_conflict(formula)
+
+                if (restart_policy is not None and restarts < MAX_RESTARTS
+                        and restart_policy.on_conflict(len(levels), len(formula.trail))):
+                    restart_policy.on_restart()
+                    restarts += 1
+                    formula.backtrack(0, model, scorer)
+                    decision_stack.clear()
+                    if rephase:
+                        rephaser.rephase(formula)
+                    if prober is not None:
+                        if not prober.run(formula, model, scorer):
+                            return None
+                        vars = [var for var in vars if var not in prober.representative]
                     break
-            
-            formula.restore_state(saved_state)
 
-            if not tried_flipped:
-                saved_state = formula.save_state()
-                model[last_var] = False
-                trail.append(last_var)
-                decision_stack[-1] = [last_var, True, saved_state]
+                last_lit = decision_stack[target - 1][0]
 
-                if _bcp(formula, model, trail):
-                    conflict = False
-                else:
-                    conflict = True
-            else:
-                decision_stack.pop()
-                conflict = True
+                if scorer:
+                    scorer.bump(abs(last_lit))
+                    scorer.decay()
+
+                formula.backtrack(target - 1, model, scorer)
+                del decision_stack[target:]
+                if rephase:
+                    rephaser.rephase(formula)
 
+                decisions += 1
+                if budget is not None:
+                    budget.decide()
+                decision_stack[-1] = [-last_lit, True, levels - {target}]
+                conflict = _decide(formula, model, -last_lit)
+    finally:
+        if stats is not None:
+            add_stat(stats, 'decisions', decisions)
+            add_stat(stats, 'conflicts', conflicts)
+            add_stat(stats, 'restarts', restarts)
+            add_stat(stats, 'propagations', formula.propagations)
+            add_stat(stats, 'watch_visits', formula.watch_visits)
 
-def solve_with_restarts(vars: List[str], clauses: List[List[str]], model: Dict[str, bool], scorer: Optional[VSIDSScorer] = None) -> Optional[Dict[str, bool]]:
-    """Solve SAT problem with periodic restarts and increasing conflict limits.
+
+def solve_with_restarts(vars: List[int], clauses: List[List[int]], model: Dict[int, bool], scorer: Optional[BranchingHeuristic] = None,
+                        policy: Union[str, RestartPolicy] = 'geometric', stats: Optional[Dict[str, int]] = None,
+                        budget: Optional[Budget] = None, arena: bool = False) -> Optional[Dict[int, bool]]:
+    """Solve SAT problem with in-place restarts.
     
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Initial variable assignment mapping variable names to bool
-        scorer: Optional VSIDSScorer for variable selection
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Initial variable assignment mapping variables (int) to bool
+        scorer: Optional BranchingHeuristic for variable selection
+        policy: Restart policy name ('luby', 'geometric', 'glucose') or RestartPolicy, default 'geometric'
+        stats: Optional dict updated with 'decisions', 'conflicts', 'propagations',
+            'watch_visits' and 'restarts' counts
+        budget: Optional Budget charged for every decision, conflict and propagation round
+        arena: Store the clauses in a flat ArenaFormula instead of clause objects (bool)
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
     """
-    conflict_limit = 100
-    max_restarts = 1000
-    
-    for _ in range(max_restarts):
-        result = solve_iterative(vars, clauses, {}, scorer, conflict_limit)
-        if result != "restart":
-            return result
-        conflict_limit = int(conflict_limit * 1.5)
-    
-    return solve_iterative(vars, clauses, {}, scorer, 0)
+    return solve_iterative(vars, clauses, model, scorer, stats=stats, restart_policy=make_restart_policy(policy),
+                           budget=budget, arena=arena)
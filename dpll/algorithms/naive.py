@@ -5,19 +5,24 @@ from pathlib import Path
 from typing import List, Dict, Optional
 
 try:
-    from ..helpers import simplify_clauses
+    from ..helpers import simplify_clauses, add_stat
+    from ..budget import Budget
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from helpers import simplify_clauses
+    from helpers import simplify_clauses, add_stat
+    from budget import Budget
 
 
-def solve_naive(vars: List[str], clauses: List[List[str]], model: Dict[str, bool]) -> Optional[Dict[str, bool]]:
+def solve_naive(vars: List[int], clauses: List[List[int]], model: Dict[int, bool],
+                stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None) -> Optional[Dict[int, bool]]:
     """Solve SAT problem using naive DPLL without heuristics.
     
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
+        stats: Optional dict updated with 'decisions' and 'conflicts' counts
+        budget: Optional Budget charged for every decision and conflict
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
@@ -25,6 +30,10 @@ def solve_naive(vars: List[str], clauses: List[List[str]], model: Dict[str, bool
     if not clauses:
         return model
     if [] in clauses:
+        if stats is not None:
+            add_stat(stats, 'conflicts')
+        if budget is not None:
+            budget.conflict()
         return None
     
     remaining = [v for v in vars if v not in model]
@@ -37,14 +46,22 @@ def solve_naive(vars: List[str], clauses: List[List[str]], model: Dict[str, bool
     new_clauses = simplify_clauses(clauses, pos_literal)
     new_model = model.copy()
     new_model[var] = True
+    if stats is not None:
+        add_stat(stats, 'decisions')
+    if budget is not None:
+        budget.decide()
     
-    result = solve_naive(vars, new_clauses, new_model)
+    result = solve_naive(vars, new_clauses, new_model, stats, budget)
     if result is not None:
         return result
     
-    neg_literal = '-' + var
+    neg_literal = -var
     new_clauses = simplify_clauses(clauses, neg_literal)
     new_model = model.copy()
     new_model[var] = False
+    if stats is not None:
+        add_stat(stats, 'decisions')
+    if budget is not None:
+        budget.decide()
     
-    return solve_naive(vars, new_clauses, new_model)
+    return solve_naive(vars, new_clauses, new_model, stats, budget)
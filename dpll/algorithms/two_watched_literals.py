@@ -5,114 +5,108 @@ from pathlib import Path
 from typing import List, Dict, Optional
 
 try:
-    from ..helpers import parse_literal
     from ..watched_literals import WatchedFormula
+    from ..arena import ArenaFormula
+    from ..heuristics import BranchingHeuristic
+    from ..helpers import add_stat
+    from ..budget import Budget
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from helpers import parse_literal
     from watched_literals import WatchedFormula
+    from arena import ArenaFormula
+    from heuristics import BranchingHeuristic
+    from helpers import add_stat
+    from budget import Budget
 
 
-def solve_2wl(vars: List[str], clauses: List[List[str]], model: Dict[str, bool]) -> Optional[Dict[str, bool]]:
+def solve_2wl(vars: List[int], clauses: List[List[int]], model: Dict[int, bool], scorer: Optional[BranchingHeuristic] = None,
+              stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None,
+              arena: bool = False) -> Optional[Dict[int, bool]]:
     """Solve SAT problem using DPLL with two-watched literals.
     
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
+        scorer: Optional BranchingHeuristic for variable selection (first unassigned otherwise)
+        stats: Optional dict updated with 'decisions', 'conflicts', 'propagations'
+            and 'watch_visits' counts
+        budget: Optional Budget charged for every decision, conflict and propagation round
+        arena: Store the clauses in a flat ArenaFormula instead of clause objects (bool)
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
     """
-    formula = WatchedFormula(clauses)
-    return solve_2wl_recursive(vars, formula, model)
+    formula = ArenaFormula(clauses) if arena else WatchedFormula(clauses)
+    formula.budget = budget
+    if scorer is not None and scorer.track_assignments:
+        formula.listener = scorer
+    for var, value in list(model.items()):
+        formula.assign(var if value else -var, model)
+    try:
+        if not formula.assign_units(model) or formula.propagate(model) is not None:
+            if stats is not None:
+                add_stat(stats, 'conflicts')
+            return None
+        return solve_2wl_recursive(vars, formula, model, scorer, stats, budget)
+    finally:
+        if stats is not None:
+            add_stat(stats, 'propagations', formula.propagations)
+            add_stat(stats, 'watch_visits', formula.watch_visits)
 
 
-def solve_2wl_recursive(vars: List[str], formula: WatchedFormula, model: Dict[str, bool]) -> Optional[Dict[str, bool]]:
+def solve_2wl_recursive(vars: List[int], formula: WatchedFormula, model: Dict[int, bool], scorer: Optional[BranchingHeuristic] = None,
+                        stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None) -> Optional[Dict[int, bool]]:
     """Recursive helper for two-watched literals DPLL.
     
+    Called with all implied literals already propagated. Assignments made
+    here stay on the formula trail; the caller undoes them with
+    formula.backtrack when this branch fails.
+    
     Args:
-        vars: List of variable names (str)
+        vars: List of variables (int)
         formula: WatchedFormula object managing watched literals
-        model: Partial variable assignment mapping variable names to bool
+        model: Partial variable assignment mapping variables (int) to bool
+        scorer: Optional BranchingHeuristic for variable selection, bumped on conflicts
+        stats: Optional dict updated with 'decisions' and 'conflicts' counts
+        budget: Optional Budget charged for every decision and conflict
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
     """
-    assigned_in_this_step = []
-
-    while True:
-        unit_lit = None
-        for clause in formula.clauses:
-            unit = clause.get_unit_literal(model)
-            if unit:
-                unit_lit = unit
-                break
-        
-        if unit_lit is None:
-            break
-        
-        var, pos = parse_literal(unit_lit)
-        
-        if var in model:
-            if model[var] != pos:
-                _backtrack(model, assigned_in_this_step)
-                return None
-            continue
-        
-        model[var] = pos
-        assigned_in_this_step.append(var)
-        
-        new_unit, conflict = formula.propagate(unit_lit, model)
-        if conflict:
-            _backtrack(model, assigned_in_this_step)
+    var = scorer.pick_variable(model) if scorer is not None else None
+    if var is None:
+        # Variables outside every clause are unknown to the scorer
+        remaining = [v for v in vars if v not in model]
+        if not remaining:
+            if formula.is_satisfied(model):
+                return model
             return None
-        
-        if new_unit:
-            pass
-
-    if formula.is_satisfied(model):
-        return model
-    
-    remaining = [v for v in vars if v not in model]
-    if not remaining:
-        if all(c.is_satisfied(model) for c in formula.clauses):
-            return model
-        _backtrack(model, assigned_in_this_step)
-        return None
-    
-    var = remaining[0]
-    
-    saved_state = formula.save_state()
-    model[var] = True
-    if solve_2wl_recursive(vars, formula, model) is not None:
-        return model
-    
-    del model[var]
-    formula.restore_state(saved_state)
+        var = remaining[0]
     
-    saved_state = formula.save_state()
-    model[var] = False
-    if solve_2wl_recursive(vars, formula, model) is not None:
-        return model
+    first = formula.phase_literal(var)
+    level = formula.decision_level()
     
-    del model[var]
-    formula.restore_state(saved_state)
+    # Try the saved phase first; backtracking records it for the next visit
+    for literal in (first, -first):
+        if stats is not None:
+            add_stat(stats, 'decisions')
+        if budget is not None:
+            budget.decide()
+        formula.new_decision_level()
+        formula.assign(literal, model)
+        conflict = formula.propagate(model)
+        if conflict is None:
+            if solve_2wl_recursive(vars, formula, model, scorer, stats, budget) is not None:
+                return model
+        else:
+            if stats is not None:
+                add_stat(stats, 'conflicts')
+            if budget is not None:
+                budget.conflict()
+            if scorer is not None:
+                scorer.bump_clause(formula.conflict_clause(conflict).literals)
+                scorer.decay()
+        formula.backtrack(level, model, scorer)
     
-    _backtrack(model, assigned_in_this_step)
     return None
-
-
-def _backtrack(model: Dict[str, bool], vars_to_remove: List[str]):
-    """Remove variables from model during backtracking.
-    
-    Args:
-        model: Variable assignment dict to modify
-        vars_to_remove: List of variable names (str) to remove
-    
-    Returns:
-        None (modifies model in place)
-    """
-    for var in reversed(vars_to_remove):
-        if var in model:
-            del model[var]
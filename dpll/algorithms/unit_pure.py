@@ -5,52 +5,82 @@ from pathlib import Path
 from typing import List, Dict, Optional
 
 try:
-    from ..helpers import simplify_clauses
+    from ..helpers import simplify_clauses, add_stat
+    from ..budget import Budget
     from ..heuristics import unit_propagate, eliminate_pure_literals
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from helpers import simplify_clauses
+    from helpers import simplify_clauses, add_stat
+    from budget import Budget
     from heuristics import unit_propagate, eliminate_pure_literals
 
 
-def solve_unit_pure(vars: List[str], clauses: List[List[str]], model: Dict[str, bool]) -> Optional[Dict[str, bool]]:
+def solve_unit_pure(vars: List[int], clauses: List[List[int]], model: Dict[int, bool],
+                    stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None) -> Optional[Dict[int, bool]]:
     """Solve SAT problem using DPLL with unit propagation and pure literal elimination.
     
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
+        stats: Optional dict updated with 'decisions', 'conflicts' and 'propagations' counts
+        budget: Optional Budget charged for every decision, conflict and propagation round
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
     """
+    assigned = len(model)
     clauses, model, conflict = unit_propagate(clauses, model)
+    if stats is not None:
+        add_stat(stats, 'propagations', len(model) - assigned)
+        if conflict:
+            add_stat(stats, 'conflicts')
+    if budget is not None:
+        budget.propagated(len(model) - assigned)
+        if conflict:
+            budget.conflict()
     if conflict:
         return None
     
     clauses, model = eliminate_pure_literals(clauses, model)
     
-    return _solve_unit_pure_helper(vars, clauses, model)
+    return _solve_unit_pure_helper(vars, clauses, model, stats, budget)
 
 
-def _solve_unit_pure_helper(vars: List[str], clauses: List[List[str]], model: Dict[str, bool]) -> Optional[Dict[str, bool]]:
+def _solve_unit_pure_helper(vars: List[int], clauses: List[List[int]], model: Dict[int, bool],
+                            stats: Optional[Dict[str, int]] = None, budget: Optional[Budget] = None) -> Optional[Dict[int, bool]]:
     """Helper for solve_unit_pure, recursive DPLL step with unit propagation.
     
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        vars: List of variables (int)
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
+        stats: Optional dict updated with 'decisions', 'conflicts' and 'propagations' counts
+        budget: Optional Budget charged for every decision, conflict and propagation round
     
     Returns:
         Dict mapping variables to bool if satisfiable, None otherwise
     """
+    assigned = len(model)
     clauses, model, conflict = unit_propagate(clauses, model)
+    if stats is not None:
+        add_stat(stats, 'propagations', len(model) - assigned)
+        if conflict:
+            add_stat(stats, 'conflicts')
+    if budget is not None:
+        budget.propagated(len(model) - assigned)
+        if conflict:
+            budget.conflict()
     if conflict:
         return None
     
     if not clauses:
         return model
     if [] in clauses:
+        if stats is not None:
+            add_stat(stats, 'conflicts')
+        if budget is not None:
+            budget.conflict()
         return None
     
     remaining = [v for v in vars if v not in model]
@@ -63,14 +93,22 @@ def _solve_unit_pure_helper(vars: List[str], clauses: List[List[str]], model: Di
     new_clauses = simplify_clauses(clauses, pos_literal)
     new_model = model.copy()
     new_model[var] = True
+    if stats is not None:
+        add_stat(stats, 'decisions')
+    if budget is not None:
+        budget.decide()
     
-    result = _solve_unit_pure_helper(vars, new_clauses, new_model)
+    result = _solve_unit_pure_helper(vars, new_clauses, new_model, stats, budget)
     if result is not None:
         return result
     
-    neg_literal = '-' + var
+    neg_literal = -var
     new_clauses = simplify_clauses(clauses, neg_literal)
     new_model = model.copy()
     new_model[var] = False
+    if stats is not None:
+        add_stat(stats, 'decisions')
+    if budget is not None:
+        budget.decide()
     
-    return _solve_unit_pure_helper(vars, new_clauses, new_model)
+    return _solve_unit_pure_helper(vars, new_clauses, new_model, stats, budget)
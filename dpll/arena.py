@@ -0,0 +1,478 @@
+"""Watched-literal formula storing its clauses in one flat literal array."""
+
+import sys
+from array import array
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    from .watched_literals import WatchedClause, WatchedFormula
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from watched_literals import WatchedClause, WatchedFormula
+
+
+class ArenaClause:
+    """Stable handle on a clause added to an ArenaFormula after construction.
+
+    Learned clauses need an identity that outlives one lookup, since the
+    ClauseDatabase keys its LBD and activity bookkeeping on clause objects.
+    The handle stores only the clause's index, which remove_clauses keeps
+    current as clauses shift down; the literals are read from the arena.
+    """
+    __slots__ = ['formula', 'idx']
+
+    def __init__(self, formula: 'ArenaFormula', idx: int):
+        """Initialize the handle.
+
+        Args:
+            formula: ArenaFormula holding the clause
+            idx: Index (int) of the clause in the arena
+
+        Returns:
+            None
+        """
+        self.formula = formula
+        self.idx = idx
+
+    @property
+    def literals(self) -> List[int]:
+        """Copy the clause's literals out of the arena.
+
+        Returns:
+            List of literals (int), watched literals first
+        """
+        formula = self.formula
+        start = formula.starts[self.idx]
+        return formula.arena[start:start + formula.sizes[self.idx]].tolist()
+
+    def is_satisfied(self, model: Dict[int, bool]) -> bool:
+        """Check if clause is satisfied by current model.
+
+        Args:
+            model: Variable assignment mapping variables (int) to bool
+
+        Returns:
+            True if any literal is satisfied, False otherwise (bool)
+        """
+        return any(model.get(abs(lit)) == (lit > 0) for lit in self.literals)
+
+
+class ArenaClauses:
+    """Read-only sequence view of the clauses in an arena.
+
+    Indexing returns the clause's ArenaClause handle if it has one and
+    otherwise builds a WatchedClause over a copy of its literals, so
+    engines can keep calling formula.clauses[idx].literals and
+    is_satisfied; the arena itself holds no objects for its input clauses.
+    """
+    __slots__ = ['formula']
+
+    def __init__(self, formula: 'ArenaFormula'):
+        """Initialize the view.
+
+        Args:
+            formula: ArenaFormula whose clauses are viewed
+
+        Returns:
+            None
+        """
+        self.formula = formula
+
+    def __len__(self) -> int:
+        """Count the clauses.
+
+        Returns:
+            Number of clauses (int) in the arena
+        """
+        return len(self.formula.starts)
+
+    def __getitem__(self, idx: int):
+        """Look up one clause.
+
+        Args:
+            idx: Index (int) of the clause, negative counting from the end
+
+        Returns:
+            The clause's ArenaClause handle, or a WatchedClause copy if it has none
+        """
+        formula = self.formula
+        if idx < 0:
+            idx += len(formula.starts)
+        handle = formula.handles.get(idx)
+        if handle is not None:
+            return handle
+        start = formula.starts[idx]
+        return WatchedClause(formula.arena[start:start + formula.sizes[idx]].tolist())
+
+    def __iter__(self):
+        """Iterate over the clauses in index order.
+
+        Returns:
+            Iterator of ArenaClause handles and WatchedClause copies
+        """
+        for idx in range(len(self.formula.starts)):
+            yield self[idx]
+
+
+class ArenaFormula(WatchedFormula):
+    """WatchedFormula whose clauses live in a contiguous array('i') arena.
+
+    Clause idx occupies arena[starts[idx]:starts[idx] + sizes[idx]]. Its
+    two watched literals are held inline in its first two slots, as in
+    MiniSat: moving a watch swaps literals within the clause instead of
+    storing watch positions. A watch list is an array('i') of clause
+    indices. Against a WatchedClause (an object, a list and boxed ints per
+    clause, a tuple per watch) this stores about 4 bytes per literal and
+    per watch, which keeps large formulas compact and the propagation loop
+    on contiguous memory.
+
+    Binary clauses, unit clauses and cardinality constraints are handled
+    as in WatchedFormula. Clauses added by add_clause (learned clauses)
+    get an ArenaClause handle, which is what remove_clauses deletes.
+    """
+
+    def __init__(self, clauses: List[List[int]]):
+        """Initialize the formula, copying every clause into the arena.
+
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int),
+                and dpll.cardinality constraints
+
+        Returns:
+            None
+        """
+        self.arena = array('i')
+        self.starts = array('i')
+        self.sizes = array('i')
+        self.handles: Dict[int, ArenaClause] = {}
+        super().__init__(clauses)
+
+    @property
+    def clauses(self) -> ArenaClauses:
+        """View the arena as a sequence of clauses.
+
+        Returns:
+            ArenaClauses view (read-only)
+        """
+        return ArenaClauses(self)
+
+    @clauses.setter
+    def clauses(self, clauses: List[WatchedClause]):
+        """Replace every clause, copying the literals into a fresh arena.
+
+        WatchedFormula.__init__ and replace_clauses assign clause objects
+        here; any handles handed out before are dropped.
+
+        Args:
+            clauses: List of WatchedClause objects
+
+        Returns:
+            None
+        """
+        self.arena = array('i')
+        self.starts = array('i')
+        self.sizes = array('i')
+        self.handles = {}
+        for clause in clauses:
+            self._store(clause.literals)
+
+    def _store(self, literals: List[int]) -> int:
+        """Append a clause to the arena.
+
+        Args:
+            literals: List of literals (int) forming the clause
+
+        Returns:
+            Index (int) of the new clause
+        """
+        idx = len(self.starts)
+        self.starts.append(len(self.arena))
+        self.sizes.append(len(literals))
+        self.arena.extend(literals)
+        return idx
+
+    def _build_watch_lists(self):
+        """Build initial watch lists and binary implications for all clauses.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        for idx in range(len(self.starts)):
+            self._watch_index(idx)
+
+    def _watch(self, idx: int, clause: WatchedClause):
+        """Register a clause for WatchedFormula code that passes clause objects.
+
+        The arena keeps the watches inline in the clause's first two slots,
+        so only the index matters; clause is ignored, since at best it is a
+        copy of the arena's literals. The override keeps inherited callers
+        from touching WatchedClause watch fields the arena never reads.
+
+        Args:
+            idx: Index (int) of the clause
+            clause: Clause object (ignored)
+
+        Returns:
+            None
+        """
+        self._watch_index(idx)
+
+    def _watch_index(self, idx: int):
+        """Register a clause in the implication lists or the watch lists.
+
+        Unit and empty clauses are not watched; assign_units handles units.
+
+        Args:
+            idx: Index (int) of the clause
+
+        Returns:
+            None
+        """
+        size = self.sizes[idx]
+        if size < 2:
+            return
+        arena = self.arena
+        start = self.starts[idx]
+        if size == 2:
+            a = arena[start]
+            b = arena[start + 1]
+            implications = self.implications
+            if -a not in implications:
+                implications[-a] = []
+            implications[-a].append((b, idx))
+            if -b not in implications:
+                implications[-b] = []
+            implications[-b].append((a, idx))
+            return
+        watch_lists = self.watch_lists
+        for neg in (-arena[start], -arena[start + 1]):
+            watched = watch_lists.get(neg)
+            if watched is None:
+                watch_lists[neg] = array('i', (idx,))
+            else:
+                watched.append(idx)
+
+    def propagate(self, model: Dict[int, bool]) -> Optional[int]:
+        """Propagate every pending trail literal through the watch lists.
+
+        Same contract as WatchedFormula.propagate. When a watched literal
+        becomes false it is swapped into the clause's second slot; the
+        clause is kept if the first slot is true, otherwise the watch moves
+        to a non-false literal, and failing that the first literal is
+        implied or the clause conflicts. Watch lists are compacted in place.
+
+        Args:
+            model: Variable assignment dict to update
+
+        Returns:
+            Index (int) of a conflicting clause (negative for a constraint, see
+            conflict_clause), or None if no conflict
+        """
+        arena = self.arena
+        starts = self.starts
+        sizes = self.sizes
+        watch_lists = self.watch_lists
+        implications = self.implications
+        constraint_lists = self.constraint_lists
+        trail = self.trail
+        start = self.qhead
+        visits = 0
+        conflict = None
+
+        while self.qhead < len(trail):
+            literal = trail[self.qhead]
+            self.qhead += 1
+
+            if constraint_lists:
+                counts = constraint_lists.get(literal)
+                if counts:
+                    conflict = self._count(literal, counts, model)
+                    if conflict is not None:
+                        break
+
+            implied = implications.get(literal)
+            if implied:
+                for other, clause_idx in implied:
+                    value = model.get(other if other > 0 else -other)
+                    if value is None:
+                        self.assign(other, model, clause_idx)
+                    elif value != (other > 0):
+                        conflict = clause_idx
+                        break
+                if conflict is not None:
+                    break
+
+            watched = watch_lists.get(literal)
+            if not watched:
+                continue
+
+            false_lit = -literal
+            n = len(watched)
+            visits += n
+            i = j = 0
+            while i < n:
+                clause_idx = watched[i]
+                i += 1
+                first = starts[clause_idx]
+                # Put the falsified watch in the second slot
+                other = arena[first]
+                if other == false_lit:
+                    other = arena[first + 1]
+                    arena[first] = other
+                    arena[first + 1] = false_lit
+
+                other_val = model.get(other if other > 0 else -other)
+                if other_val is not None and other_val == (other > 0):
+                    watched[j] = clause_idx
+                    j += 1
+                    continue
+
+                for k in range(first + 2, first + sizes[clause_idx]):
+                    lit = arena[k]
+                    value = model.get(lit if lit > 0 else -lit)
+                    if value is None or value == (lit > 0):
+                        arena[first + 1] = lit
+                        arena[k] = false_lit
+                        target = watch_lists.get(-lit)
+                        if target is None:
+                            watch_lists[-lit] = array('i', (clause_idx,))
+                        else:
+                            target.append(clause_idx)
+                        break
+                else:
+                    watched[j] = clause_idx
+                    j += 1
+                    if other_val is not None:
+                        visits -= n - i
+                        while i < n:
+                            watched[j] = watched[i]
+                            i += 1
+                            j += 1
+                        conflict = clause_idx
+                        break
+                    self.assign(other, model, clause_idx)
+
+            del watched[j:]
+            if conflict is not None:
+                break
+
+        self.counted = self.qhead
+        self.propagations += self.qhead - start
+        self.watch_visits += visits
+        if conflict is not None:
+            if self.budget is not None:
+                self.budget.propagations += self.qhead - start
+            self.qhead = len(trail)
+            return conflict
+        if self.budget is not None:
+            self.budget.propagated(self.qhead - start)
+        return None
+
+    def assign_units(self, model: Dict[int, bool]) -> bool:
+        """Enqueue the literal of every unit clause.
+
+        Args:
+            model: Variable assignment dict to update
+
+        Returns:
+            False if a unit clause is already falsified, True otherwise
+        """
+        arena = self.arena
+        starts = self.starts
+        for idx, size in enumerate(self.sizes):
+            if size != 1:
+                continue
+            lit = arena[starts[idx]]
+            value = model.get(lit if lit > 0 else -lit)
+            if value is None:
+                self.assign(lit, model, idx)
+            elif value != (lit > 0):
+                return False
+        return True
+
+    def is_satisfied(self, model: Dict[int, bool]) -> bool:
+        """Check if all clauses are satisfied.
+
+        Args:
+            model: Variable assignment mapping variables (int) to bool
+
+        Returns:
+            True if all clauses satisfied, False otherwise (bool)
+        """
+        arena = self.arena
+        for idx, first in enumerate(self.starts):
+            for k in range(first, first + self.sizes[idx]):
+                lit = arena[k]
+                if model.get(lit if lit > 0 else -lit) == (lit > 0):
+                    break
+            else:
+                return False
+        return True
+
+    def remove_clauses(self, doomed: set):
+        """Delete clauses and compact the arena.
+
+        Surviving clauses are copied down in order with their watched
+        literals still in their first two slots; indices shift down, so
+        reasons on the trail and the handles are remapped and the watch
+        lists rebuilt. Clauses that are reasons for current assignments
+        must not be removed.
+
+        Args:
+            doomed: Set of ArenaClause handles to delete
+
+        Returns:
+            None
+        """
+        removed = {clause.idx for clause in doomed}
+        arena = self.arena
+        starts = self.starts
+        sizes = self.sizes
+        kept_arena = array('i')
+        kept_starts = array('i')
+        kept_sizes = array('i')
+        remap = {}
+        for idx in range(len(starts)):
+            if idx in removed:
+                continue
+            remap[idx] = len(kept_starts)
+            start = starts[idx]
+            kept_starts.append(len(kept_arena))
+            kept_sizes.append(sizes[idx])
+            kept_arena.extend(arena[start:start + sizes[idx]])
+        self.arena = kept_arena
+        self.starts = kept_starts
+        self.sizes = kept_sizes
+
+        handles = {}
+        for idx, handle in self.handles.items():
+            if idx in remap:
+                handle.idx = remap[idx]
+                handles[handle.idx] = handle
+        self.handles = handles
+
+        for lit in self.trail:
+            var = lit if lit > 0 else -lit
+            if self.reason[var] is not None and self.reason[var] >= 0:
+                self.reason[var] = remap[self.reason[var]]
+
+        self.watch_lists = {}
+        self.implications = {}
+        self._build_watch_lists()
+
+    def add_clause(self, literals: List[int]):
+        """Add a new clause to the formula.
+
+        Args:
+            literals: List of literals (int) forming the clause
+
+        Returns:
+            None
+        """
+        idx = self._store(literals)
+        self.handles[idx] = ArenaClause(self, idx)
+        self._watch_index(idx)
@@ -0,0 +1,201 @@
+"""Batch solving: many independent formulas over a process pool."""
+
+import os
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+from typing import List, Iterable, Iterator, Optional, Tuple
+
+try:
+    from .helpers import VariableTable
+    from .solver import solve
+    from .budget import Budget, UNKNOWN
+    from .cardinality import AtMostK
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from helpers import VariableTable
+    from solver import solve
+    from budget import Budget, UNKNOWN
+    from cardinality import AtMostK
+
+
+# Byte values of a packed model
+_FALSE, _TRUE, _UNASSIGNED = 0, 1, 2
+
+
+def pack_formula(vars: list, clauses: list) -> Tuple[VariableTable, Tuple[int, array, list]]:
+    """Encode a formula as a compact payload for a worker process.
+    
+    Names are interned into engine variables and the clauses are written
+    back to back into one array('i'), each closed by a 0 as in DIMACS. The
+    array pickles as raw bytes, far smaller than nested lists of names.
+    Cardinality constraints travel separately, encoded but not expanded.
+    
+    Args:
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int),
+            and cardinality constraints
+    
+    Returns:
+        Tuple of the VariableTable (kept by the caller to decode the answer)
+        and the payload (number of variables, flat literal array, constraints)
+    """
+    table = VariableTable(vars)
+    encode = table.encode_literal
+    flat = array('i')
+    constraints = []
+    for clause in clauses:
+        if isinstance(clause, AtMostK):
+            constraints.append(clause.map(encode))
+            continue
+        flat.extend(encode(lit) for lit in clause)
+        flat.append(0)
+    return table, (len(table), flat, constraints)
+
+
+def unpack_formula(payload: Tuple[int, array, list]) -> Tuple[List[int], list]:
+    """Decode a payload built by pack_formula.
+    
+    Args:
+        payload: Tuple of (number of variables, flat literal array, constraints)
+    
+    Returns:
+        Tuple of the variable list (List[int]) and clause list, constraints last
+    """
+    num_vars, flat, constraints = payload
+    clauses = []
+    clause = []
+    for lit in flat:
+        if lit:
+            clause.append(lit)
+        else:
+            clauses.append(clause)
+            clause = []
+    clauses.extend(constraints)
+    return list(range(1, num_vars + 1)), clauses
+
+
+def _solve_chunk(payloads: List[Tuple[int, array, list]], heuristics: list,
+                 time_limit: Optional[float] = None) -> List[Optional[bytes]]:
+    """Worker entry point: solve a chunk of packed formulas.
+    
+    Args:
+        payloads: List of payloads built by pack_formula
+        heuristics: List of heuristic names (str), as for dpll.solver.solve
+        time_limit: Optional wall-clock limit (float, seconds) per formula
+    
+    Returns:
+        One packed model per payload: bytes with one value per variable
+        (0 false, 1 true, 2 unassigned), None if unsatisfiable, or UNKNOWN
+        if the time limit passed first
+    """
+    results = []
+    for payload in payloads:
+        vars, clauses = unpack_formula(payload)
+        budget = None if time_limit is None else Budget(time_limit)
+        model = solve(vars, clauses, heuristics, budget=budget)
+        if model is UNKNOWN:
+            results.append(UNKNOWN)
+        elif model is False:
+            results.append(None)
+        else:
+            results.append(bytes(_UNASSIGNED if var not in model else int(model[var]) for var in vars))
+    return results
+
+
+def _unpack_model(table: VariableTable, packed: Optional[bytes]):
+    """Decode a packed model back to the caller's names.
+    
+    Args:
+        table: VariableTable returned by pack_formula
+        packed: Packed model from _solve_chunk, or None
+    
+    Returns:
+        Dict mapping variables to bool if satisfiable, False if unsatisfiable, UNKNOWN
+        if the time limit passed first
+    """
+    if packed is UNKNOWN:
+        return UNKNOWN
+    if packed is None:
+        return False
+    names = table.names
+    return {names[var]: value == _TRUE for var, value in enumerate(packed, 1) if value != _UNASSIGNED}
+
+
+def solve_many(instances: Iterable[Tuple[list, list]], heuristics: list, workers: Optional[int] = None,
+               chunksize: int = 16, ordered: bool = True, time_limit: Optional[float] = None) -> Iterator:
+    """Solve many independent formulas in worker processes.
+    
+    Instances are packed (see pack_formula) and sent to the pool in chunks
+    of chunksize, so each round trip carries enough work to hide the
+    pickling and scheduling cost; formulas that solve in milliseconds, such
+    as sudokus or uf20 files, want larger chunks than hard instances. Only a
+    few chunks per worker are in flight at once, so instances may come from
+    a lazy iterator of any length. A time limit applies to each instance on
+    its own, so one hard formula cannot hold up the rest of the batch.
+    
+    Args:
+        instances: Iterable of (vars, clauses) pairs, as taken by dpll.solver.solve
+        heuristics: List of heuristic names (str), as for dpll.solver.solve
+        workers: Optional number of worker processes (default os.cpu_count()); with 1
+            the instances are solved in this process
+        chunksize: Number (int) of instances sent to a worker at once
+        ordered: If True, yield results in input order; otherwise as they complete
+        time_limit: Optional wall-clock limit (float, seconds) per instance
+    
+    Returns:
+        Iterator over results (a model dict, False or UNKNOWN per instance) when
+        ordered, or over (index, result) pairs in completion order otherwise
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    
+    if workers == 1:
+        for index, (vars, clauses) in enumerate(instances):
+            budget = None if time_limit is None else Budget(time_limit)
+            result = solve(vars, clauses, heuristics, budget=budget)
+            yield result if ordered else (index, result)
+        return
+    
+    instances = iter(instances)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    # Submitted chunks in input order: (future, first index, tables)
+    in_flight = deque()
+    next_index = 0
+    
+    def submit() -> bool:
+        nonlocal next_index
+        chunk = list(islice(instances, chunksize))
+        if not chunk:
+            return False
+        tables, payloads = zip(*(pack_formula(vars, clauses) for vars, clauses in chunk))
+        in_flight.append((executor.submit(_solve_chunk, list(payloads), heuristics, time_limit), next_index, tables))
+        next_index += len(chunk)
+        return True
+    
+    try:
+        while len(in_flight) < 2 * workers and submit():
+            pass
+        while in_flight:
+            if ordered:
+                future, first, tables = in_flight.popleft()
+            else:
+                done, _ = wait([entry[0] for entry in in_flight], return_when=FIRST_COMPLETED)
+                entry = next(entry for entry in in_flight if entry[0] in done)
+                in_flight.remove(entry)
+                future, first, tables = entry
+            packed = future.result()
+            # Refill before handing results out so the workers stay busy
+            submit()
+            for offset, (table, model) in enumerate(zip(tables, packed)):
+                result = _unpack_model(table, model)
+                yield result if ordered else (first + offset, result)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
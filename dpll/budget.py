@@ -0,0 +1,143 @@
+"""Search budgets: resource limits and external cancellation for the engines."""
+
+import math
+import time
+from typing import Optional
+
+
+class _Unknown:
+    """Type of UNKNOWN, the result of a search stopped before it decided the formula."""
+    __slots__ = []
+
+    def __repr__(self) -> str:
+        return 'UNKNOWN'
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        # Unpickle to the same singleton, so `is UNKNOWN` holds in the parent process
+        return 'UNKNOWN'
+
+
+# Returned instead of a model or False when a Budget ran out; falsy like False
+UNKNOWN = _Unknown()
+
+
+class BudgetExhausted(Exception):
+    """Raised by Budget when a limit is reached or the search was cancelled."""
+
+
+class Budget:
+    """Limits on a search: wall time, conflicts, propagations and decisions.
+
+    Engines charge the budget as they go: decide() before every decision,
+    conflict() on every conflict and propagated() after every propagation
+    round (WatchedFormula.propagate does this itself once a budget is
+    attached). Each charge is an increment and a comparison; the clock and
+    the cancel flag are only read every CHECK_INTERVAL charges, so the
+    check can sit in the inner propagation loop. A charge that finds the
+    budget spent raises BudgetExhausted, which dpll.solver.solve turns into
+    UNKNOWN.
+
+    The clock starts when the budget is created and the counters are never
+    reset, so one budget shared by several solve calls limits all of them
+    together.
+    """
+    __slots__ = ['deadline', 'max_conflicts', 'max_propagations', 'max_decisions', 'cancel',
+                 'conflicts', 'propagations', 'decisions', 'countdown', 'reason']
+
+    CHECK_INTERVAL = 64
+
+    def __init__(self, time_limit: Optional[float] = None, conflicts: Optional[int] = None,
+                 propagations: Optional[int] = None, decisions: Optional[int] = None, cancel=None):
+        """Initialize the budget.
+
+        Args:
+            time_limit: Optional wall-clock limit (float, seconds) from now
+            conflicts: Optional maximum number (int) of conflicts
+            propagations: Optional maximum number (int) of propagated literals
+            decisions: Optional maximum number (int) of decisions
+            cancel: Optional flag with an is_set() method, such as threading.Event or
+                multiprocessing.Event; the search stops soon after it is set
+
+        Returns:
+            None
+        """
+        self.deadline = math.inf if time_limit is None else time.perf_counter() + time_limit
+        self.max_conflicts = math.inf if conflicts is None else conflicts
+        self.max_propagations = math.inf if propagations is None else propagations
+        self.max_decisions = math.inf if decisions is None else decisions
+        self.cancel = cancel
+        self.conflicts = 0
+        self.propagations = 0
+        self.decisions = 0
+        self.countdown = self.CHECK_INTERVAL
+        # Why the budget ran out ('time', 'conflicts', 'propagations', 'decisions' or 'cancelled')
+        self.reason: Optional[str] = None
+
+    def decide(self):
+        """Charge one decision.
+
+        Returns:
+            None
+        """
+        self.decisions += 1
+        if self.decisions > self.max_decisions:
+            self._stop('decisions')
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.poll()
+
+    def conflict(self):
+        """Charge one conflict.
+
+        Returns:
+            None
+        """
+        self.conflicts += 1
+        if self.conflicts > self.max_conflicts:
+            self._stop('conflicts')
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.poll()
+
+    def propagated(self, count: int):
+        """Charge a round of propagation.
+
+        Args:
+            count: Number (int) of literals propagated
+
+        Returns:
+            None
+        """
+        self.propagations += count
+        if self.propagations > self.max_propagations:
+            self._stop('propagations')
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.poll()
+
+    def poll(self):
+        """Check the clock and the cancel flag now.
+
+        Returns:
+            None
+        """
+        self.countdown = self.CHECK_INTERVAL
+        if self.cancel is not None and self.cancel.is_set():
+            self._stop('cancelled')
+        if time.perf_counter() >= self.deadline:
+            self._stop('time')
+
+    def _stop(self, reason: str):
+        """Record why the budget ran out and raise BudgetExhausted.
+
+        Args:
+            reason: Name (str) of the exhausted limit
+
+        Returns:
+            None
+        """
+        self.reason = reason
+        raise BudgetExhausted(reason)
@@ -0,0 +1,139 @@
+"""Cardinality constraints: at-most-k and exactly-one groups of literals."""
+
+from itertools import combinations
+from typing import Callable, List
+
+
+class AtMostK:
+    """At most k of the literals may be true.
+
+    A constraint goes in a clause list next to ordinary clauses. The
+    watched-literal engines propagate it natively with a counter of true
+    literals; every other engine gets it expanded to clauses first (see
+    to_clauses). It iterates over its literals like a clause, so get_vars
+    and the branching scorers need nothing special for it.
+    """
+    __slots__ = ['literals', 'k']
+
+    # Whether at least one literal must also be true
+    exactly = False
+
+    def __init__(self, literals: list, k: int):
+        """Initialize the constraint.
+
+        Args:
+            literals: Literals (str or int); duplicates count once
+            k: Maximum number (int) of true literals
+
+        Returns:
+            None
+        """
+        if k < 0:
+            raise ValueError(f"k must be at least 0, got {k}")
+        self.literals = list(dict.fromkeys(literals))
+        self.k = k
+
+    def __iter__(self):
+        return iter(self.literals)
+
+    def __len__(self) -> int:
+        return len(self.literals)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.literals!r}, {self.k})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.literals == other.literals and self.k == other.k
+
+    def map(self, function: Callable) -> 'AtMostK':
+        """Return the same constraint over translated literals.
+
+        Args:
+            function: Function applied to every literal, e.g. VariableTable.encode_literal
+
+        Returns:
+            Constraint of the same type (AtMostK)
+        """
+        return _rebuild(type(self), [function(lit) for lit in self.literals], self.k)
+
+    def to_clauses(self) -> List[List[int]]:
+        """Expand the constraint over engine literals to plain clauses.
+
+        At most one is the pairwise encoding; a larger k forbids every
+        subset of k + 1 literals, which only suits small groups.
+
+        Returns:
+            List of clauses, each clause is a list of literals (int)
+        """
+        clauses = [[-lit for lit in subset] for subset in combinations(self.literals, self.k + 1)]
+        if self.exactly:
+            clauses.append(list(self.literals))
+        return clauses
+
+
+class ExactlyOne(AtMostK):
+    """Exactly one of the literals is true: at most one, plus the clause of all of them."""
+    __slots__ = []
+
+    exactly = True
+
+    def __init__(self, literals: list):
+        """Initialize the constraint.
+
+        Args:
+            literals: Literals (str or int); duplicates count once
+
+        Returns:
+            None
+        """
+        super().__init__(literals, 1)
+
+    def __repr__(self) -> str:
+        return f"ExactlyOne({self.literals!r})"
+
+
+def _rebuild(cls: type, literals: list, k: int) -> AtMostK:
+    """Build a constraint without going through __init__ (for map)."""
+    constraint = object.__new__(cls)
+    constraint.literals = literals
+    constraint.k = k
+    return constraint
+
+
+def split_constraints(clauses: list) -> tuple:
+    """Separate cardinality constraints from plain clauses.
+
+    Args:
+        clauses: List of clauses and AtMostK constraints
+
+    Returns:
+        Tuple of (plain clauses (list), constraints (List[AtMostK]))
+    """
+    plain = []
+    constraints = []
+    for clause in clauses:
+        if isinstance(clause, AtMostK):
+            constraints.append(clause)
+        else:
+            plain.append(clause)
+    return plain, constraints
+
+
+def expand_constraints(clauses: list) -> List[List[int]]:
+    """Replace every cardinality constraint over engine literals by its clauses.
+
+    Args:
+        clauses: List of clauses and AtMostK constraints (int literals)
+
+    Returns:
+        List of plain clauses (List[List[int]]); the input list itself if it has no constraints
+    """
+    if not any(isinstance(clause, AtMostK) for clause in clauses):
+        return clauses
+    expanded = []
+    for clause in clauses:
+        if isinstance(clause, AtMostK):
+            expanded.extend(clause.to_clauses())
+        else:
+            expanded.append(clause)
+    return expanded
@@ -0,0 +1,255 @@
+"""Learned clause database with LBD tiers and periodic reduction."""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    from .watched_literals import WatchedClause, WatchedFormula
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from watched_literals import WatchedClause, WatchedFormula
+
+
+# Tier boundaries on the literal block distance (glue) of a learned clause.
+CORE_LBD = 2
+TIER2_LBD = 6
+
+# Rough per-clause footprint of a WatchedClause plus its literal list and
+# watch-list entries, used to enforce the memory ceiling without sys.getsizeof.
+CLAUSE_OVERHEAD_BYTES = 400
+LITERAL_BYTES = 36
+
+# Conflicts to wait before the memory ceiling may trigger another reduction
+# when the last one could not get under it (the locked clauses alone exceed it)
+CEILING_RETRY_CONFLICTS = 100
+
+
+class ClauseDatabase:
+    """Bookkeeping for learned clauses of a CDCL search.
+    
+    Every learned clause is tagged with its LBD (number of distinct decision
+    levels among its literals) and an activity bumped whenever it takes part
+    in conflict analysis. Clauses fall into three tiers:
+    
+    - core (LBD <= CORE_LBD): never deleted by the periodic reduction
+    - tier2 (LBD <= TIER2_LBD): kept while used since the last reduction
+    - local: the less active half is deleted at every reduction
+    
+    A reduction runs every ``reduce_interval`` conflicts (the interval grows
+    by ``reduce_increment`` each time) and whenever the estimated size of the
+    learned clauses exceeds ``max_memory`` bytes. When a reduction cannot get
+    under the ceiling, because the clauses locked as reasons already exceed
+    it, the ceiling is checked again only after CEILING_RETRY_CONFLICTS more
+    conflicts instead of triggering a reduction at every decision.
+    """
+    __slots__ = ['lbd', 'activity', 'used', 'increment', 'decay_factor',
+                 'reduce_interval', 'reduce_increment', 'next_reduce',
+                 'max_memory', 'memory', 'next_ceiling_check', 'deleted']
+    
+    def __init__(self, reduce_interval: int = 2000, reduce_increment: int = 300,
+                 max_memory: Optional[int] = None, decay_factor: float = 0.999):
+        """Initialize an empty database.
+        
+        Args:
+            reduce_interval: Conflicts (int) before the first reduction
+            reduce_increment: Growth (int) of the interval after each reduction
+            max_memory: Optional ceiling (int, bytes) on learned clause storage
+            decay_factor: Activity decay factor (float) applied per conflict
+        
+        Returns:
+            None
+        """
+        self.lbd: Dict[WatchedClause, int] = {}
+        self.activity: Dict[WatchedClause, float] = {}
+        self.used: Dict[WatchedClause, bool] = {}
+        self.increment = 1.0
+        self.decay_factor = decay_factor
+        self.reduce_interval = reduce_interval
+        self.reduce_increment = reduce_increment
+        self.next_reduce = reduce_interval
+        self.max_memory = max_memory
+        self.memory = 0
+        self.next_ceiling_check = 0
+        self.deleted = 0
+    
+    def __len__(self) -> int:
+        return len(self.lbd)
+    
+    @staticmethod
+    def compute_lbd(literals: List[int], level: Dict[int, int]) -> int:
+        """Count the distinct decision levels among a clause's literals.
+        
+        Args:
+            literals: Clause literals (int)
+            level: Mapping of variables (int) to their decision level
+        
+        Returns:
+            Literal block distance (int)
+        """
+        return len({level.get(abs(lit), 0) for lit in literals})
+    
+    @staticmethod
+    def clause_bytes(clause: WatchedClause) -> int:
+        """Estimate the memory held by a clause.
+        
+        Args:
+            clause: WatchedClause object
+        
+        Returns:
+            Estimated size in bytes (int)
+        """
+        return CLAUSE_OVERHEAD_BYTES + LITERAL_BYTES * len(clause.literals)
+    
+    def add(self, clause: WatchedClause, lbd: int):
+        """Register a freshly learned clause.
+        
+        Args:
+            clause: WatchedClause object just added to the formula
+            lbd: Literal block distance (int) of the clause
+        
+        Returns:
+            None
+        """
+        self.lbd[clause] = lbd
+        self.activity[clause] = self.increment
+        self.used[clause] = True
+        self.memory += self.clause_bytes(clause)
+    
+    def bump(self, clause: WatchedClause, level: Dict[int, int]):
+        """Bump a learned clause used in conflict analysis.
+        
+        The LBD is recomputed under the current assignment; a clause whose
+        glue drops is promoted to the matching tier.
+        
+        Args:
+            clause: WatchedClause object (ignored if it is not learned)
+            level: Mapping of variables (int) to their decision level
+        
+        Returns:
+            None
+        """
+        if clause not in self.lbd:
+            return
+        self.used[clause] = True
+        self.activity[clause] += self.increment
+        if self.activity[clause] > 1e20:
+            for c in self.activity:
+                self.activity[c] *= 1e-20
+            self.increment *= 1e-20
+        lbd = self.compute_lbd(clause.literals, level)
+        if lbd < self.lbd[clause]:
+            self.lbd[clause] = lbd
+    
+    def decay(self):
+        """Decay clause activities after a conflict.
+        
+        Returns:
+            None
+        """
+        self.increment /= self.decay_factor
+    
+    def should_reduce(self, conflicts: int) -> bool:
+        """Check whether a reduction is due.
+        
+        Args:
+            conflicts: Conflicts (int) seen so far in the search
+        
+        Returns:
+            True if the schedule or the memory ceiling calls for a reduction
+        """
+        if conflicts >= self.next_reduce:
+            return True
+        return (self.max_memory is not None and self.memory > self.max_memory
+                and conflicts >= self.next_ceiling_check)
+    
+    def reduce(self, formula: WatchedFormula, conflicts: int = 0) -> int:
+        """Delete low-value learned clauses and compact the formula.
+        
+        Clauses that are the reason of an assignment on the trail are
+        locked and always survive.
+        
+        Args:
+            formula: WatchedFormula object holding the clauses
+            conflicts: Conflicts (int) seen so far, used to schedule the next reduction
+        
+        Returns:
+            Number of deleted clauses (int)
+        """
+        locked = set()
+        clauses = formula.clauses
+        reason = formula.reason
+        for lit in formula.trail:
+            idx = reason[lit if lit > 0 else -lit]
+            if idx is not None and idx >= 0:
+                clause = clauses[idx]
+                if clause in self.lbd:
+                    locked.add(clause)
+        
+        doomed = set()
+        local = []
+        for clause, lbd in self.lbd.items():
+            if clause in locked or lbd <= CORE_LBD:
+                continue
+            if lbd <= TIER2_LBD:
+                if not self.used[clause]:
+                    # Demote: compete with the local tier from now on.
+                    self.lbd[clause] = TIER2_LBD + 1
+                    local.append(clause)
+            else:
+                local.append(clause)
+        
+        local.sort(key=self.activity.__getitem__)
+        doomed.update(local[:len(local) // 2])
+        
+        if self.max_memory is not None:
+            self._evict_to_ceiling(doomed, locked)
+        
+        for clause in self.used:
+            self.used[clause] = False
+        
+        if doomed:
+            for clause in doomed:
+                self.memory -= self.clause_bytes(clause)
+                del self.lbd[clause]
+                del self.activity[clause]
+                del self.used[clause]
+            formula.remove_clauses(doomed)
+            self.deleted += len(doomed)
+        
+        self.reduce_interval += self.reduce_increment
+        self.next_reduce = conflicts + self.reduce_interval
+        if self.max_memory is not None and self.memory > self.max_memory:
+            self.next_ceiling_check = conflicts + CEILING_RETRY_CONFLICTS
+        return len(doomed)
+    
+    def _evict_to_ceiling(self, doomed: set, locked: set):
+        """Mark extra clauses for deletion until under half the memory ceiling.
+        
+        Eviction goes local tier first, then tier2, then core, least active
+        first within each tier.
+        
+        Args:
+            doomed: Set of clauses already marked for deletion (updated in place)
+            locked: Set of clauses that must survive
+        
+        Returns:
+            None
+        """
+        memory = self.memory - sum(self.clause_bytes(c) for c in doomed)
+        if memory <= self.max_memory:
+            return
+        target = self.max_memory // 2
+        
+        def rank(clause):
+            lbd = self.lbd[clause]
+            tier = 0 if lbd > TIER2_LBD else 1 if lbd > CORE_LBD else 2
+            return (tier, self.activity[clause])
+        
+        candidates = [c for c in self.lbd if c not in doomed and c not in locked]
+        candidates.sort(key=rank)
+        for clause in candidates:
+            if memory <= target:
+                break
+            doomed.add(clause)
+            memory -= self.clause_bytes(clause)
@@ -0,0 +1,335 @@
+"""Cube-and-conquer: split the search space into cubes and solve them in parallel."""
+
+import os
+import sys
+import math
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from .helpers import VariableTable
+    from .watched_literals import WatchedFormula
+    from .heuristics import VSIDSScorer
+    from .incremental import Solver
+    from .budget import Budget, UNKNOWN
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from helpers import VariableTable
+    from watched_literals import WatchedFormula
+    from heuristics import VSIDSScorer
+    from incremental import Solver
+    from budget import Budget, UNKNOWN
+
+
+class CubeGenerator:
+    """Split a formula into cubes by a depth-limited search on a WatchedFormula.
+    
+    Each node of the split tree picks a variable and branches on both
+    polarities, propagating each on its own decision level. A branch that
+    conflicts is refuted on the spot and produces no cube; the leaves that
+    remain at the target depth, or where every variable is assigned, are
+    the cubes. Together they cover every model of the formula.
+    
+    The 'vsids' split takes the highest-ranked unassigned variable, ranked
+    by clause occurrences as VSIDS starts out. The 'lookahead' split
+    propagates both polarities of the top candidates and takes the variable
+    whose smaller side implies the most literals, scored by the product of
+    both sides as in march-style lookahead solvers. A polarity that fails
+    during lookahead is a failed literal, so its negation is assigned on the
+    node's level before the split.
+    """
+    __slots__ = ['formula', 'model', 'ranking', 'method', 'candidates', 'cubes', 'stats', 'deadline']
+    
+    def __init__(self, clauses: List[List[int]], method: str = 'lookahead', candidates: int = 16):
+        """Initialize the generator.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+            method: Split selection, 'lookahead' or 'vsids'
+            candidates: Number (int) of top-ranked variables looked ahead on per node
+        
+        Returns:
+            None
+        """
+        if method not in ('lookahead', 'vsids'):
+            raise ValueError(f"Unknown cube split method: {method}")
+        self.formula = WatchedFormula(clauses)
+        self.model: Dict[int, bool] = {}
+        scores = VSIDSScorer(clauses).scores
+        self.ranking = sorted(scores, key=lambda var: (-scores[var], var))
+        self.method = method
+        self.candidates = candidates
+        self.cubes: List[List[int]] = []
+        self.stats = {'nodes': 0, 'refuted': 0, 'failed': 0}
+        self.deadline: Optional[float] = None
+    
+    def _look(self, literal: int) -> Optional[int]:
+        """Propagate a literal on a temporary decision level.
+        
+        Args:
+            literal: Literal (int) to try
+        
+        Returns:
+            Number (int) of literals it made true, or None if it conflicts
+        """
+        formula = self.formula
+        level = formula.decision_level()
+        formula.new_decision_level()
+        formula.assign(literal, self.model)
+        conflict = formula.propagate(self.model)
+        implied = len(formula.trail) - formula.trail_lim[level]
+        formula.backtrack(level, self.model)
+        return None if conflict is not None else implied
+    
+    def _pick(self) -> Tuple[bool, Optional[int]]:
+        """Choose the variable to split on at the current node.
+        
+        Returns:
+            Tuple of (consistent, variable): consistent is False if lookahead
+            refuted the node, variable is None if every variable is assigned
+        """
+        model = self.model
+        free = (var for var in self.ranking if var not in model)
+        if self.method == 'vsids':
+            return True, next(free, None)
+        
+        formula = self.formula
+        best, best_score = None, -1
+        looked = 0
+        for var in self.ranking:
+            if looked == self.candidates:
+                break
+            # A failed literal found earlier at this node may have assigned it
+            if var in model:
+                continue
+            looked += 1
+            positive = self._look(var)
+            negative = self._look(-var)
+            if positive is None or negative is None:
+                if positive is None and negative is None:
+                    return False, None
+                self.stats['failed'] += 1
+                formula.assign(-var if positive is None else var, model)
+                if formula.propagate(model) is not None:
+                    return False, None
+                continue
+            score = positive * negative + positive + negative
+            if score > best_score:
+                best, best_score = var, score
+        # A later failed literal may have assigned the best candidate too
+        if best is None or best in model:
+            best = next((var for var in self.ranking if var not in model), None)
+        return True, best
+    
+    def _split(self, cube: List[int], depth: int):
+        """Expand the node reached by deciding the literals of cube.
+        
+        Args:
+            cube: Decided literals (List[int]) leading to this node
+            depth: Remaining split depth (int)
+        
+        Returns:
+            None
+        """
+        self.stats['nodes'] += 1
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            # Out of time: the node becomes a cube as it stands
+            self.cubes.append(cube)
+            return
+        consistent, var = self._pick()
+        if not consistent:
+            self.stats['refuted'] += 1
+            return
+        if depth == 0 or var is None:
+            self.cubes.append(cube)
+            return
+        
+        formula = self.formula
+        level = formula.decision_level()
+        for literal in (var, -var):
+            formula.new_decision_level()
+            formula.assign(literal, self.model)
+            if formula.propagate(self.model) is None:
+                self._split(cube + [literal], depth - 1)
+            else:
+                self.stats['refuted'] += 1
+            formula.backtrack(level, self.model)
+    
+    def generate(self, depth: int, deadline: Optional[float] = None) -> List[List[int]]:
+        """Split the formula down to the given depth.
+        
+        Nodes reached after the deadline are not split further, so the
+        cubes still cover every model, only fewer of them.
+        
+        Args:
+            depth: Maximum number (int) of decisions per cube
+            deadline: Optional time.perf_counter() value (float) after which splitting stops
+        
+        Returns:
+            List of cubes, each a list of literals (int); empty if the split
+            refuted the whole formula
+        """
+        self.cubes = []
+        self.deadline = deadline
+        formula = self.formula
+        if not formula.assign_units(self.model) or formula.propagate(self.model) is not None:
+            return []
+        self._split([], depth)
+        return self.cubes
+
+
+def _conquer(conn, vars: list, clauses: list):
+    """Worker loop: solve cubes handed out by the parent until told to stop.
+    
+    The worker keeps one incremental Solver for all its cubes, so clauses
+    learned on one cube speed up the next. Each cube is solved as a set of
+    assumptions; an UNSAT answer carries the failed assumptions, which
+    refute every other cube that contains them.
+    
+    Args:
+        conn: The worker's end of a duplex multiprocessing.Pipe
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+    
+    Returns:
+        None
+    """
+    solver = Solver(clauses)
+    for var in vars:
+        solver.add_variable(var)
+    try:
+        while True:
+            cube = conn.recv()
+            if cube is None:
+                break
+            result = solver.solve(cube)
+            conn.send((result, solver.failed_assumptions))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+def solve_cube_and_conquer(vars: list, clauses: list, workers: Optional[int] = None, depth: Optional[int] = None,
+                           method: str = 'lookahead', stats: Optional[Dict[str, int]] = None,
+                           time_limit: Optional[float] = None):
+    """Solve a formula by cube-and-conquer.
+    
+    The cube phase splits the formula into cubes (see CubeGenerator). The
+    conquer phase hands the cubes out one at a time: a worker that finishes
+    a cube immediately takes the next one, so workers that drew easy cubes
+    take over the work the others have not reached yet. The first SAT cube
+    ends the search and the remaining workers are terminated. An UNSAT cube
+    reports its failed assumptions, and queued cubes that contain them are
+    dropped without being solved. The formula is UNSAT once every cube is.
+    A time limit covers both phases: the split stops refining cubes once
+    it passes, and in the conquer phase the workers are terminated and the
+    search reports UNKNOWN.
+    
+    Args:
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+        workers: Optional number of worker processes (default os.cpu_count()); with 1 the
+            cubes are solved in this process
+        depth: Optional split depth (int); default gives about eight cubes per worker
+        method: Split selection, 'lookahead' or 'vsids'
+        stats: Optional dict updated with 'cubes', 'solved', 'pruned' and the generator's stats
+        time_limit: Optional wall-clock limit (float, seconds) for the whole search
+    
+    Returns:
+        Dict mapping variables to bool if satisfiable, False if unsatisfiable,
+        UNKNOWN if the time limit passed first
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if depth is None:
+        depth = max(1, math.ceil(math.log2(8 * workers)))
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    
+    table = VariableTable(vars)
+    generator = CubeGenerator(table.encode_clauses(clauses), method)
+    cubes = [[table.decode_literal(lit) for lit in cube] for cube in generator.generate(depth, deadline)]
+    counts = {'cubes': len(cubes), 'solved': 0, 'pruned': 0}
+    
+    cores = []
+    queue = iter(cubes)
+    
+    def next_cube():
+        # Skip cubes already refuted by a failed-assumption core
+        for cube in queue:
+            literals = set(cube)
+            if any(core <= literals for core in cores):
+                counts['pruned'] += 1
+                continue
+            return cube
+        return None
+    
+    try:
+        if workers == 1:
+            solver = Solver(clauses)
+            for var in vars:
+                solver.add_variable(var)
+            budget = None if deadline is None else Budget(deadline - time.perf_counter())
+            result = False
+            cube = next_cube()
+            while cube is not None:
+                counts['solved'] += 1
+                result = solver.solve(cube, budget)
+                if result is not False or not solver.failed_assumptions:
+                    break
+                cores.append(set(solver.failed_assumptions))
+                cube = next_cube()
+            return result
+        
+        connections = {}  # parent end of a worker's pipe -> process
+        try:
+            for _ in range(min(workers, len(cubes))):
+                cube = next_cube()
+                if cube is None:
+                    break
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_conquer, args=(child, vars, clauses), daemon=True)
+                process.start()
+                child.close()
+                parent.send(cube)
+                connections[parent] = process
+            
+            busy = set(connections)
+            while busy:
+                timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                ready = wait(list(busy), timeout)
+                if not ready:
+                    return UNKNOWN
+                for conn in ready:
+                    try:
+                        answer, core = conn.recv()
+                    except EOFError:
+                        raise RuntimeError(f"Cube worker exited with code {connections[conn].exitcode}")
+                    counts['solved'] += 1
+                    if answer is not False:
+                        return answer
+                    if not core:
+                        # The formula itself is unsatisfiable
+                        return False
+                    cores.append(set(core))
+                    cube = next_cube()
+                    if cube is None:
+                        busy.discard(conn)
+                    else:
+                        conn.send(cube)
+            return False
+        finally:
+            for process in connections.values():
+                process.terminate()
+            for conn, process in connections.items():
+                process.join()
+                conn.close()
+    finally:
+        if stats is not None:
+            stats.update(generator.stats)
+            stats.update(counts)
@@ -0,0 +1,446 @@
+"""Cardinality encodings: at-most-k, at-least-k and exactly-k as plain clauses.
+
+Every encoding here states "at most k of the literals are true" and adds
+auxiliary variables. at_least_k and exactly_k are built on it, since at
+least k of n literals are true exactly when at most n - k of their
+negations are. The encodings only imply their auxiliaries upwards, from
+true inputs to true counters, which is all an upper bound needs.
+
+    binomial          every subset of k + 1 literals has a false one; no
+                      auxiliaries but C(n, k + 1) clauses
+    sequential        sequential counter (Sinz 2005), O(n * k) clauses
+    totalizer         unary adder tree (Bailleux and Boufkhad 2003) with
+                      counters capped at k + 1, O(n * k) clauses
+    modulo_totalizer  totalizer counting in quotient and remainder digits
+                      (Ogawa et al. 2013), O(n * sqrt(k)) variables
+    sorting_network   Batcher odd-even merge sort, O(n log^2 n) clauses
+"""
+
+import itertools
+import math
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+class AuxiliaryVariables:
+    """Source of fresh variables for the encodings.
+
+    String pools hand out prefix + counter, int pools consecutive ints
+    from a start value. Share one pool between every encoding that goes
+    into the same formula, so their auxiliaries never collide.
+    """
+    __slots__ = ['prefix', 'next']
+
+    # Numbers the default prefixes of pools created without one
+    _pools = itertools.count()
+
+    def __init__(self, prefix: Optional[str] = None, start: int = 1):
+        """Initialize the pool.
+
+        Args:
+            prefix: Optional name prefix (str) for string variables; None makes an
+                int pool
+            start: First number (int) handed out
+
+        Returns:
+            None
+        """
+        self.prefix = prefix
+        self.next = start
+
+    @classmethod
+    def for_literals(cls, literals: list) -> 'AuxiliaryVariables':
+        """Make a pool whose variables fit among the given literals.
+
+        Int literals get ints above the largest variable; string literals
+        get a prefix no other default pool uses.
+
+        Args:
+            literals: Literals (str or int) the encoding will constrain
+
+        Returns:
+            New pool (AuxiliaryVariables)
+        """
+        if literals and isinstance(literals[0], int):
+            return cls(start=max(abs(lit) for lit in literals) + 1)
+        return cls(prefix=f"_aux{next(cls._pools)}_")
+
+    def new(self) -> Hashable:
+        """Return a variable not handed out before.
+
+        Returns:
+            Fresh variable (str or int)
+        """
+        number = self.next
+        self.next += 1
+        if self.prefix is None:
+            return number
+        return f"{self.prefix}{number}"
+
+
+def negate(literal):
+    """Negate a literal in either naming scheme.
+
+    Args:
+        literal: Literal (str with optional '-' prefix, or signed int)
+
+    Returns:
+        Negated literal (str or int)
+    """
+    if isinstance(literal, int):
+        return -literal
+    return literal[1:] if literal[0] == '-' else '-' + literal
+
+
+def binomial(literals: list, k: int, pool: AuxiliaryVariables) -> List[list]:
+    """At most k: forbid every subset of k + 1 true literals.
+
+    Args:
+        literals: Literals (str or int)
+        k: Maximum number (int) of true literals
+        pool: AuxiliaryVariables (unused, no auxiliaries)
+
+    Returns:
+        List of clauses
+    """
+    return [[negate(lit) for lit in subset] for subset in itertools.combinations(literals, k + 1)]
+
+
+def sequential_counter(literals: list, k: int, pool: AuxiliaryVariables) -> List[list]:
+    """At most k with a sequential counter.
+
+    counts[j] is true once at least j + 1 of the literals seen so far are;
+    each literal carries the counter one step and may not push it past k.
+
+    Args:
+        literals: Literals (str or int)
+        k: Maximum number (int) of true literals, 0 < k < len(literals)
+        pool: AuxiliaryVariables for the counter bits
+
+    Returns:
+        List of clauses
+    """
+    clauses = []
+    n = len(literals)
+    counts = [pool.new() for _ in range(k)]
+    clauses.append([negate(literals[0]), counts[0]])
+    for i in range(1, n):
+        lit = literals[i]
+        if i == n - 1:
+            clauses.append([negate(lit), negate(counts[k - 1])])
+            break
+        nxt = [pool.new() for _ in range(k)]
+        clauses.append([negate(lit), nxt[0]])
+        clauses.append([negate(counts[0]), nxt[0]])
+        for j in range(1, k):
+            clauses.append([negate(counts[j]), nxt[j]])
+            clauses.append([negate(lit), negate(counts[j - 1]), nxt[j]])
+        clauses.append([negate(lit), negate(counts[k - 1])])
+        counts = nxt
+    return clauses
+
+
+def _totalize(literals: list, cap: int, pool: AuxiliaryVariables, clauses: List[list]) -> list:
+    """Build a totalizer subtree and return its unary output.
+
+    Output i (0-based) is implied once at least i + 1 inputs are true;
+    outputs stop at cap.
+
+    Args:
+        literals: Inputs (str or int) of the subtree
+        cap: Number (int) of outputs kept at most
+        pool: AuxiliaryVariables for the outputs
+        clauses: List the subtree's clauses are appended to
+
+    Returns:
+        Output literals (list)
+    """
+    if len(literals) == 1:
+        return list(literals)
+    middle = len(literals) // 2
+    left = _totalize(literals[:middle], cap, pool, clauses)
+    right = _totalize(literals[middle:], cap, pool, clauses)
+    outputs = [pool.new() for _ in range(min(len(left) + len(right), cap))]
+    for a in range(len(left) + 1):
+        for b in range(len(right) + 1):
+            total = a + b
+            if total == 0 or total > len(outputs):
+                continue
+            clause = [outputs[total - 1]]
+            if a:
+                clause.append(negate(left[a - 1]))
+            if b:
+                clause.append(negate(right[b - 1]))
+            clauses.append(clause)
+    return outputs
+
+
+def totalizer(literals: list, k: int, pool: AuxiliaryVariables) -> List[list]:
+    """At most k with a totalizer whose counters stop at k + 1.
+
+    Args:
+        literals: Literals (str or int)
+        k: Maximum number (int) of true literals, 0 < k < len(literals)
+        pool: AuxiliaryVariables for the node outputs
+
+    Returns:
+        List of clauses
+    """
+    clauses = []
+    outputs = _totalize(list(literals), k + 1, pool, clauses)
+    clauses.append([negate(outputs[k])])
+    return clauses
+
+
+def unary_counter(literals: list, pool: Optional[AuxiliaryVariables] = None) -> tuple:
+    """Count the true literals in unary with an uncapped totalizer.
+
+    Unlike the encodings above this states no bound itself: outputs[k] is
+    implied once more than k literals are true, so adding or assuming
+    negate(outputs[k]) caps the count at k. One set of clauses thus
+    serves every bound, as incremental solving under assumptions needs.
+
+    Args:
+        literals: Distinct literals (str or int)
+        pool: Optional AuxiliaryVariables (default AuxiliaryVariables.for_literals)
+
+    Returns:
+        Tuple of (list of clauses, output literals (list), one per literal)
+    """
+    literals = list(literals)
+    if not literals:
+        return [], []
+    if pool is None:
+        pool = AuxiliaryVariables.for_literals(literals)
+    clauses = []
+    outputs = _totalize(literals, len(literals), pool, clauses)
+    return clauses, outputs
+
+
+def _modulo_totalize(literals: list, p: int, upper_cap: int, pool: AuxiliaryVariables,
+                     clauses: List[list]) -> tuple:
+    """Build a modulo totalizer subtree.
+
+    A node counts its true inputs as quotient * p + remainder, both in
+    unary: upper[i] is implied once the quotient reaches i + 1 and
+    lower[i] once the remainder reaches i + 1. A carry is implied when the
+    children's remainders add up to p or more; with the carry false their
+    sum is the remainder, with it true the sum less p is, and the quotient
+    takes one more. Choosing the carry freely never lowers the count, so
+    the root still bounds the true count from above.
+
+    Args:
+        literals: Inputs (str or int) of the subtree
+        p: Modulus (int)
+        upper_cap: Number (int) of quotient digits kept at most
+        pool: AuxiliaryVariables for the digits and carries
+        clauses: List the subtree's clauses are appended to
+
+    Returns:
+        Tuple of (upper digits (list), lower digits (list))
+    """
+    if len(literals) == 1:
+        return [], list(literals)
+    middle = len(literals) // 2
+    left_upper, left_lower = _modulo_totalize(literals[:middle], p, upper_cap, pool, clauses)
+    right_upper, right_lower = _modulo_totalize(literals[middle:], p, upper_cap, pool, clauses)
+    carry = pool.new() if len(left_lower) + len(right_lower) >= p else None
+    lower = [pool.new() for _ in range(min(len(left_lower) + len(right_lower), p - 1))]
+    # A carry may be set without being forced, so the quotient gets a digit for it
+    upper_size = len(left_upper) + len(right_upper) + (carry is not None)
+    upper = [pool.new() for _ in range(min(upper_size, upper_cap))]
+
+    for i in range(len(left_lower) + 1):
+        for j in range(len(right_lower) + 1):
+            premise = []
+            if i:
+                premise.append(negate(left_lower[i - 1]))
+            if j:
+                premise.append(negate(right_lower[j - 1]))
+            if i + j >= p:
+                clauses.append(premise + [carry])
+                if i + j > p:
+                    clauses.append(premise + [negate(carry), lower[i + j - p - 1]])
+            elif i + j:
+                clause = premise + [lower[i + j - 1]]
+                if carry is not None:
+                    clause.append(carry)
+                clauses.append(clause)
+
+    for a in range(len(left_upper) + 1):
+        for b in range(len(right_upper) + 1):
+            premise = []
+            if a:
+                premise.append(negate(left_upper[a - 1]))
+            if b:
+                premise.append(negate(right_upper[b - 1]))
+            if 0 < a + b <= len(upper):
+                clauses.append(premise + [upper[a + b - 1]])
+            if carry is not None and a + b + 1 <= len(upper):
+                clauses.append(premise + [negate(carry), upper[a + b]])
+    return upper, lower
+
+
+def modulo_totalizer(literals: list, k: int, pool: AuxiliaryVariables) -> List[list]:
+    """At most k with a modulo totalizer of modulus about sqrt(k + 1).
+
+    Args:
+        literals: Literals (str or int)
+        k: Maximum number (int) of true literals, 0 < k < len(literals)
+        pool: AuxiliaryVariables for the digits and carries
+
+    Returns:
+        List of clauses
+    """
+    p = max(2, math.isqrt(k + 1))
+    quotient, remainder = divmod(k, p)
+    clauses = []
+    upper, lower = _modulo_totalize(list(literals), p, quotient + 1, pool, clauses)
+    # The count may not reach (quotient + 1) * p, nor quotient * p + remainder + 1
+    if len(upper) > quotient:
+        clauses.append([negate(upper[quotient])])
+    if remainder + 1 <= len(lower):
+        clause = [negate(lower[remainder])]
+        if quotient:
+            clause.append(negate(upper[quotient - 1]))
+        clauses.append(clause)
+    return clauses
+
+
+def _comparator(a, b, pool: AuxiliaryVariables, clauses: List[list]) -> tuple:
+    """Sort two wires: return (a or b, a and b), None standing for false.
+
+    Args:
+        a: First wire (str or int literal, or None)
+        b: Second wire (str or int literal, or None)
+        pool: AuxiliaryVariables for the outputs
+        clauses: List the comparator's clauses are appended to
+
+    Returns:
+        Tuple of (larger wire, smaller wire)
+    """
+    if a is None:
+        return b, None
+    if b is None:
+        return a, None
+    high, low = pool.new(), pool.new()
+    clauses.append([negate(a), high])
+    clauses.append([negate(b), high])
+    clauses.append([negate(a), negate(b), low])
+    return high, low
+
+
+def _merge(wires: list, lo: int, n: int, step: int, pool: AuxiliaryVariables, clauses: List[list]):
+    """Batcher odd-even merge of wires[lo::step] (n wires, both halves sorted)."""
+    double = step * 2
+    if double < n:
+        _merge(wires, lo, n, double, pool, clauses)
+        _merge(wires, lo + step, n, double, pool, clauses)
+        for i in range(lo + step, lo + n - step, double):
+            wires[i], wires[i + step] = _comparator(wires[i], wires[i + step], pool, clauses)
+    else:
+        wires[lo], wires[lo + step] = _comparator(wires[lo], wires[lo + step], pool, clauses)
+
+
+def _sort(wires: list, lo: int, n: int, pool: AuxiliaryVariables, clauses: List[list]):
+    """Batcher odd-even merge sort of wires[lo:lo + n] into descending order."""
+    if n > 1:
+        half = n // 2
+        _sort(wires, lo, half, pool, clauses)
+        _sort(wires, lo + half, half, pool, clauses)
+        _merge(wires, lo, n, 1, pool, clauses)
+
+
+def sorting_network(literals: list, k: int, pool: AuxiliaryVariables) -> List[list]:
+    """At most k with a sorting network: the (k + 1)-th largest output is false.
+
+    The inputs are padded with false wires to a power of two; comparators
+    on a false wire cost nothing.
+
+    Args:
+        literals: Literals (str or int)
+        k: Maximum number (int) of true literals, 0 < k < len(literals)
+        pool: AuxiliaryVariables for the comparator outputs
+
+    Returns:
+        List of clauses
+    """
+    size = 1 << (len(literals) - 1).bit_length()
+    wires = list(literals) + [None] * (size - len(literals))
+    clauses = []
+    _sort(wires, 0, size, pool, clauses)
+    clauses.append([negate(wires[k])])
+    return clauses
+
+
+ENCODINGS: Dict[str, Callable] = {
+    'binomial': binomial,
+    'sequential': sequential_counter,
+    'totalizer': totalizer,
+    'modulo_totalizer': modulo_totalizer,
+    'sorting_network': sorting_network,
+}
+
+
+def at_most_k(literals: list, k: int, encoding: str = 'sequential',
+              pool: Optional[AuxiliaryVariables] = None) -> List[list]:
+    """Encode "at most k of the literals are true" as clauses.
+
+    Args:
+        literals: Distinct literals (str or int)
+        k: Maximum number (int) of true literals
+        encoding: Name (str) of an encoding in ENCODINGS, default 'sequential'
+        pool: Optional AuxiliaryVariables (default AuxiliaryVariables.for_literals)
+
+    Returns:
+        List of clauses, each clause is a list of literals (str or int)
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    literals = list(literals)
+    if k >= len(literals):
+        return []
+    if k < 0:
+        return [[]]
+    if k == 0:
+        return [[negate(lit)] for lit in literals]
+    if pool is None:
+        pool = AuxiliaryVariables.for_literals(literals)
+    return ENCODINGS[encoding](literals, k, pool)
+
+
+def at_least_k(literals: list, k: int, encoding: str = 'sequential',
+               pool: Optional[AuxiliaryVariables] = None) -> List[list]:
+    """Encode "at least k of the literals are true" as clauses.
+
+    Args:
+        literals: Distinct literals (str or int)
+        k: Minimum number (int) of true literals
+        encoding: Name (str) of an encoding in ENCODINGS, default 'sequential'
+        pool: Optional AuxiliaryVariables (default AuxiliaryVariables.for_literals)
+
+    Returns:
+        List of clauses, each clause is a list of literals (str or int)
+    """
+    literals = list(literals)
+    if pool is None:
+        pool = AuxiliaryVariables.for_literals(literals)
+    return at_most_k([negate(lit) for lit in literals], len(literals) - k, encoding, pool)
+
+
+def exactly_k(literals: list, k: int, encoding: str = 'sequential',
+              pool: Optional[AuxiliaryVariables] = None) -> List[list]:
+    """Encode "exactly k of the literals are true" as clauses.
+
+    Args:
+        literals: Distinct literals (str or int)
+        k: Number (int) of true literals
+        encoding: Name (str) of an encoding in ENCODINGS, default 'sequential'
+        pool: Optional AuxiliaryVariables (default AuxiliaryVariables.for_literals)
+
+    Returns:
+        List of clauses, each clause is a list of literals (str or int)
+    """
+    literals = list(literals)
+    if pool is None:
+        pool = AuxiliaryVariables.for_literals(literals)
+    return at_most_k(literals, k, encoding, pool) + at_least_k(literals, k, encoding, pool)
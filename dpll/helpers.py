@@ -1,43 +1,51 @@
-from typing import List, Tuple
+import sys
+from pathlib import Path
+from typing import List, Tuple, Dict, Hashable
 
+try:
+    from .cardinality import AtMostK
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from cardinality import AtMostK
 
-def parse_literal(lit: str) -> Tuple[str, bool]:
-    """Parse a literal into variable name and polarity.
+
+def parse_literal(lit: int) -> Tuple[int, bool]:
+    """Parse a literal into variable and polarity.
     
     Args:
-        lit: Literal string (str), possibly negated with '-' prefix
+        lit: Literal (int), negative for a negated variable
     
     Returns:
-        Tuple of (variable name (str), is_positive (bool))
+        Tuple of (variable (int), is_positive (bool))
     """
-    if lit.startswith('-'):
-        return lit[1:], False
+    if lit < 0:
+        return -lit, False
     return lit, True
 
 
-def negate_literal(lit: str) -> str:
+def negate_literal(lit: int) -> int:
     """Negate a literal.
     
     Args:
-        lit: Literal string (str)
+        lit: Literal (int)
     
     Returns:
-        Negated literal (str)
+        Negated literal (int)
     """
-    return lit[1:] if lit.startswith('-') else '-' + lit
+    return -lit
 
 
-def simplify_clauses(clauses: List[List[str]], literal: str) -> List[List[str]]:
+def simplify_clauses(clauses: List[List[int]], literal: int) -> List[List[int]]:
     """Simplify clauses given a literal assignment.
     
     Args:
-        clauses: List of clauses, each clause is a list of literals (str)
-        literal: Assigned literal (str)
+        clauses: List of clauses, each clause is a list of literals (int)
+        literal: Assigned literal (int)
     
     Returns:
-        Simplified list of clauses (List[List[str]])
+        Simplified list of clauses (List[List[int]])
     """
-    neg_literal = negate_literal(literal)
+    neg_literal = -literal
     new_clauses = []
     
     for clause in clauses:
@@ -52,18 +60,151 @@ def simplify_clauses(clauses: List[List[str]], literal: str) -> List[List[str]]:
     return new_clauses
 
 
+def add_stat(stats: Dict[str, float], key: str, amount: float = 1):
+    """Add to a counter of a statistics dict.
+    
+    Engines only call this behind an ``if stats is not None`` check, so
+    disabled statistics cost a single comparison.
+    
+    Args:
+        stats: Statistics dict mapping counter names to numbers
+        key: Counter name (str)
+        amount: Amount (int or float) to add
+    
+    Returns:
+        None
+    """
+    stats[key] = stats.get(key, 0) + amount
+
+
 def get_vars(clauses):
     """Extract all unique variables from clauses.
     
     Args:
-        clauses: List of clauses, each clause is a list of literals (str)
+        clauses: List of clauses, each clause is a list of literals (str or int)
     
     Returns:
-        Sorted list of variable names (List[str])
+        Sorted list of variable names (List[str] or List[int])
     """
     vars_set = set()
     for clause in clauses:
         for literal in clause:
-            var = literal.lstrip('-')
+            if isinstance(literal, int):
+                var = abs(literal)
+            else:
+                var = literal.lstrip('-')
             vars_set.add(var)
     return sorted(list(vars_set))
+
+
+class VariableTable:
+    """Interned mapping between external variable names and engine variables.
+    
+    The engines work on DIMACS-style integer literals: variable ids start at 1
+    and a negative literal is the negated variable. Names are whatever the
+    caller uses (strings such as ``"1-2-3"`` or plain ints from a DIMACS file),
+    and string literals are negated with a ``'-'`` prefix.
+    """
+    __slots__ = ['names', 'ids']
+    
+    def __init__(self, vars: List[Hashable] = ()):
+        """Initialize the table, interning the given variables in order.
+        
+        Args:
+            vars: Variable names to intern first (List[str] or List[int])
+        
+        Returns:
+            None
+        """
+        self.names: List[Hashable] = [None]
+        self.ids: Dict[Hashable, int] = {}
+        for var in vars:
+            self.intern(var)
+    
+    def __len__(self) -> int:
+        return len(self.names) - 1
+    
+    def intern(self, name: Hashable) -> int:
+        """Return the engine variable for a name, allocating one if needed.
+        
+        Args:
+            name: Variable name (str or int)
+        
+        Returns:
+            Engine variable (int, >= 1)
+        """
+        var = self.ids.get(name)
+        if var is None:
+            var = len(self.names)
+            self.ids[name] = var
+            self.names.append(name)
+        return var
+    
+    def encode_literal(self, lit) -> int:
+        """Translate an external literal to an engine literal.
+        
+        Args:
+            lit: Literal (str with optional '-' prefix, or signed int)
+        
+        Returns:
+            Engine literal (int)
+        """
+        if isinstance(lit, int):
+            return self.intern(lit) if lit > 0 else -self.intern(-lit)
+        if lit[0] == '-':
+            return -self.intern(lit[1:])
+        return self.intern(lit)
+    
+    def decode_literal(self, lit: int):
+        """Translate an engine literal back to the external form.
+        
+        Args:
+            lit: Engine literal (int)
+        
+        Returns:
+            External literal (str or int, matching the interned names)
+        """
+        name = self.names[abs(lit)]
+        if lit > 0:
+            return name
+        if isinstance(name, int):
+            return -name
+        return '-' + name
+    
+    def encode_clauses(self, clauses: list) -> List[List[int]]:
+        """Translate a list of external clauses to engine clauses.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (str or int),
+                and dpll.cardinality constraints
+        
+        Returns:
+            List of clauses of engine literals (List[List[int]]), with constraints
+            translated in place
+        """
+        encode = self.encode_literal
+        return [clause.map(encode) if isinstance(clause, AtMostK) else [encode(lit) for lit in clause]
+                for clause in clauses]
+    
+    def encode_model(self, model: Dict[Hashable, bool]) -> Dict[int, bool]:
+        """Translate an external assignment to engine variables.
+        
+        Args:
+            model: Variable assignment mapping names to bool
+        
+        Returns:
+            Assignment mapping engine variables (int) to bool
+        """
+        return {self.intern(name): value for name, value in model.items()}
+    
+    def decode_model(self, model: Dict[int, bool]) -> Dict[Hashable, bool]:
+        """Translate an engine assignment back to external names.
+        
+        Args:
+            model: Assignment mapping engine variables (int) to bool
+        
+        Returns:
+            Variable assignment mapping names to bool
+        """
+        names = self.names
+        return {names[var]: value for var, value in model.items()}
@@ -1,7 +1,7 @@
 import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import heapq
+import random
 
 try:
     from .helpers import parse_literal, simplify_clauses
@@ -10,15 +10,15 @@ except ImportError:
     from helpers import parse_literal, simplify_clauses
 
 
-def unit_propagate(clauses: List[List[str]], model: Dict[str, bool]) -> Tuple[List[List[str]], Dict[str, bool], bool]:
+def unit_propagate(clauses: List[List[int]], model: Dict[int, bool]) -> Tuple[List[List[int]], Dict[int, bool], bool]:
     """Apply unit propagation to simplify clauses.
     
     Args:
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
     
     Returns:
-        Tuple of (simplified clauses (List[List[str]]), updated model (Dict[str, bool]), conflict detected (bool))
+        Tuple of (simplified clauses (List[List[int]]), updated model (Dict[int, bool]), conflict detected (bool))
     """
     model = model.copy()
     unit_clauses = {i for i, c in enumerate(clauses) if len(c) == 1}
@@ -48,15 +48,15 @@ def unit_propagate(clauses: List[List[str]], model: Dict[str, bool]) -> Tuple[Li
     return clauses, model, False
 
 
-def eliminate_pure_literals(clauses: List[List[str]], model: Dict[str, bool]) -> Tuple[List[List[str]], Dict[str, bool]]:
+def eliminate_pure_literals(clauses: List[List[int]], model: Dict[int, bool]) -> Tuple[List[List[int]], Dict[int, bool]]:
     """Eliminate pure literals from clauses.
     
     Args:
-        clauses: List of clauses, each clause is a list of literals (str)
-        model: Partial variable assignment mapping variable names to bool
+        clauses: List of clauses, each clause is a list of literals (int)
+        model: Partial variable assignment mapping variables (int) to bool
     
     Returns:
-        Tuple of (simplified clauses (List[List[str]]), updated model (Dict[str, bool]))
+        Tuple of (simplified clauses (List[List[int]]), updated model (Dict[int, bool]))
     """
     model = model.copy()
     polarity = {}
@@ -77,7 +77,7 @@ def eliminate_pure_literals(clauses: List[List[str]], model: Dict[str, bool]) ->
     for var, pol in polarity.items():
         if pol is not None:
             model[var] = pol
-            literal = var if pol else '-' + var
+            literal = var if pol else -var
             pure_literals.append(literal)
     
     for literal in pure_literals:
@@ -86,43 +86,368 @@ def eliminate_pure_literals(clauses: List[List[str]], model: Dict[str, bool]) ->
     return clauses, model
 
 
-class VSIDSScorer:
-    __slots__ = ['scores', 'increment', 'decay_factor', 'heap', 'heap_valid']
+class BranchingHeuristic:
+    """Interface for decision heuristics, backed by an indexed max-heap.
     
-    def __init__(self, clauses: List[List[str]], decay_factor: float = 0.95):
+    Engines talk to a heuristic through five calls:
+    
+    - pick_variable(model) at every decision
+    - bump(var) for each variable involved in a conflict
+    - decay() once per conflict, after the bumps
+    - unassign(var) from WatchedFormula.backtrack for every undone variable
+    - on_assign(var) for every assignment, only if track_assignments is set
+      (the engine then installs the heuristic as the formula's listener)
+    
+    heap holds variables ordered by score (ties go to the smaller variable)
+    and position maps each variable in the heap to its index, so score
+    changes are in-place increase/decrease-key operations. Assigned
+    variables are dropped lazily when they reach the top and put back by
+    unassign, which keeps the heap no larger than the number of variables.
+    """
+    __slots__ = ['scores', 'heap', 'position']
+    
+    track_assignments = False
+    
+    def __init__(self, clauses: List[List[int]], weight: float = 1.0):
+        """Initialize scores from clause occurrences.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+            weight: Initial score (float) per occurrence of a variable
+        
+        Returns:
+            None
+        """
+        self.scores: Dict[int, float] = {}
+        self.heap: List[int] = []
+        self.position: Dict[int, int] = {}
+        for clause in clauses:
+            for lit in clause:
+                var = abs(lit)
+                self.scores[var] = self.scores.get(var, 0.0) + weight
+        self._rebuild_heap()
+    
+    def _rebuild_heap(self):
+        """Rebuild the heap from current scores with every variable present.
+        
+        Args:
+            None
+        
+        Returns:
+            None
+        """
+        scores = self.scores
+        # A list sorted by priority already satisfies the heap property
+        self.heap = sorted(scores, key=lambda var: (-scores[var], var))
+        self.position = {var: i for i, var in enumerate(self.heap)}
+    
+    def _sift_up(self, i: int):
+        """Move the variable at index i towards the root until ordered.
+        
+        Args:
+            i: Heap index (int)
+        
+        Returns:
+            None
+        """
+        heap = self.heap
+        position = self.position
+        scores = self.scores
+        var = heap[i]
+        score = scores[var]
+        while i > 0:
+            parent = (i - 1) >> 1
+            pvar = heap[parent]
+            pscore = scores[pvar]
+            if pscore > score or (pscore == score and pvar < var):
+                break
+            heap[i] = pvar
+            position[pvar] = i
+            i = parent
+        heap[i] = var
+        position[var] = i
+    
+    def _sift_down(self, i: int):
+        """Move the variable at index i towards the leaves until ordered.
+        
+        Args:
+            i: Heap index (int)
+        
+        Returns:
+            None
+        """
+        heap = self.heap
+        position = self.position
+        scores = self.scores
+        n = len(heap)
+        var = heap[i]
+        score = scores[var]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            cvar = heap[child]
+            cscore = scores[cvar]
+            right = child + 1
+            if right < n:
+                rvar = heap[right]
+                rscore = scores[rvar]
+                if rscore > cscore or (rscore == cscore and rvar < cvar):
+                    child, cvar, cscore = right, rvar, rscore
+            if score > cscore or (score == cscore and var < cvar):
+                break
+            heap[i] = cvar
+            position[cvar] = i
+            i = child
+        heap[i] = var
+        position[var] = i
+    
+    def _insert(self, var: int):
+        """Add a variable that is not in the heap.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        self.position[var] = len(self.heap)
+        self.heap.append(var)
+        self._sift_up(len(self.heap) - 1)
+    
+    def _pop(self) -> int:
+        """Remove and return the variable at the root.
+        
+        Args:
+            None
+        
+        Returns:
+            Variable (int) with the highest score
+        """
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        del self.position[top]
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return top
+    
+    def set_score(self, var: int, score: float):
+        """Set a variable's score, moving it up or down the heap as needed.
+        
+        Args:
+            var: Variable (int)
+            score: New score (float)
+        
+        Returns:
+            None
+        """
+        if var not in self.scores:
+            return
+        old = self.scores[var]
+        self.scores[var] = score
+        i = self.position.get(var)
+        if i is None:
+            return
+        if score > old:
+            self._sift_up(i)
+        elif score < old:
+            self._sift_down(i)
+    
+    def add_variable(self, var: int, score: float = 0.0):
+        """Make a variable that first appears after construction selectable.
+        
+        Args:
+            var: Variable (int)
+            score: Initial score (float)
+        
+        Returns:
+            None
+        """
+        if var not in self.scores:
+            self.scores[var] = score
+            self._insert(var)
+    
+    def remove(self, var: int):
+        """Take a variable out of the search for good.
+        
+        Used for variables an inprocessing pass substituted away: they no
+        longer occur in any clause, and unassign will not bring them back.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        self.scores.pop(var, None)
+        i = self.position.pop(var, None)
+        if i is None:
+            return
+        heap = self.heap
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self.position[last] = i
+            self._sift_up(i)
+            self._sift_down(self.position[last])
+    
+    def bump(self, var: int):
+        """Record that a variable took part in a conflict.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        raise NotImplementedError
+    
+    def bump_clause(self, clause: List[int]):
+        """Bump every variable of a clause.
+        
+        Args:
+            clause: List of literals (int)
+        
+        Returns:
+            None
+        """
+        for lit in clause:
+            self.bump(abs(lit))
+    
+    def decay(self):
+        """Advance the heuristic by one conflict.
+        
+        Args:
+            None
+        
+        Returns:
+            None
+        """
+    
+    def on_assign(self, var: int):
+        """Observe an assignment (only called when track_assignments is set).
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+    
+    def unassign(self, var: int):
+        """Make a variable selectable again after it was unassigned.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        if var in self.scores and var not in self.position:
+            self._insert(var)
+    
+    def pick_variable(self, model: Dict[int, bool]) -> Optional[int]:
+        """Select the highest-scoring unassigned variable.
+        
+        Assigned variables found at the root are removed; the engines put
+        them back through unassign when they backtrack.
+        
+        Args:
+            model: Current variable assignment mapping variables (int) to bool
+        
+        Returns:
+            Variable (int) with highest score, or None if all assigned
+        """
+        heap = self.heap
+        while heap:
+            var = heap[0]
+            if var not in model:
+                return var
+            self._pop()
+        return None
+    
+    def copy(self) -> 'BranchingHeuristic':
+        """Create a deep copy of this heuristic.
+        
+        Args:
+            None
+        
+        Returns:
+            New instance of the same class with copied state
+        """
+        new = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                value = getattr(self, slot)
+                setattr(new, slot, value.copy() if isinstance(value, (dict, list)) else value)
+        return new
+
+
+class VSIDSScorer(BranchingHeuristic):
+    """VSIDS activity scores with exponential decay of the bump increment.
+    
+    Decaying every score is emulated by growing the increment instead, so a
+    conflict costs one division.
+    """
+    __slots__ = ['increment', 'decay_factor']
+    
+    # Scores and the increment are scaled down together past this bound so
+    # repeated division by decay_factor never overflows.
+    RESCALE_LIMIT = 1e100
+    
+    def __init__(self, clauses: List[List[int]], decay_factor: float = 0.95):
         """Initialize VSIDS scorer with variable activity scores.
         
         Args:
-            clauses: List of clauses, each clause is a list of literals (str)
+            clauses: List of clauses, each clause is a list of literals (int)
             decay_factor: Activity decay factor (float), default 0.95
         
         Returns:
             None
         """
-        self.scores: Dict[str, float] = {}
+        super().__init__(clauses)
         self.increment = 1.0
         self.decay_factor = decay_factor
-        self.heap: List[Tuple[float, str]] = []
-        self.heap_valid: Dict[str, float] = {}
-        self._initialize(clauses)
     
-    def _initialize(self, clauses: List[List[str]]):
-        """Initialize variable scores based on clause occurrences.
+    def rescale(self, factor: float):
+        """Multiply every score and the increment by a positive factor.
+        
+        Uniform scaling keeps the relative order, so the heap stays valid.
         
         Args:
-            clauses: List of clauses, each clause is a list of literals (str)
+            factor: Scale factor (float, > 0)
         
         Returns:
             None
         """
-        for clause in clauses:
-            for lit in clause:
-                var, _ = parse_literal(lit)
-                self.scores[var] = self.scores.get(var, 0.0) + 1.0
-        self._rebuild_heap()
+        scores = self.scores
+        for var in scores:
+            scores[var] *= factor
+        self.increment *= factor
     
-    def _rebuild_heap(self):
-        """Rebuild priority heap from current scores.
+    def bump(self, var: int):
+        """Increase activity score for a variable.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        scores = self.scores
+        if var in scores:
+            scores[var] += self.increment
+            i = self.position.get(var)
+            if i is not None:
+                self._sift_up(i)
+            if scores[var] > self.RESCALE_LIMIT:
+                self.rescale(1.0 / self.RESCALE_LIMIT)
+    
+    def decay(self):
+        """Decay activity scores over time.
         
         Args:
             None
@@ -130,39 +455,116 @@ class VSIDSScorer:
         Returns:
             None
         """
-        self.heap = [(-score, var) for var, score in self.scores.items()]
-        heapq.heapify(self.heap)
-        self.heap_valid = {var: score for var, score in self.scores.items()}
+        self.increment /= self.decay_factor
+        if self.increment > self.RESCALE_LIMIT:
+            self.rescale(1.0 / self.RESCALE_LIMIT)
+
+
+class EVSIDSScorer(VSIDSScorer):
+    """Exponential VSIDS with a ramped decay factor.
     
-    def bump(self, var: str):
-        """Increase activity score for a variable.
+    The decay factor starts low, so early conflicts dominate quickly, and
+    rises by ramp_step every ramp_interval conflicts up to max_decay, as in
+    Glucose and MapleSAT.
+    """
+    __slots__ = ['max_decay', 'ramp_step', 'ramp_interval', 'conflicts']
+    
+    def __init__(self, clauses: List[List[int]], decay_factor: float = 0.8, max_decay: float = 0.95,
+                 ramp_step: float = 0.01, ramp_interval: int = 5000):
+        """Initialize the scorer.
         
         Args:
-            var: Variable name (str)
+            clauses: List of clauses, each clause is a list of literals (int)
+            decay_factor: Initial decay factor (float), default 0.8
+            max_decay: Final decay factor (float), default 0.95
+            ramp_step: Decay factor increase (float) per ramp
+            ramp_interval: Conflicts (int) between ramps
         
         Returns:
             None
         """
-        if var in self.scores:
-            self.scores[var] += self.increment
-            heapq.heappush(self.heap, (-self.scores[var], var))
-            self.heap_valid[var] = self.scores[var]
+        super().__init__(clauses, decay_factor)
+        self.max_decay = max_decay
+        self.ramp_step = ramp_step
+        self.ramp_interval = ramp_interval
+        self.conflicts = 0
     
-    def bump_clause(self, clause: List[str]):
-        """Bump activity scores for all variables in a clause.
+    def decay(self):
+        """Decay activity scores and ramp the decay factor.
         
         Args:
-            clause: List of literals (str)
+            None
         
         Returns:
             None
         """
-        for lit in clause:
-            var, _ = parse_literal(lit)
-            self.bump(var)
+        super().decay()
+        self.conflicts += 1
+        if self.conflicts % self.ramp_interval == 0 and self.decay_factor < self.max_decay:
+            self.decay_factor = min(self.max_decay, self.decay_factor + self.ramp_step)
+
+
+class LRBScorer(BranchingHeuristic):
+    """Learning-rate based branching (Liang et al., SAT 2016).
+    
+    Each variable's score is an exponential moving average of its learning
+    rate: the fraction of conflicts it took part in while it was assigned.
+    The rate is computed when the variable is unassigned, over the conflicts
+    since its assignment. The step size alpha decays from 0.4 to 0.06.
+    """
+    __slots__ = ['alpha', 'min_alpha', 'alpha_step', 'conflicts',
+                 'assigned_at', 'participated']
+    
+    track_assignments = True
+    
+    def __init__(self, clauses: List[List[int]], alpha: float = 0.4,
+                 min_alpha: float = 0.06, alpha_step: float = 1e-6):
+        """Initialize the scorer.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+            alpha: Initial step size (float)
+            min_alpha: Lower bound (float) of the step size
+            alpha_step: Step size decrease (float) per conflict
+        
+        Returns:
+            None
+        """
+        # Occurrence counts only break ties until the first rewards arrive
+        super().__init__(clauses, weight=1e-6)
+        self.alpha = alpha
+        self.min_alpha = min_alpha
+        self.alpha_step = alpha_step
+        self.conflicts = 0
+        self.assigned_at: Dict[int, int] = {}
+        self.participated: Dict[int, int] = {}
+    
+    def on_assign(self, var: int):
+        """Start the participation count of a newly assigned variable.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        self.assigned_at[var] = self.conflicts
+        self.participated[var] = 0
+    
+    def bump(self, var: int):
+        """Count a conflict the variable took part in.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        if var in self.participated:
+            self.participated[var] += 1
     
     def decay(self):
-        """Decay activity scores over time.
+        """Advance the conflict counter and shrink the step size.
         
         Args:
             None
@@ -170,40 +572,245 @@ class VSIDSScorer:
         Returns:
             None
         """
-        self.increment /= self.decay_factor
+        self.conflicts += 1
+        if self.alpha > self.min_alpha:
+            self.alpha -= self.alpha_step
     
-    def pick_variable(self, model: Dict[str, bool]) -> Optional[str]:
-        """Select highest-activity unassigned variable.
+    def unassign(self, var: int):
+        """Fold the learning rate of the ending assignment into the score.
         
         Args:
-            model: Current variable assignment mapping variable names to bool
+            var: Variable (int)
         
         Returns:
-            Variable name (str) with highest activity, or None if all assigned
+            None
         """
-        while self.heap:
-            neg_score, var = heapq.heappop(self.heap)
-            if var in model:
-                continue
-            if self.heap_valid.get(var) != -neg_score:
-                continue
-            heapq.heappush(self.heap, (neg_score, var))
-            return var
-        return None
+        start = self.assigned_at.get(var)
+        if start is not None:
+            interval = self.conflicts - start
+            if interval > 0 and var in self.scores:
+                rate = self.participated[var] / interval
+                alpha = self.alpha
+                self.set_score(var, (1.0 - alpha) * self.scores[var] + alpha * rate)
+        super().unassign(var)
+
+
+class CHBScorer(BranchingHeuristic):
+    """Conflict-history based branching (Liang et al., AAAI 2016).
     
-    def copy(self) -> 'VSIDSScorer':
-        """Create a deep copy of this scorer.
+    After every propagation round the variables it assigned are rewarded:
+    1/(conflicts since the variable last took part in a conflict + 1),
+    scaled by 0.9 if the round ended without a conflict. Scores are an
+    exponential moving average of those rewards with step size alpha.
+    """
+    __slots__ = ['alpha', 'min_alpha', 'alpha_step', 'conflicts',
+                 'last_conflict', 'pending']
+    
+    track_assignments = True
+    
+    def __init__(self, clauses: List[List[int]], alpha: float = 0.4,
+                 min_alpha: float = 0.06, alpha_step: float = 1e-6):
+        """Initialize the scorer.
         
         Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+            alpha: Initial step size (float)
+            min_alpha: Lower bound (float) of the step size
+            alpha_step: Step size decrease (float) per conflict
+        
+        Returns:
             None
+        """
+        super().__init__(clauses, weight=1e-6)
+        self.alpha = alpha
+        self.min_alpha = min_alpha
+        self.alpha_step = alpha_step
+        self.conflicts = 0
+        self.last_conflict: Dict[int, int] = {}
+        self.pending: List[int] = []
+    
+    def _reward(self, multiplier: float):
+        """Reward the variables assigned since the last reward.
+        
+        Args:
+            multiplier: 1.0 after a conflict, 0.9 otherwise (float)
         
         Returns:
-            New VSIDSScorer instance with copied state
+            None
         """
-        new = object.__new__(VSIDSScorer)
-        new.scores = self.scores.copy()
-        new.increment = self.increment
-        new.decay_factor = self.decay_factor
-        new.heap = list(self.heap)
-        new.heap_valid = self.heap_valid.copy()
-        return new
+        alpha = self.alpha
+        scores = self.scores
+        conflicts = self.conflicts
+        last_conflict = self.last_conflict
+        for var in self.pending:
+            if var in scores:
+                reward = multiplier / (conflicts - last_conflict.get(var, 0) + 1)
+                self.set_score(var, (1.0 - alpha) * scores[var] + alpha * reward)
+        self.pending.clear()
+    
+    def on_assign(self, var: int):
+        """Queue a newly assigned variable for the next reward.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        self.pending.append(var)
+    
+    def bump(self, var: int):
+        """Mark the variable as part of the current conflict.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            None
+        """
+        self.last_conflict[var] = self.conflicts
+    
+    def decay(self):
+        """Reward the conflicting propagation round and advance the counter.
+        
+        Args:
+            None
+        
+        Returns:
+            None
+        """
+        self._reward(1.0)
+        self.conflicts += 1
+        if self.alpha > self.min_alpha:
+            self.alpha -= self.alpha_step
+    
+    def pick_variable(self, model: Dict[int, bool]) -> Optional[int]:
+        """Reward the conflict-free propagation round, then pick a variable.
+        
+        Args:
+            model: Current variable assignment mapping variables (int) to bool
+        
+        Returns:
+            Variable (int) with highest score, or None if all assigned
+        """
+        if self.pending:
+            self._reward(0.9)
+        return super().pick_variable(model)
+
+
+BRANCHING_HEURISTICS = {
+    'vsids': VSIDSScorer,
+    'evsids': EVSIDSScorer,
+    'lrb': LRBScorer,
+    'chb': CHBScorer,
+}
+
+
+def make_branching_heuristic(name: str, clauses: List[List[int]]) -> BranchingHeuristic:
+    """Build a branching heuristic from its name.
+    
+    Args:
+        name: Heuristic name ('vsids', 'evsids', 'lrb' or 'chb')
+        clauses: List of clauses, each clause is a list of literals (int)
+    
+    Returns:
+        BranchingHeuristic object
+    """
+    if name not in BRANCHING_HEURISTICS:
+        raise ValueError(f"Unknown branching heuristic: {name}")
+    return BRANCHING_HEURISTICS[name](clauses)
+
+
+class Rephaser:
+    """Periodically overwrite saved phases to diversify the search.
+    
+    Every interval conflicts the saved phases of a WatchedFormula are reset
+    according to the next mode in the schedule:
+    
+    - 'original': every variable back to True, the engines' default polarity
+    - 'inverted': every variable assigned so far to False
+    - 'best': the assignment of the longest trail reached at a conflict
+    - 'random': a coin flip per assigned-so-far variable from a seeded generator
+    
+    The interval grows arithmetically so the schedule gets sparser as the
+    search settles.
+    """
+    __slots__ = ['schedule', 'interval', 'increment', 'next_rephase', 'conflicts',
+                 'position', 'best_phase', 'best_size', 'rng', 'rephases']
+    
+    def __init__(self, schedule: Tuple[str, ...] = ('original', 'best', 'inverted', 'best', 'random', 'best'),
+                 interval: int = 1000, increment: int = 1000, seed: int = 0):
+        """Initialize the rephasing schedule.
+        
+        Args:
+            schedule: Sequence of modes (str) applied cyclically
+            interval: Conflicts (int) before the first rephase
+            increment: Growth (int) of the interval after each rephase
+            seed: Seed (int) for the 'random' mode
+        
+        Returns:
+            None
+        """
+        for mode in schedule:
+            if mode not in ('original', 'inverted', 'best', 'random'):
+                raise ValueError(f"Unknown rephase mode: {mode}")
+        self.schedule = schedule
+        self.interval = interval
+        self.increment = increment
+        self.next_rephase = interval
+        self.conflicts = 0
+        self.position = 0
+        self.best_phase: Dict[int, bool] = {}
+        self.best_size = 0
+        self.rng = random.Random(seed)
+        self.rephases = 0
+    
+    def on_conflict(self, formula) -> bool:
+        """Record a conflict and report whether a rephase is due.
+        
+        Must be called before the engine backtracks, while the trail still
+        holds the assignment that ran into the conflict.
+        
+        Args:
+            formula: WatchedFormula object at the conflict
+        
+        Returns:
+            True if the engine should call rephase after backtracking
+        """
+        size = len(formula.trail)
+        if size > self.best_size:
+            self.best_size = size
+            self.best_phase = {(lit if lit > 0 else -lit): lit > 0 for lit in formula.trail}
+        
+        self.conflicts += 1
+        return self.conflicts >= self.next_rephase
+    
+    def rephase(self, formula):
+        """Overwrite the saved phases with the next mode of the schedule.
+        
+        Called after backtracking, so the phases saved by the backtrack do not
+        undo the rephase.
+        
+        Args:
+            formula: WatchedFormula object whose phases are updated
+        
+        Returns:
+            None
+        """
+        mode = self.schedule[self.position % len(self.schedule)]
+        self.position += 1
+        self.rephases += 1
+        self.interval += self.increment
+        self.next_rephase = self.conflicts + self.interval
+        
+        phase = formula.phase
+        if mode == 'original':
+            phase.clear()
+        elif mode == 'inverted':
+            for var in formula.level:
+                phase[var] = False
+        elif mode == 'best':
+            phase.update(self.best_phase)
+        else:
+            for var in formula.level:
+                phase[var] = self.rng.random() < 0.5
@@ -0,0 +1,202 @@
+"""Incremental CDCL solving under assumptions."""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Hashable, Optional, Union
+
+try:
+    from .helpers import VariableTable
+    from .heuristics import BranchingHeuristic, make_branching_heuristic
+    from .watched_literals import WatchedFormula
+    from .clause_db import ClauseDatabase
+    from .restarts import RestartPolicy, make_restart_policy
+    from .algorithms.cdcl import cdcl_search
+    from .budget import Budget, BudgetExhausted, UNKNOWN
+    from .cardinality import AtMostK
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from helpers import VariableTable
+    from heuristics import BranchingHeuristic, make_branching_heuristic
+    from watched_literals import WatchedFormula
+    from clause_db import ClauseDatabase
+    from restarts import RestartPolicy, make_restart_policy
+    from algorithms.cdcl import cdcl_search
+    from budget import Budget, BudgetExhausted, UNKNOWN
+    from cardinality import AtMostK
+
+
+class Solver:
+    """Stateful CDCL solver that keeps its work between queries.
+    
+    Clauses are added one at a time and solve can be called any number of
+    times, each time under its own assumptions. Learned clauses, level-0
+    assignments, saved phases, scorer activity and the restart policy all
+    survive from one call to the next. Clauses are only ever added, so
+    everything learned stays implied by the formula. Assumptions are decided
+    before anything else and never learned, so they hold for one call only.
+    
+    Literals use the same names as dpll.solver.solve: strings with a '-'
+    prefix or signed ints. When solve reports UNSAT under assumptions,
+    failed_assumptions holds a subset of them that is already unsatisfiable
+    together with the clauses. It is empty if the clauses alone are
+    unsatisfiable.
+    """
+    __slots__ = ['table', 'formula', 'model', 'scorer', 'clause_db', 'restart_policy',
+                 'unsat', 'failed_assumptions', 'stats']
+    
+    def __init__(self, clauses: list = (), heuristic: Union[str, BranchingHeuristic] = 'vsids',
+                 restart_policy: Union[str, RestartPolicy] = 'glucose',
+                 max_learned_memory: Optional[int] = None):
+        """Create a solver, optionally loaded with clauses.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (str or int)
+            heuristic: Branching heuristic name ('vsids', 'evsids', 'lrb', 'chb') or instance
+            restart_policy: Restart policy name ('luby', 'geometric', 'glucose') or instance
+            max_learned_memory: Optional ceiling (int, bytes) on learned clause storage
+        
+        Returns:
+            None
+        """
+        self.table = VariableTable()
+        self.formula = WatchedFormula([])
+        self.model: Dict[int, bool] = {}
+        if isinstance(heuristic, BranchingHeuristic):
+            self.scorer = heuristic
+        else:
+            self.scorer = make_branching_heuristic(heuristic, [])
+        if self.scorer.track_assignments:
+            self.formula.listener = self.scorer
+        self.clause_db = ClauseDatabase(max_memory=max_learned_memory)
+        self.restart_policy = make_restart_policy(restart_policy)
+        self.unsat = False
+        self.failed_assumptions: list = []
+        self.stats: Dict[str, int] = {}
+        for clause in clauses:
+            self.add_clause(clause)
+    
+    def add_variable(self, name: Hashable) -> int:
+        """Register a variable so it is decided even if no clause mentions it.
+        
+        Args:
+            name: Variable name (str or int)
+        
+        Returns:
+            Engine variable (int)
+        """
+        var = self.table.intern(name)
+        self.scorer.add_variable(var)
+        return var
+    
+    def add_clause(self, clause: list):
+        """Add a clause permanently.
+        
+        The clause is simplified against the level-0 assignments, which
+        hold in every model: satisfied clauses are dropped and false
+        literals removed. A clause that ends up empty makes the solver
+        unsatisfiable for good. Cardinality constraints go to add_constraint.
+        
+        Args:
+            clause: List of literals (str or int), or an AtMostK constraint
+        
+        Returns:
+            None
+        """
+        if isinstance(clause, AtMostK):
+            self.add_constraint(clause)
+            return
+        if self.unsat:
+            return
+        model = self.model
+        literals = []
+        for lit in dict.fromkeys(self.table.encode_literal(lit) for lit in clause):
+            var = lit if lit > 0 else -lit
+            if -lit in literals:
+                return
+            self.scorer.add_variable(var)
+            value = model.get(var)
+            if value is None:
+                literals.append(lit)
+            elif value == (lit > 0):
+                return
+        
+        if not literals:
+            self.unsat = True
+            return
+        formula = self.formula
+        formula.add_clause(literals)
+        if len(literals) == 1:
+            formula.assign(literals[0], model, len(formula.clauses) - 1)
+            if formula.propagate(model) is not None:
+                self.unsat = True
+    
+    def add_constraint(self, constraint: AtMostK):
+        """Add a cardinality constraint permanently.
+        
+        The constraint is propagated natively through a counter, which
+        starts out with the literals already true at level 0. An
+        exactly-one constraint also adds the clause of its literals.
+        
+        Args:
+            constraint: AtMostK or ExactlyOne over literals (str or int)
+        
+        Returns:
+            None
+        """
+        if constraint.exactly:
+            self.add_clause(constraint.literals)
+        if self.unsat:
+            return
+        table = self.table
+        literals = list(dict.fromkeys(table.encode_literal(lit) for lit in constraint.literals))
+        for lit in literals:
+            self.scorer.add_variable(abs(lit))
+        if constraint.k == 0:
+            for lit in literals:
+                self.add_clause([table.decode_literal(-lit)])
+            return
+        if len(literals) <= constraint.k:
+            return
+        formula = self.formula
+        model = self.model
+        if formula.add_constraint(literals, constraint.k, model) is not None or formula.propagate(model) is not None:
+            self.unsat = True
+    
+    def solve(self, assumptions: list = (), budget: Optional[Budget] = None) -> Union[Dict[Hashable, bool], bool]:
+        """Search for a model that satisfies the clauses and the assumptions.
+        
+        A call stopped by its budget keeps what it learned, so the next call
+        picks up with those clauses and the same scorer state.
+        
+        Args:
+            assumptions: Literals (str or int) that must hold in this call only
+            budget: Optional Budget limiting this call
+        
+        Returns:
+            Dict mapping variables to bool if satisfiable, False if unsatisfiable,
+            UNKNOWN if the budget ran out first
+        """
+        self.failed_assumptions = []
+        if self.unsat:
+            return False
+        
+        encoded = [self.table.encode_literal(lit) for lit in assumptions]
+        for lit in encoded:
+            self.scorer.add_variable(abs(lit))
+        try:
+            satisfiable, core = cdcl_search(self.formula, self.model, self.scorer, self.clause_db,
+                                            self.restart_policy, encoded, self.stats,
+                                            self.stats.get('conflicts', 0), budget)
+        except BudgetExhausted:
+            self.formula.backtrack(0, self.model, self.scorer)
+            return UNKNOWN
+        result = self.table.decode_model(self.model) if satisfiable else False
+        if not satisfiable:
+            if core:
+                self.failed_assumptions = [self.table.decode_literal(lit) for lit in core]
+            else:
+                self.unsat = True
+        
+        # Keep level-0 assignments and learned clauses for the next call
+        self.formula.backtrack(0, self.model, self.scorer)
+        return result
@@ -0,0 +1,356 @@
+"""Inprocessing at decision level 0: failed-literal probing and equivalent-literal substitution."""
+
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    from .watched_literals import WatchedFormula
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from watched_literals import WatchedFormula
+
+
+class Prober:
+    """Simplify a WatchedFormula between searches, at decision level 0.
+    
+    Probing assigns each polarity of a variable on a temporary decision level
+    and propagates it. A literal whose propagation conflicts is a failed
+    literal, so its negation holds at level 0. Literals implied by both
+    polarities are necessary assignments. A literal implied by x and negated
+    by -x is equivalent to x, which is recorded as two binary clauses.
+    
+    The binary implication graph is then split into strongly connected
+    components. All literals of a component are equivalent, so every
+    variable is replaced by the smallest variable of its component and the
+    clauses are rewritten. A component holding both x and -x means the
+    formula is unsatisfiable.
+    
+    Each run stops after budget seconds and the next run resumes the sweep
+    where it stopped; once a whole sweep finds nothing new the prober is
+    saturated and later runs return at once. Substituted variables are
+    recorded in representative and get their value back in extend_model.
+    """
+    __slots__ = ['budget', 'representative', 'order', 'cursor', 'propagated', 'progress',
+                 'saturated', 'stats']
+    
+    def __init__(self, budget: float = 0.25):
+        """Initialize the prober.
+        
+        Args:
+            budget: Time limit (float, seconds) of a single run
+        
+        Returns:
+            None
+        """
+        self.budget = budget
+        # Substituted variable -> literal it equals, in substitution order
+        self.representative: Dict[int, int] = {}
+        self.order: Optional[List[int]] = None
+        self.cursor = 0
+        # Literals implied by a successful probe in the current sweep
+        self.propagated = set()
+        self.progress = False
+        self.saturated = False
+        self.stats = {'probes': 0, 'failed': 0, 'necessary': 0, 'equivalent': 0}
+    
+    def run(self, formula: WatchedFormula, model: Dict[int, bool], scorer=None) -> bool:
+        """Probe and substitute until saturated or out of time.
+        
+        Must be called at decision level 0 with propagation complete. Saved
+        phases and the formula's listener are left as they were.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Variable assignment dict to update with level-0 assignments
+            scorer: Optional BranchingHeuristic; substituted variables are removed from it
+        
+        Returns:
+            False if the formula was found unsatisfiable, True otherwise
+        """
+        if self.saturated:
+            return True
+        deadline = time.perf_counter() + self.budget
+        phase = dict(formula.phase)
+        listener = formula.listener
+        formula.listener = None
+        
+        try:
+            while True:
+                if self.order is None:
+                    self.order = self._probe_order(formula, model)
+                    self.cursor = 0
+                    self.propagated = set()
+                    self.progress = False
+                if not self._probe(formula, model, deadline):
+                    return False
+                if not self._substitute(formula, model, scorer):
+                    return False
+                if self.cursor < len(self.order):
+                    return True
+                
+                # A full sweep is done; another one only pays off if this one found something
+                self.order = None
+                if not self.progress:
+                    self.saturated = True
+                    return True
+                if time.perf_counter() > deadline:
+                    return True
+        finally:
+            formula.listener = listener
+            formula.phase.clear()
+            formula.phase.update(phase)
+    
+    def _probe_order(self, formula: WatchedFormula, model: Dict[int, bool]) -> List[int]:
+        """List the variables to probe in a sweep.
+        
+        Only variables with binary implications are worth probing. Roots of
+        the binary implication graph come first since their propagation
+        reaches the most literals, then variables by the number of binary
+        implications they take part in.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Current variable assignment mapping variables (int) to bool
+        
+        Returns:
+            List of unassigned variables (int)
+        """
+        implications = formula.implications
+        variables = {lit if lit > 0 else -lit for lit, implied in implications.items() if implied}
+        
+        def rank(var):
+            out_pos = len(implications.get(var, ()))
+            out_neg = len(implications.get(-var, ()))
+            root = (out_pos > 0) != (out_neg > 0)
+            return (not root, -(out_pos + out_neg), var)
+        
+        return sorted((var for var in variables if var not in model), key=rank)
+    
+    def _propagate_literal(self, formula: WatchedFormula, model: Dict[int, bool], literal: int) -> Optional[List[int]]:
+        """Propagate a literal on a temporary decision level.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Variable assignment dict
+            literal: Literal (int) to probe
+        
+        Returns:
+            Literals (List[int]) made true by the probe, or None if it failed
+        """
+        self.stats['probes'] += 1
+        formula.new_decision_level()
+        formula.assign(literal, model)
+        conflict = formula.propagate(model)
+        implied = formula.trail[formula.trail_lim[0]:]
+        formula.backtrack(0, model)
+        return None if conflict is not None else implied
+    
+    def _fix(self, formula: WatchedFormula, model: Dict[int, bool], literal: int) -> bool:
+        """Assign a literal at level 0 and propagate it.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Variable assignment dict to update
+            literal: Literal (int) that holds in every model
+        
+        Returns:
+            False if this refutes the formula, True otherwise
+        """
+        value = model.get(literal if literal > 0 else -literal)
+        if value is not None:
+            return value == (literal > 0)
+        self.progress = True
+        formula.assign(literal, model)
+        return formula.propagate(model) is None
+    
+    def _probe(self, formula: WatchedFormula, model: Dict[int, bool], deadline: float) -> bool:
+        """Probe the polarities of the variables left in the sweep.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Variable assignment dict to update
+            deadline: time.perf_counter() value (float) at which to stop
+        
+        Returns:
+            False if the formula was found unsatisfiable, True otherwise
+        """
+        order = self.order
+        implications = formula.implications
+        propagated = self.propagated
+        while self.cursor < len(order):
+            if time.perf_counter() > deadline:
+                return True
+            var = order[self.cursor]
+            self.cursor += 1
+            if var in model or var in self.representative:
+                continue
+            
+            # A polarity without binary implications rarely propagates anything,
+            # and one already implied by an earlier probe cannot fail
+            implied = {}
+            for lit in (var, -var):
+                if not implications.get(lit) or lit in propagated:
+                    continue
+                implied[lit] = self._propagate_literal(formula, model, lit)
+                if implied[lit] is None:
+                    self.stats['failed'] += 1
+                    if not self._fix(formula, model, -lit):
+                        return False
+                    break
+                propagated.update(implied[lit])
+            if len(implied) < 2 or implied[-var] is None or var in model:
+                continue
+            
+            negative = set(implied[-var])
+            for lit in implied[var][1:]:
+                if lit in negative:
+                    self.stats['necessary'] += 1
+                    if not self._fix(formula, model, lit):
+                        return False
+                elif -lit in negative and var not in model and abs(lit) not in model:
+                    # var -> lit and -var -> -lit: record var == lit for the SCC pass
+                    if not any(other == lit for other, _ in implications.get(var, ())):
+                        formula.add_clause([-var, lit])
+                        formula.add_clause([var, -lit])
+                        self.progress = True
+        return True
+    
+    def _components(self, formula: WatchedFormula, model: Dict[int, bool]) -> List[List[int]]:
+        """Find the non-trivial strongly connected components of the binary implication graph.
+        
+        Iterative Tarjan over the unassigned literals.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Current variable assignment mapping variables (int) to bool
+        
+        Returns:
+            List of components, each a list of literals (int) with more than one element
+        """
+        implications = formula.implications
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        components = []
+        
+        for root in list(implications):
+            if root in index or (root if root > 0 else -root) in model:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(implications[root]))]
+            while work:
+                node, edges = work[-1]
+                for other, _ in edges:
+                    if (other if other > 0 else -other) in model:
+                        continue
+                    if other not in index:
+                        index[other] = low[other] = len(index)
+                        stack.append(other)
+                        on_stack.add(other)
+                        work.append((other, iter(implications.get(other, ()))))
+                        break
+                    if other in on_stack and index[other] < low[node]:
+                        low[node] = index[other]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            lit = stack.pop()
+                            on_stack.discard(lit)
+                            component.append(lit)
+                            if lit == node:
+                                break
+                        if len(component) > 1:
+                            components.append(component)
+        return components
+    
+    def _substitute(self, formula: WatchedFormula, model: Dict[int, bool], scorer=None) -> bool:
+        """Replace equivalent literals by a representative and rewrite the clauses.
+        
+        The rewritten clauses drop literals false at level 0, duplicates,
+        and clauses that became satisfied or tautological.
+        
+        Args:
+            formula: WatchedFormula object managing clauses and the trail
+            model: Variable assignment dict to update
+            scorer: Optional BranchingHeuristic; substituted variables are removed from it
+        
+        Returns:
+            False if the formula was found unsatisfiable, True otherwise
+        """
+        mapping = {}
+        for component in self._components(formula, model):
+            if len({abs(lit) for lit in component}) < len(component):
+                return False
+            rep = min(component, key=abs)
+            for lit in component:
+                var = lit if lit > 0 else -lit
+                if var == abs(rep) or var in mapping:
+                    continue
+                # The dual component maps var to the same literal, so it is skipped
+                mapping[var] = rep if lit > 0 else -rep
+        if not mapping:
+            return True
+        
+        self.progress = True
+        self.stats['equivalent'] += len(mapping)
+        self.representative.update(mapping)
+        if scorer is not None:
+            for var in mapping:
+                scorer.remove(var)
+        
+        clauses = []
+        for clause in formula.clauses:
+            lits = []
+            seen = set()
+            for lit in clause.literals:
+                var = lit if lit > 0 else -lit
+                if var in mapping:
+                    lit = mapping[var] if lit > 0 else -mapping[var]
+                    var = lit if lit > 0 else -lit
+                value = model.get(var)
+                if value is not None:
+                    if value == (lit > 0):
+                        break
+                    continue
+                if -lit in seen:
+                    break
+                if lit not in seen:
+                    seen.add(lit)
+                    lits.append(lit)
+            else:
+                if not lits:
+                    return False
+                clauses.append(lits)
+        
+        formula.replace_clauses(clauses)
+        return formula.assign_units(model) and formula.propagate(model) is None
+    
+    def extend_model(self, model: Dict[int, bool]) -> Dict[int, bool]:
+        """Give every substituted variable the value of its representative.
+        
+        Substitutions are undone newest first, since a representative may
+        itself have been substituted by a later run.
+        
+        Args:
+            model: Assignment mapping variables (int) to bool, updated in place
+        
+        Returns:
+            The same model (Dict[int, bool])
+        """
+        for var, lit in reversed(list(self.representative.items())):
+            rep = lit if lit > 0 else -lit
+            if rep not in model:
+                model[rep] = False
+            model[var] = model[rep] == (lit > 0)
+        return model
@@ -0,0 +1,208 @@
+"""Parallel portfolio solving: race several solver configurations in a process pool."""
+
+import os
+import sys
+import itertools
+import random
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    from .solver import solve
+    from .budget import UNKNOWN
+    from .cardinality import AtMostK
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from solver import solve
+    from budget import UNKNOWN
+    from cardinality import AtMostK
+
+
+# Default configurations, ordered so that the first few cover the most ground
+# when there are fewer workers than configurations
+DEFAULT_PORTFOLIO = [
+    {'heuristics': ['cdcl']},
+    {'heuristics': ['cdcl', 'lrb']},
+    {'heuristics': ['cdcl', 'chb'], 'restart_policy': 'luby'},
+    {'heuristics': ['cdcl', 'preprocess', 'bce']},
+    {'heuristics': ['probe']},
+    {'heuristics': ['cdcl', 'evsids'], 'seed': 1},
+    {'heuristics': ['cdcl'], 'restart_policy': 'luby', 'seed': 2},
+    {'heuristics': ['rephase'], 'seed': 3},
+]
+
+
+def _normalize_config(config: Union[list, dict]) -> dict:
+    """Turn a heuristic list or a configuration dict into a configuration dict.
+    
+    Args:
+        config: Heuristic list (as for solve) or dict with 'heuristics' and optional
+            'seed', 'restart_policy' and 'max_learned_memory' keys
+    
+    Returns:
+        Configuration dict (dict)
+    """
+    if isinstance(config, dict):
+        if 'heuristics' not in config:
+            raise ValueError(f"Portfolio configuration without heuristics: {config}")
+        unknown = set(config) - {'heuristics', 'seed', 'restart_policy', 'max_learned_memory'}
+        if unknown:
+            raise ValueError(f"Unknown portfolio configuration keys: {sorted(unknown)}")
+        return config
+    return {'heuristics': list(config)}
+
+
+def _shuffle(vars: list, clauses: list, seed: int):
+    """Permute variables, clauses and literals within clauses.
+    
+    The engines break ties by variable number and clause position, so a
+    permuted copy of the same formula sends the search down a different
+    path without changing the answer.
+    
+    Args:
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+        seed: Seed (int) for the permutation
+    
+    Returns:
+        Tuple of the permuted variable list and clause list
+    """
+    rng = random.Random(seed)
+    vars = list(vars)
+    rng.shuffle(vars)
+    shuffled = []
+    for clause in clauses:
+        if isinstance(clause, AtMostK):
+            shuffled.append(clause)
+            continue
+        clause = list(clause)
+        rng.shuffle(clause)
+        shuffled.append(clause)
+    rng.shuffle(shuffled)
+    return vars, shuffled
+
+
+def _run_config(conn, vars: list, clauses: list, model: dict, config: dict):
+    """Worker entry point: solve the formula with one configuration.
+    
+    The result, or the exception that stopped the worker, is sent back
+    through the worker's own pipe.
+    
+    Args:
+        conn: Write end of the worker's multiprocessing.Pipe
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+        model: Initial variable assignment (Dict[str, bool])
+        config: Configuration dict
+    
+    Returns:
+        None
+    """
+    try:
+        seed = config.get('seed')
+        if seed is not None:
+            vars, clauses = _shuffle(vars, clauses, seed)
+        result = solve(vars, clauses, config['heuristics'], dict(model),
+                       max_learned_memory=config.get('max_learned_memory'),
+                       restart_policy=config.get('restart_policy'))
+    except Exception as error:
+        conn.send((False, error))
+    else:
+        conn.send((True, result))
+    finally:
+        conn.close()
+
+
+def solve_portfolio(vars: list, clauses: list, configs: Optional[list] = None, workers: Optional[int] = None,
+                    model=None, return_config: bool = False, time_limit: Optional[float] = None):
+    """Race several solve configurations and return the first answer.
+    
+    Each configuration runs dpll.solver.solve in its own worker process.
+    All configurations are complete, so whichever finishes first has the
+    answer and every worker still searching is terminated. With fewer
+    workers than configurations the rest wait in order and start as
+    workers free up. Since an answer ends the race, that only happens when
+    a configuration fails: its error is recorded and the race goes on, and
+    the first error is raised only once every configuration has failed.
+    Every worker reports on a pipe of its own, so killing a worker
+    mid-search cannot leave a shared queue or lock in a broken state.
+    
+    A configuration is either a heuristic list as accepted by solve or a
+    dict with a 'heuristics' list and optional 'seed', 'restart_policy' and
+    'max_learned_memory'. A seed makes the worker solve a permuted copy of
+    the formula, which diversifies otherwise identical configurations.
+    
+    With a time limit the whole portfolio is cancelled once it passes
+    without an answer; the workers are terminated as for a lost race.
+    
+    Args:
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+        configs: Optional list of configurations (default DEFAULT_PORTFOLIO)
+        workers: Optional number of worker processes, i.e. of configurations raced at
+            once (default: one per configuration, at most os.cpu_count())
+        model: Optional initial variable assignment (Dict[str, bool])
+        return_config: If True, also return the configuration that answered first
+        time_limit: Optional wall-clock limit (float, seconds) for the whole portfolio
+    
+    Returns:
+        Dict mapping variables to bool if satisfiable, False if unsatisfiable,
+        UNKNOWN if the time limit passed first; with return_config, a tuple of
+        that result and the winning configuration (dict, None for UNKNOWN)
+    """
+    configs = [_normalize_config(config) for config in (configs or DEFAULT_PORTFOLIO)]
+    if workers is None:
+        workers = min(len(configs), os.cpu_count() or 1)
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    model = dict(model or {})
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    
+    running = {}  # read end of a worker's pipe -> (process, configuration index)
+    queued = iter(range(len(configs)))
+    failures = []
+    
+    def start(index):
+        # Launch the worker for configs[index] on a pipe of its own
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_run_config, daemon=True,
+                                          args=(sender, vars, clauses, model, configs[index]))
+        process.start()
+        sender.close()
+        running[receiver] = (process, index)
+    
+    try:
+        for index in itertools.islice(queued, workers):
+            start(index)
+        
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            ready = wait(list(running), timeout)
+            if not ready:
+                return (UNKNOWN, None) if return_config else UNKNOWN
+            for receiver in ready:
+                process, index = running.pop(receiver)
+                try:
+                    finished, result = receiver.recv()
+                except EOFError:
+                    finished, result = False, RuntimeError(
+                        f"Portfolio worker for {configs[index]} exited with code {process.exitcode}")
+                receiver.close()
+                process.join()
+                if finished:
+                    return (result, configs[index]) if return_config else result
+                failures.append(result)
+                index = next(queued, None)
+                if index is not None:
+                    start(index)
+        raise failures[0]
+    finally:
+        # Cancel the rest of the portfolio
+        for process, _ in running.values():
+            process.terminate()
+        for receiver, (process, _) in running.items():
+            process.join()
+            receiver.close()
@@ -0,0 +1,447 @@
+"""SatELite-style preprocessing: subsumption, self-subsumption, variable and blocked clause elimination."""
+
+from typing import List, Dict, Optional, Set, Tuple
+
+
+class Preprocessor:
+    """Simplify a CNF formula before search and rebuild full models afterwards.
+    
+    Clauses live in a slot list (None once deleted) with a literal set per
+    clause and occurrence lists mapping each literal to the indices of the
+    clauses that contain it. Unit clauses are applied on the spot and kept in
+    fixed. Every clause removed by variable or blocked clause elimination is
+    pushed on a reconstruction stack together with its witness literal;
+    extend_model replays that stack backwards so the model of the simplified
+    formula becomes a model of the original one.
+    """
+    __slots__ = ['clauses', 'sets', 'occurs', 'fixed', 'units', 'queue', 'stack',
+                 'eliminated', 'frozen', 'variables', 'unsat', 'max_occurrences',
+                 'max_resolvent', 'stats']
+    
+    def __init__(self, clauses: List[List[int]], frozen: Set[int] = (), max_occurrences: int = 16,
+                 max_resolvent: int = 20):
+        """Load the clauses and apply their unit clauses.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+            frozen: Variables (int) that must never be eliminated
+            max_occurrences: Skip eliminating variables with more occurrences than this in both polarities
+            max_resolvent: Skip eliminating variables producing longer resolvents than this
+        
+        Returns:
+            None
+        """
+        self.clauses: List[Optional[List[int]]] = []
+        self.sets: List[Optional[Set[int]]] = []
+        self.occurs: Dict[int, Set[int]] = {}
+        self.fixed: Dict[int, bool] = {}
+        self.units: List[int] = []
+        self.queue: Set[int] = set()
+        self.stack: List[Tuple[int, List[int]]] = []
+        self.eliminated: Set[int] = set()
+        self.frozen = set(frozen)
+        self.variables: Set[int] = set()
+        self.unsat = False
+        self.max_occurrences = max_occurrences
+        self.max_resolvent = max_resolvent
+        self.stats = {'subsumed': 0, 'strengthened': 0, 'eliminated': 0, 'blocked': 0, 'fixed': 0}
+        
+        for clause in clauses:
+            for lit in clause:
+                self.variables.add(abs(lit))
+            self._add(clause)
+    
+    def _add(self, literals: List[int]):
+        """Add a clause, simplifying it under the fixed assignments.
+        
+        Args:
+            literals: Clause literals (int)
+        
+        Returns:
+            None
+        """
+        fixed = self.fixed
+        lits = []
+        seen = set()
+        for lit in literals:
+            var = lit if lit > 0 else -lit
+            if var in fixed:
+                if fixed[var] == (lit > 0):
+                    return
+                continue
+            if -lit in seen:
+                return
+            if lit not in seen:
+                seen.add(lit)
+                lits.append(lit)
+        
+        if not lits:
+            self.unsat = True
+            return
+        if len(lits) == 1:
+            self._enqueue_unit(lits[0])
+            return
+        
+        idx = len(self.clauses)
+        self.clauses.append(lits)
+        self.sets.append(seen)
+        for lit in lits:
+            if lit not in self.occurs:
+                self.occurs[lit] = set()
+            self.occurs[lit].add(idx)
+        self.queue.add(idx)
+    
+    def _remove(self, idx: int):
+        """Delete a clause and its occurrences.
+        
+        Args:
+            idx: Clause index (int)
+        
+        Returns:
+            None
+        """
+        for lit in self.clauses[idx]:
+            self.occurs[lit].discard(idx)
+        self.clauses[idx] = None
+        self.sets[idx] = None
+        self.queue.discard(idx)
+    
+    def _strengthen(self, idx: int, lit: int):
+        """Remove a literal from a clause.
+        
+        Args:
+            idx: Clause index (int)
+            lit: Literal (int) to remove
+        
+        Returns:
+            None
+        """
+        clause = self.clauses[idx]
+        clause.remove(lit)
+        self.sets[idx].discard(lit)
+        self.occurs[lit].discard(idx)
+        if len(clause) == 1:
+            unit = clause[0]
+            self._remove(idx)
+            self._enqueue_unit(unit)
+        else:
+            self.queue.add(idx)
+    
+    def _enqueue_unit(self, lit: int):
+        """Fix a literal to true, to be applied by _propagate_units.
+        
+        Args:
+            lit: Literal (int)
+        
+        Returns:
+            None
+        """
+        var = lit if lit > 0 else -lit
+        if var in self.fixed:
+            if self.fixed[var] != (lit > 0):
+                self.unsat = True
+            return
+        self.fixed[var] = lit > 0
+        self.stats['fixed'] += 1
+        self.units.append(lit)
+    
+    def _propagate_units(self) -> bool:
+        """Apply pending units: drop satisfied clauses, strengthen the rest.
+        
+        Args:
+            None
+        
+        Returns:
+            False if the formula became unsatisfiable, True otherwise
+        """
+        while self.units and not self.unsat:
+            lit = self.units.pop()
+            for idx in list(self.occurs.get(lit, ())):
+                self._remove(idx)
+            for idx in list(self.occurs.get(-lit, ())):
+                if self.clauses[idx] is not None:
+                    self._strengthen(idx, -lit)
+        return not self.unsat
+    
+    def _backward_subsume(self, idx: int):
+        """Use a clause to subsume or strengthen the clauses it covers.
+        
+        A clause C subsumes D when C is a subset of D, so D is deleted. C
+        self-subsumes D on literal l when C without l is a subset of D and D
+        contains -l; then -l is removed from D. Any such D contains the
+        literal of C with the fewest occurrences or its negation, so only
+        those two occurrence lists are scanned.
+        
+        Args:
+            idx: Clause index (int)
+        
+        Returns:
+            None
+        """
+        clause = self.clauses[idx]
+        occurs = self.occurs
+        sets = self.sets
+        size = len(clause)
+        best = min(clause, key=lambda l: len(occurs.get(l, ())) + len(occurs.get(-l, ())))
+        
+        for other in list(occurs.get(best, ())):
+            if other == idx or sets[other] is None or len(sets[other]) < size:
+                continue
+            target = sets[other]
+            flipped = 0
+            for lit in clause:
+                if lit in target:
+                    continue
+                if flipped or -lit not in target:
+                    break
+                flipped = lit
+            else:
+                if flipped:
+                    self._strengthen(other, -flipped)
+                    self.stats['strengthened'] += 1
+                else:
+                    self._remove(other)
+                    self.stats['subsumed'] += 1
+        
+        for other in list(occurs.get(-best, ())):
+            if self.clauses[idx] is None:
+                return
+            if sets[other] is None or len(sets[other]) < size:
+                continue
+            target = sets[other]
+            if all(lit == best or lit in target for lit in clause):
+                self._strengthen(other, -best)
+                self.stats['strengthened'] += 1
+    
+    def subsume(self) -> bool:
+        """Run backward subsumption and self-subsumption to a fixpoint.
+        
+        Args:
+            None
+        
+        Returns:
+            False if the formula became unsatisfiable, True otherwise
+        """
+        if not self._propagate_units():
+            return False
+        while self.queue:
+            # Short clauses first: they subsume the most
+            batch = sorted(self.queue, key=lambda i: len(self.clauses[i]))
+            self.queue.clear()
+            for idx in batch:
+                if self.clauses[idx] is not None:
+                    self._backward_subsume(idx)
+                if not self._propagate_units():
+                    return False
+        return True
+    
+    def _resolve(self, pos: List[int], neg: Set[int], var: int) -> Optional[List[int]]:
+        """Resolve two clauses on a variable.
+        
+        Args:
+            pos: Literals (int) of the clause containing var
+            neg: Literal set of the clause containing -var
+            var: Pivot variable (int)
+        
+        Returns:
+            Resolvent literals (List[int]), or None if it is a tautology
+        """
+        resolvent = [lit for lit in pos if lit != var]
+        seen = set(resolvent)
+        for lit in neg:
+            if lit == -var or lit in seen:
+                continue
+            if -lit in seen:
+                return None
+            seen.add(lit)
+            resolvent.append(lit)
+        return resolvent
+    
+    def _eliminate(self, var: int) -> bool:
+        """Eliminate a variable by clause distribution if that does not grow the formula.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            True if the variable was eliminated
+        """
+        pos = list(self.occurs.get(var, ()))
+        neg = list(self.occurs.get(-var, ()))
+        if not pos and not neg:
+            return False
+        if len(pos) > self.max_occurrences and len(neg) > self.max_occurrences:
+            return False
+        
+        limit = len(pos) + len(neg)
+        resolvents = []
+        for i in pos:
+            for j in neg:
+                resolvent = self._resolve(self.clauses[i], self.sets[j], var)
+                if resolvent is None:
+                    continue
+                if len(resolvent) > self.max_resolvent or len(resolvents) == limit:
+                    return False
+                resolvents.append(resolvent)
+        
+        for i in pos:
+            self.stack.append((var, self.clauses[i]))
+            self._remove(i)
+        for j in neg:
+            self.stack.append((-var, self.clauses[j]))
+            self._remove(j)
+        self.eliminated.add(var)
+        self.stats['eliminated'] += 1
+        for resolvent in resolvents:
+            self._add(resolvent)
+        return True
+    
+    def eliminate(self, rounds: int = 3) -> bool:
+        """Run bounded variable elimination, cheapest variables first.
+        
+        Args:
+            rounds: Maximum number of passes (int) over the variables
+        
+        Returns:
+            False if the formula became unsatisfiable, True otherwise
+        """
+        occurs = self.occurs
+        for _ in range(rounds):
+            candidates = [var for var in self.variables
+                          if var not in self.fixed and var not in self.eliminated and var not in self.frozen]
+            candidates.sort(key=lambda v: len(occurs.get(v, ())) * len(occurs.get(-v, ())))
+            progress = False
+            for var in candidates:
+                if var in self.fixed:
+                    continue
+                if self._eliminate(var):
+                    progress = True
+                    if not self.subsume():
+                        return False
+            if not progress:
+                break
+        return True
+    
+    def _is_blocked(self, idx: int, lit: int) -> bool:
+        """Check if a clause is blocked on one of its literals.
+        
+        Args:
+            idx: Clause index (int)
+            lit: Literal (int) of the clause
+        
+        Returns:
+            True if every resolvent on lit with a clause containing -lit is a tautology
+        """
+        clause = self.sets[idx]
+        for other in self.occurs.get(-lit, ()):
+            if not any(-x in clause for x in self.clauses[other] if x != -lit):
+                return False
+        return True
+    
+    def block(self) -> int:
+        """Remove blocked clauses until none is left.
+        
+        A clause C is blocked on a literal l when every resolvent of C on l
+        is a tautology; C can then be dropped and restored by setting l. A
+        removal can only unblock clauses on the negations of C's literals,
+        so those literals are queued again.
+        
+        Args:
+            None
+        
+        Returns:
+            Number of removed clauses (int)
+        """
+        occurs = self.occurs
+        queue = [lit for lit, idxs in occurs.items() if idxs]
+        # Literals whose negation occurs least are the cheapest to check
+        queue.sort(key=lambda l: len(occurs.get(-l, ())), reverse=True)
+        queued = set(queue)
+        removed = 0
+        
+        while queue:
+            lit = queue.pop()
+            queued.discard(lit)
+            var = lit if lit > 0 else -lit
+            if var in self.frozen or var in self.fixed or len(occurs.get(-lit, ())) > self.max_occurrences:
+                continue
+            for idx in list(occurs.get(lit, ())):
+                if self.clauses[idx] is None or not self._is_blocked(idx, lit):
+                    continue
+                clause = self.clauses[idx]
+                self.stack.append((lit, clause))
+                self._remove(idx)
+                removed += 1
+                for other in clause:
+                    if other != lit and -other not in queued:
+                        queued.add(-other)
+                        queue.append(-other)
+        
+        self.stats['blocked'] += removed
+        return removed
+    
+    def run(self, eliminate: bool = True, block: bool = False) -> Optional[List[List[int]]]:
+        """Run subsumption, then variable and blocked clause elimination.
+        
+        Args:
+            eliminate: Run bounded variable elimination (bool), default True
+            block: Run blocked clause elimination (bool), default False
+        
+        Returns:
+            Simplified list of clauses, or None if the formula is unsatisfiable
+        """
+        if self.unsat or not self.subsume():
+            return None
+        if eliminate and not self.eliminate():
+            return None
+        if block:
+            self.block()
+        return self.simplified()
+    
+    def simplified(self) -> List[List[int]]:
+        """Return the surviving clauses.
+        
+        Args:
+            None
+        
+        Returns:
+            List of clauses (List[List[int]])
+        """
+        return [list(clause) for clause in self.clauses if clause is not None]
+    
+    def is_removed(self, var: int) -> bool:
+        """Check if a variable was fixed or eliminated by preprocessing.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            True if the engine no longer needs to assign the variable
+        """
+        return var in self.fixed or var in self.eliminated
+    
+    def extend_model(self, model: Dict[int, bool]) -> Dict[int, bool]:
+        """Extend a model of the simplified formula to the original formula.
+        
+        Fixed variables get their value, variables the engine left open
+        default to False, and the reconstruction stack is replayed backwards:
+        a removed clause that is not satisfied flips its witness literal.
+        
+        Args:
+            model: Assignment mapping variables (int) to bool
+        
+        Returns:
+            New assignment (Dict[int, bool]) covering every variable of the original clauses
+        """
+        model = dict(model)
+        model.update(self.fixed)
+        for var in self.variables:
+            if var not in model:
+                model[var] = False
+        for witness, clause in reversed(self.stack):
+            for lit in clause:
+                if model[lit if lit > 0 else -lit] == (lit > 0):
+                    break
+            else:
+                model[witness if witness > 0 else -witness] = witness > 0
+        return model
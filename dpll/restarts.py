@@ -0,0 +1,260 @@
+"""Restart policies deciding when a search should return to decision level 0."""
+
+from collections import deque
+from typing import Union
+
+
+def luby(i: int) -> int:
+    """Return the i-th element (1-based) of the Luby sequence 1 1 2 1 1 2 4 ...
+    
+    Args:
+        i: Position in the sequence (int, >= 1)
+    
+    Returns:
+        Sequence element (int)
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class RestartPolicy:
+    """Base class for restart policies.
+    
+    An engine reports every conflict through on_conflict and restarts when it
+    returns True, then calls on_restart before carrying on from level 0 on
+    the same formula.
+    """
+    __slots__ = ['restarts']
+    
+    def __init__(self):
+        """Initialize the restart counter.
+        
+        Returns:
+            None
+        """
+        self.restarts = 0
+    
+    def on_conflict(self, lbd: int, trail_size: int) -> bool:
+        """Record a conflict and report whether to restart.
+        
+        Args:
+            lbd: Number of decision levels (int) involved in the conflict
+            trail_size: Number of assigned literals (int) when it happened
+        
+        Returns:
+            True if the engine should restart now
+        """
+        raise NotImplementedError
+    
+    def on_restart(self):
+        """Reset per-run counters after the engine restarted.
+        
+        Returns:
+            None
+        """
+        self.restarts += 1
+
+
+class LubyRestarts(RestartPolicy):
+    """Restart after unit * luby(i) conflicts in the i-th run."""
+    __slots__ = ['unit', 'conflicts', 'limit']
+    
+    def __init__(self, unit: int = 100):
+        """Initialize the policy.
+        
+        Args:
+            unit: Conflicts (int) per Luby unit
+        
+        Returns:
+            None
+        """
+        super().__init__()
+        self.unit = unit
+        self.conflicts = 0
+        self.limit = unit * luby(1)
+    
+    def on_conflict(self, lbd: int, trail_size: int) -> bool:
+        """Count a conflict of the current run.
+        
+        Args:
+            lbd: Number of decision levels (int) involved in the conflict (unused)
+            trail_size: Number of assigned literals (int) when it happened (unused)
+        
+        Returns:
+            True once the conflicts of this run reach its limit
+        """
+        self.conflicts += 1
+        return self.conflicts >= self.limit
+    
+    def on_restart(self):
+        """Start the next run with the next Luby limit.
+        
+        Returns:
+            None
+        """
+        super().on_restart()
+        self.conflicts = 0
+        self.limit = self.unit * luby(self.restarts + 1)
+
+
+class GeometricRestarts(RestartPolicy):
+    """Restart after a conflict limit that grows by a constant factor."""
+    __slots__ = ['factor', 'conflicts', 'limit']
+    
+    def __init__(self, first: int = 100, factor: float = 1.5):
+        """Initialize the policy.
+        
+        Args:
+            first: Conflicts (int) before the first restart
+            factor: Growth factor (float) of the limit after each restart
+        
+        Returns:
+            None
+        """
+        super().__init__()
+        self.factor = factor
+        self.conflicts = 0
+        self.limit = first
+    
+    def on_conflict(self, lbd: int, trail_size: int) -> bool:
+        """Count a conflict of the current run.
+        
+        Args:
+            lbd: Number of decision levels (int) involved in the conflict (unused)
+            trail_size: Number of assigned literals (int) when it happened (unused)
+        
+        Returns:
+            True once the conflicts of this run reach its limit
+        """
+        self.conflicts += 1
+        return self.conflicts >= self.limit
+    
+    def on_restart(self):
+        """Start the next run with the limit grown by the factor.
+        
+        Returns:
+            None
+        """
+        super().on_restart()
+        self.conflicts = 0
+        self.limit = int(self.limit * self.factor)
+
+
+class GlucoseRestarts(RestartPolicy):
+    """Dynamic restarts driven by recent versus global average LBD.
+    
+    The search restarts once the average LBD of the last ``window`` conflicts
+    exceeds the global average by more than 1/k, i.e. when recent conflicts
+    are of poorer quality than usual. A restart is blocked (the recent window
+    is cleared) when the trail is much longer than average, since the solver
+    may then be close to a model.
+    """
+    __slots__ = ['k', 'block', 'window', 'recent', 'recent_sum', 'lbd_sum',
+                 'conflicts', 'trails', 'trail_sum', 'block_after']
+    
+    def __init__(self, window: int = 50, k: float = 0.8, block: float = 1.4,
+                 trail_window: int = 5000, block_after: int = 10000):
+        """Initialize the policy.
+        
+        Args:
+            window: Number of recent conflicts (int) in the short-term average
+            k: Margin (float) between the short-term and global averages
+            block: Trail growth ratio (float) that blocks a restart
+            trail_window: Number of conflicts (int) in the trail size average
+            block_after: Conflicts (int) before blocking is considered
+        
+        Returns:
+            None
+        """
+        super().__init__()
+        self.k = k
+        self.block = block
+        self.window = window
+        self.recent = deque()
+        self.recent_sum = 0
+        self.lbd_sum = 0
+        self.conflicts = 0
+        self.trails = deque(maxlen=trail_window)
+        self.trail_sum = 0
+        self.block_after = block_after
+    
+    def on_conflict(self, lbd: int, trail_size: int) -> bool:
+        """Fold a conflict into the averages and test the restart condition.
+        
+        The LBD goes into the global sum and the recent window, the trail
+        size into the trail average. Blocking: once block_after conflicts
+        have passed and the window is full, a trail longer than block times
+        the average trail means the search is assigning more than usual and
+        may be near a model, so the recent window is emptied. The window
+        then has to fill up again before the next restart can trigger. The
+        restart fires when the recent average LBD, scaled by k, exceeds the
+        global average.
+        
+        Args:
+            lbd: Number of decision levels (int) involved in the conflict
+            trail_size: Number of assigned literals (int) when it happened
+        
+        Returns:
+            True if the engine should restart now
+        """
+        self.conflicts += 1
+        self.lbd_sum += lbd
+        
+        if len(self.trails) == self.trails.maxlen:
+            self.trail_sum -= self.trails[0]
+        self.trails.append(trail_size)
+        self.trail_sum += trail_size
+        
+        if (self.conflicts > self.block_after and len(self.recent) == self.window
+                and trail_size > self.block * self.trail_sum / len(self.trails)):
+            self.recent.clear()
+            self.recent_sum = 0
+        
+        self.recent.append(lbd)
+        self.recent_sum += lbd
+        if len(self.recent) > self.window:
+            self.recent_sum -= self.recent.popleft()
+        
+        if len(self.recent) < self.window:
+            return False
+        return self.recent_sum / self.window * self.k > self.lbd_sum / self.conflicts
+    
+    def on_restart(self):
+        """Empty the recent window, so the next run is judged on its own conflicts.
+        
+        Returns:
+            None
+        """
+        super().on_restart()
+        self.recent.clear()
+        self.recent_sum = 0
+
+
+RESTART_POLICIES = {
+    'luby': LubyRestarts,
+    'geometric': GeometricRestarts,
+    'glucose': GlucoseRestarts,
+}
+
+
+def make_restart_policy(policy: Union[str, RestartPolicy]) -> RestartPolicy:
+    """Build a restart policy from its name.
+    
+    Args:
+        policy: Policy name ('luby', 'geometric' or 'glucose') or a RestartPolicy instance
+    
+    Returns:
+        RestartPolicy object
+    """
+    if isinstance(policy, RestartPolicy):
+        return policy
+    if policy not in RESTART_POLICIES:
+        raise ValueError(f"Unknown restart policy: {policy}")
+    return RESTART_POLICIES[policy]()
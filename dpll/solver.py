@@ -1,64 +1,214 @@
 import time
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 try:
-    from .helpers import get_vars
-    from .algorithms import solve_naive, solve_unit, solve_pure, solve_unit_pure, solve_2wl, solve_iterative, solve_with_restarts
-    from .heuristics import VSIDSScorer
+    from .helpers import get_vars, VariableTable, add_stat
+    from .algorithms import solve_naive, solve_unit, solve_pure, solve_unit_pure, solve_2wl, solve_iterative, solve_with_restarts, solve_cdcl, solve_bitset
+    from .heuristics import VSIDSScorer, Rephaser, BRANCHING_HEURISTICS, make_branching_heuristic
+    from .clause_db import ClauseDatabase
+    from .restarts import make_restart_policy
+    from .preprocess import Preprocessor
+    from .inprocess import Prober
+    from .budget import Budget, BudgetExhausted, UNKNOWN
+    from .cardinality import expand_constraints
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
-    from helpers import get_vars
-    from algorithms import solve_naive, solve_unit, solve_pure, solve_unit_pure, solve_2wl, solve_iterative, solve_with_restarts
-    from heuristics import VSIDSScorer
+    from helpers import get_vars, VariableTable, add_stat
+    from algorithms import solve_naive, solve_unit, solve_pure, solve_unit_pure, solve_2wl, solve_iterative, solve_with_restarts, solve_cdcl, solve_bitset
+    from heuristics import VSIDSScorer, Rephaser, BRANCHING_HEURISTICS, make_branching_heuristic
+    from clause_db import ClauseDatabase
+    from restarts import make_restart_policy
+    from preprocess import Preprocessor
+    from inprocess import Prober
+    from budget import Budget, BudgetExhausted, UNKNOWN
+    from cardinality import expand_constraints
 
 
-def solve(vars: list, clauses: list, heuristics: list, model=None) -> Optional[Dict[str, bool]]:
+# Engines built on WatchedFormula, which propagates cardinality constraints natively
+NATIVE_CARDINALITY = {'2wl', '2wli', 'rephase', 'restarts', 'cdcl', *BRANCHING_HEURISTICS}
+
+# 'auto' runs the bitmask engine on formulas with at most this many variables
+# and 'cdcl' on larger ones; on random 3-SAT the two break even around 30
+BITSET_MAX_VARS = 30
+
+
+def solve(vars: list, clauses: list, heuristics: list, model=None, max_learned_memory: Optional[int] = None,
+          restart_policy: Optional[str] = None, stats: Optional[Dict[str, float]] = None,
+          budget: Optional[Budget] = None, arena: bool = False) -> Optional[Dict[str, bool]]:
     """Solve SAT problem using specified heuristics.
     
+    Literals may be strings ('x', '-x') or DIMACS-style ints (3, -3). They are
+    interned into integer variables before the engines run and the model is
+    translated back to the caller's names on the way out.
+    
+    The clause list may include dpll.cardinality constraints (AtMostK,
+    ExactlyOne). The watched-literal engines propagate them natively; for
+    the recursive engines, 'probe', 'preprocess' and 'bce' they are expanded
+    to clauses first.
+    
     Args:
-        vars: List of variable names (str)
-        clauses: List of clauses, each clause is a list of literals (str)
-        heuristics: List of heuristic names (str) to apply
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int),
+            and cardinality constraints
+        heuristics: List of heuristic names (str) to apply; a branching heuristic
+            ('vsids', 'evsids', 'lrb', 'chb') may follow 'cdcl', '2wl' or 'probe', and
+            trailing 'preprocess' (subsumption and variable elimination) and/or 'bce'
+            (blocked clause elimination) simplify the formula before the engine runs;
+            'bitset' is the bitmask DPLL engine for small formulas, and 'auto' picks
+            'bitset' up to BITSET_MAX_VARS variables and 'cdcl' beyond
         model: Optional initial variable assignment (Dict[str, bool])
+        max_learned_memory: Optional ceiling (int, bytes) on learned clause storage for 'cdcl'
+        restart_policy: Optional restart policy name ('luby', 'geometric', 'glucose') for
+            'restarts', 'rephase' and 'probe' (default 'geometric') and 'cdcl' (default 'glucose')
+        stats: Optional dict updated with the engine's search counters (see solve_with_stats)
+            and the time in seconds spent in each phase
+        budget: Optional Budget limiting the search (time, conflicts, propagations,
+            decisions) or cancelling it through its cancel flag
+        arena: Store the clauses in one flat literal array (dpll.arena.ArenaFormula)
+            for '2wl', '2wli', 'rephase', 'restarts', 'probe', 'cdcl' and the
+            branching heuristics; ignored by the other engines
     
     Returns:
-        Dict mapping variables to bool if satisfiable, False otherwise
+        Dict mapping variables to bool if satisfiable, False if unsatisfiable, UNKNOWN
+        if the budget ran out first
     """
     if model is None:
         model = {}
     
-    if heuristics == ['2wli']:
-        result = solve_iterative(vars, clauses, model)
-    elif not heuristics:
-        result = solve_naive(vars, clauses, model)
-    elif heuristics == ['unit']:
-        result = solve_unit(vars, clauses, model)
-    elif heuristics == ['pure']:
-        result = solve_pure(vars, clauses, model)
-    elif heuristics == ['2wl']:
-        result = solve_2wl(vars, clauses, model)
-    elif heuristics == ['vsids']:
-        scorer = VSIDSScorer(clauses)
-        result = solve_iterative(vars, clauses, model, scorer)
-    elif heuristics == ['restarts']:
-        scorer = VSIDSScorer(clauses)
-        result = solve_with_restarts(vars, clauses, model, scorer)
-    elif set(heuristics) == {'unit', 'pure'}:
-        result = solve_unit_pure(vars, clauses, model)
-    else:
-        raise ValueError(f"Unknown heuristics: {heuristics}")
+    start = time.perf_counter()
+    table = VariableTable(vars)
+    vars = [table.intern(var) for var in vars]
+    clauses = table.encode_clauses(clauses)
+    model = table.encode_model(model)
+    
+    if stats is not None:
+        encoded = time.perf_counter()
+        add_stat(stats, 'time_encode', encoded - start)
+    
+    preprocessor = None
+    prober = None
+    techniques = set()
+    while heuristics and heuristics[-1] in ('preprocess', 'bce'):
+        techniques.add(heuristics[-1])
+        heuristics = heuristics[:-1]
+    if heuristics == ['auto']:
+        heuristics = ['bitset'] if len(table) <= BITSET_MAX_VARS else ['cdcl']
+    if techniques or not heuristics or heuristics[0] not in NATIVE_CARDINALITY:
+        clauses = expand_constraints(clauses)
+    if techniques:
+        # The initial assignment becomes unit clauses so nothing it fixes is eliminated
+        units = [[var if value else -var] for var, value in model.items()]
+        preprocessor = Preprocessor(clauses + units)
+        clauses = preprocessor.run(eliminate='preprocess' in techniques, block='bce' in techniques)
+        if stats is not None:
+            for key, count in preprocessor.stats.items():
+                add_stat(stats, key, count)
+            add_stat(stats, 'time_preprocess', time.perf_counter() - encoded)
+        if clauses is None:
+            return False
+        vars = [var for var in vars if not preprocessor.is_removed(var)]
+        model = {}
+    
+    if stats is not None:
+        searching = time.perf_counter()
     
+    try:
+        if heuristics == ['bitset']:
+            result = solve_bitset(vars, clauses, model, stats, budget)
+        elif heuristics == ['2wli']:
+            result = solve_iterative(vars, clauses, model, stats=stats, budget=budget, arena=arena)
+        elif not heuristics:
+            result = solve_naive(vars, clauses, model, stats, budget)
+        elif heuristics == ['unit']:
+            result = solve_unit(vars, clauses, model, stats, budget)
+        elif heuristics == ['pure']:
+            result = solve_pure(vars, clauses, model, stats, budget)
+        elif heuristics == ['2wl']:
+            result = solve_2wl(vars, clauses, model, stats=stats, budget=budget, arena=arena)
+        elif len(heuristics) == 2 and heuristics[0] == '2wl' and heuristics[1] in BRANCHING_HEURISTICS:
+            scorer = make_branching_heuristic(heuristics[1], clauses)
+            result = solve_2wl(vars, clauses, model, scorer, stats, budget, arena)
+        elif len(heuristics) == 1 and heuristics[0] in BRANCHING_HEURISTICS:
+            scorer = make_branching_heuristic(heuristics[0], clauses)
+            result = solve_iterative(vars, clauses, model, scorer, stats=stats, budget=budget, arena=arena)
+        elif heuristics == ['rephase']:
+            scorer = VSIDSScorer(clauses)
+            policy = make_restart_policy(restart_policy or 'geometric')
+            result = solve_iterative(vars, clauses, model, scorer, stats=stats, restart_policy=policy, rephaser=Rephaser(),
+                                     budget=budget, arena=arena)
+        elif heuristics == ['restarts']:
+            scorer = VSIDSScorer(clauses)
+            result = solve_with_restarts(vars, clauses, model, scorer, restart_policy or 'geometric', stats, budget, arena)
+        elif heuristics == ['probe'] or (len(heuristics) == 2 and heuristics[0] == 'probe' and heuristics[1] in BRANCHING_HEURISTICS):
+            scorer = make_branching_heuristic(heuristics[1] if len(heuristics) == 2 else 'vsids', clauses)
+            policy = make_restart_policy(restart_policy or 'geometric')
+            prober = Prober()
+            result = solve_iterative(vars, clauses, model, scorer, stats=stats, restart_policy=policy, prober=prober,
+                                     budget=budget, arena=arena)
+        elif heuristics == ['cdcl'] or (len(heuristics) == 2 and heuristics[0] == 'cdcl' and heuristics[1] in BRANCHING_HEURISTICS):
+            scorer = make_branching_heuristic(heuristics[1] if len(heuristics) == 2 else 'vsids', clauses)
+            clause_db = ClauseDatabase(max_memory=max_learned_memory)
+            policy = make_restart_policy(restart_policy or 'glucose')
+            result = solve_cdcl(vars, clauses, model, scorer, clause_db, stats, restart_policy=policy, budget=budget,
+                                arena=arena)
+        elif set(heuristics) == {'unit', 'pure'}:
+            result = solve_unit_pure(vars, clauses, model, stats, budget)
+        else:
+            raise ValueError(f"Unknown heuristics: {heuristics}")
+    except BudgetExhausted:
+        result = UNKNOWN
+    
+    if stats is not None:
+        decoding = time.perf_counter()
+        add_stat(stats, 'time_search', decoding - searching)
+        if prober is not None:
+            for key, count in prober.stats.items():
+                add_stat(stats, key, count)
+    
+    if result is UNKNOWN:
+        return UNKNOWN
     # Handle both None and "restart" as unsatisfiable/failure cases
     if result is None or result == "restart":
         return False
+    if preprocessor is not None:
+        result = preprocessor.extend_model(result)
+    result = table.decode_model(result)
+    if stats is not None:
+        add_stat(stats, 'time_decode', time.perf_counter() - decoding)
     return result
 
 
+def solve_with_stats(vars: list, clauses: list, heuristics: list, model=None, **options) -> Tuple[Optional[Dict[str, bool]], Dict[str, float]]:
+    """Solve a SAT problem and report how the search went.
+    
+    Counters an engine does not track are simply absent: the recursive
+    engines report 'decisions', 'conflicts' and (with unit propagation)
+    'propagations'; the watched-literal engines add 'watch_visits' and
+    'restarts'; 'cdcl' adds 'learned' and 'deleted'. 'preprocess'/'bce' add
+    the preprocessor's counters and 'probe' the prober's. Times are in
+    seconds, under 'time_encode', 'time_preprocess', 'time_search' and
+    'time_decode'.
+    
+    Args:
+        vars: List of variable names (str or int)
+        clauses: List of clauses, each clause is a list of literals (str or int)
+        heuristics: List of heuristic names (str), as for solve
+        model: Optional initial variable assignment (Dict[str, bool])
+        **options: Further keyword arguments for solve
+    
+    Returns:
+        Tuple of the result of solve and the statistics dict
+    """
+    stats = {}
+    result = solve(vars, clauses, heuristics, model, stats=stats, **options)
+    return result, stats
+
+
 if __name__ == "__main__":
     red, grn, yel, cyn, bld, rst = "\033[91m", "\033[92m", "\033[93m", "\033[96m", "\033[1m", "\033[0m"
-
+    
     clauses = []
     
     t = input(f"{cyn}enter the number of clauses: {rst}")
@@ -66,11 +216,11 @@ if __name__ == "__main__":
     for _ in range(int(t)):
         clause = input().split()
         clauses.append(clause)
-
+    
     vars_list = get_vars(clauses)
-
+    
     print(f"\n{bld}{yel}dpll solver benchmark{rst}")
-
+    
     start_time = time.time()
     result_no_heuristics = solve(vars_list, clauses, [])
     elapsed_no_heuristics = time.time() - start_time
@@ -80,7 +230,7 @@ if __name__ == "__main__":
     print(f"\n{bld}[naive dpll]{rst}")
     print(f"result: {res_col}{str(result_no_heuristics).lower()}{rst}")
     print(f"time: {elapsed_no_heuristics:.6f}s")
-
+    
     start_time = time.time()
     result_unit = solve(vars_list, clauses, ['unit'])
     elapsed_unit = time.time() - start_time
@@ -92,7 +242,7 @@ if __name__ == "__main__":
     print(f"time: {elapsed_unit:.6f}s")
     if elapsed_no_heuristics > 0:
         print(f"speedup: {cyn}{elapsed_no_heuristics/elapsed_unit:.2f}x{rst}")
-
+    
     start_time = time.time()
     result_unit_pure = solve(vars_list, clauses, ['unit', 'pure'])
     elapsed_unit_pure = time.time() - start_time
@@ -104,7 +254,7 @@ if __name__ == "__main__":
     print(f"time: {elapsed_unit_pure:.6f}s")
     if elapsed_no_heuristics > 0:
         print(f"speedup: {cyn}{elapsed_no_heuristics/elapsed_unit_pure:.2f}x{rst}")
-
+    
     start_time = time.time()
     result_2wl = solve(vars_list, clauses, ['2wl'])
     elapsed_2wl = time.time() - start_time
@@ -116,7 +266,7 @@ if __name__ == "__main__":
     print(f"time: {elapsed_2wl:.6f}s")
     if elapsed_no_heuristics > 0:
         print(f"speedup: {cyn}{elapsed_no_heuristics/elapsed_2wl:.2f}x{rst}")
-
+    
     start_time = time.time()
     result_2wli = solve(vars_list, clauses, ['2wli'])
     elapsed_2wli = time.time() - start_time
@@ -1,21 +1,233 @@
+import sys
+from pathlib import Path
+from typing import Dict, Hashable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .cardinality import AtMostK, split_constraints
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from cardinality import AtMostK, split_constraints
+
+
+def _parse(literal):
+    """Split a literal into variable name and polarity.
+
+    Args:
+        literal: Literal (str with optional '-' prefix, or signed int)
+
+    Returns:
+        Tuple of (variable name (str or int), is_positive (bool))
+    """
+    if isinstance(literal, int):
+        return abs(literal), literal > 0
+    if literal[0] == '-':
+        return literal[1:], False
+    return literal, True
+
+
+class CompiledFormula:
+    """A formula compiled once for checking many assignments.
+
+    Clauses are stored CSR-style: the variable columns of all their
+    literals in one array, the polarity each literal needs in another,
+    and clause boundaries as offsets. An assignment becomes a row of
+    1 (true), 0 (false) or -1 (unassigned), so a literal holds where
+    row[column] == wanted; a clause is the OR over its segment and a
+    cardinality constraint a sum. With NumPy a batch of assignments is
+    one matrix and every check a single vectorized pass; without it the
+    same arrays are walked in Python.
+    """
+    __slots__ = ['columns', 'indices', 'wanted', 'offsets', 'empty', 'constraint_indices',
+                 'constraint_wanted', 'constraint_offsets', 'bounds', 'exactly']
+
+    def __init__(self, clauses: list):
+        """Compile clauses (and dpll.cardinality constraints) into flat arrays.
+
+        Args:
+            clauses: List of clauses, each clause is a list of literals (str or int),
+                and cardinality constraints
+
+        Returns:
+            None
+        """
+        clauses, constraints = split_constraints(clauses)
+        self.columns: Dict[Hashable, int] = {}
+        self.indices, self.wanted, self.offsets = self._flatten(clauses)
+        self.constraint_indices, self.constraint_wanted, self.constraint_offsets = self._flatten(constraints)
+        self.bounds = [constraint.k for constraint in constraints]
+        self.exactly = [constraint.exactly for constraint in constraints]
+        self.empty = any(len(clause) == 0 for clause in clauses)
+        if np is not None:
+            self.indices = np.array(self.indices, dtype=np.intp)
+            self.wanted = np.array(self.wanted, dtype=np.int8)
+            self.offsets = np.array(self.offsets, dtype=np.intp)
+            self.constraint_indices = np.array(self.constraint_indices, dtype=np.intp)
+            self.constraint_wanted = np.array(self.constraint_wanted, dtype=np.int8)
+            self.constraint_offsets = np.array(self.constraint_offsets, dtype=np.intp)
+            self.bounds = np.array(self.bounds, dtype=np.intp)
+            self.exactly = np.array(self.exactly, dtype=bool)
+
+    def _flatten(self, groups: list) -> tuple:
+        """Lay out groups of literals as (columns, wanted values, offsets) lists.
+
+        Args:
+            groups: List of clauses or constraints
+
+        Returns:
+            Tuple of (variable columns (List[int]), wanted values (List[int]),
+            start offsets (List[int]), one per group plus the end)
+        """
+        columns = self.columns
+        indices = []
+        wanted = []
+        offsets = [0]
+        for group in groups:
+            for literal in group:
+                name, positive = _parse(literal)
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = len(columns)
+                indices.append(column)
+                wanted.append(1 if positive else 0)
+            offsets.append(len(indices))
+        return indices, wanted, offsets
+
+    def _row(self, solution: Dict[Hashable, bool]) -> List[int]:
+        """Turn an assignment into a row of 1 / 0 / -1 per variable column.
+
+        Args:
+            solution: Variable assignment mapping names to bool
+
+        Returns:
+            List of values (int), -1 for variables the assignment leaves out
+        """
+        row = [-1] * len(self.columns)
+        for name, column in self.columns.items():
+            value = solution.get(name)
+            if value is not None:
+                row[column] = 1 if value else 0
+        return row
+
+    def verify(self, solution) -> bool:
+        """Check one assignment.
+
+        Args:
+            solution: Variable assignment (Dict[str or int, bool]), or False/None/UNKNOWN
+
+        Returns:
+            True if the assignment satisfies every clause and constraint (bool)
+        """
+        return self.verify_many([solution])[0]
+
+    def verify_many(self, solutions: list) -> list:
+        """Check a batch of assignments together.
+
+        Args:
+            solutions: List of variable assignments (Dict[str or int, bool]); entries
+                that are not dicts (False, None, UNKNOWN) count as failures
+
+        Returns:
+            List with one bool per solution
+        """
+        models = [i for i, solution in enumerate(solutions) if isinstance(solution, dict)]
+        if np is None:
+            results = [False] * len(solutions)
+            for i in models:
+                results[i] = self._check_row(self._row(solutions[i]))
+            return results
+
+        results = np.zeros(len(solutions), dtype=bool)
+        if not models or self.empty:
+            return results.tolist()
+        matrix = np.array([self._row(solutions[i]) for i in models], dtype=np.int8).reshape(len(models), -1)
+        ok = np.ones(len(models), dtype=bool)
+        if len(self.indices):
+            holds = matrix[:, self.indices] == self.wanted
+            # Every clause is non-empty here, so each segment start is a valid index
+            ok &= np.logical_or.reduceat(holds, self.offsets[:-1], axis=1).all(axis=1)
+        if len(self.bounds):
+            counts = np.zeros((len(models), len(self.bounds)), dtype=np.intp)
+            sizes = np.diff(self.constraint_offsets)
+            nonempty = sizes > 0
+            if len(self.constraint_indices):
+                true = (matrix[:, self.constraint_indices] == self.constraint_wanted).astype(np.intp)
+                counts[:, nonempty] = np.add.reduceat(true, self.constraint_offsets[:-1][nonempty], axis=1)
+            ok &= (counts <= self.bounds).all(axis=1)
+            ok &= ((counts >= 1) | ~self.exactly).all(axis=1)
+        results[models] = ok
+        return results.tolist()
+
+    def _check_row(self, row: List[int]) -> bool:
+        """Check one assignment row without NumPy.
+
+        Args:
+            row: Values (int) per variable column, as built by _row
+
+        Returns:
+            True if every clause and constraint holds (bool)
+        """
+        indices, wanted, offsets = self.indices, self.wanted, self.offsets
+        for c in range(len(offsets) - 1):
+            for i in range(offsets[c], offsets[c + 1]):
+                if row[indices[i]] == wanted[i]:
+                    break
+            else:
+                return False
+        indices, wanted, offsets = self.constraint_indices, self.constraint_wanted, self.constraint_offsets
+        for c in range(len(self.bounds)):
+            count = sum(row[indices[i]] == wanted[i] for i in range(offsets[c], offsets[c + 1]))
+            if count > self.bounds[c] or (self.exactly[c] and count == 0):
+                return False
+        return True
+
+
 def verify(clauses: list, solution) -> bool:
     """Verify if a solution satisfies all clauses.
-    
+
     Args:
-        clauses: List of clauses, each clause is a list of literals (str)
+        clauses: List of clauses, each clause is a list of literals (str or int),
+            and dpll.cardinality constraints
         solution: Variable assignment (Dict[str, bool]) or False
-    
+
     Returns:
         True if solution satisfies all clauses, False otherwise (bool)
     """
-    if solution == False:
+    if not isinstance(solution, dict):
         return False
     for clause in clauses:
-        valid = False
+        if isinstance(clause, AtMostK):
+            count = 0
+            for literal in clause:
+                name, positive = _parse(literal)
+                if solution.get(name) == positive:
+                    count += 1
+            if count > clause.k or (clause.exactly and count == 0):
+                return False
+            continue
         for literal in clause:
-            if solution.get(literal) == True:
-                valid = True
+            name, positive = _parse(literal)
+            value = solution.get(name)
+            if value is not None and value == positive:
                 break
-        if valid == False:
+        else:
             return False
     return True
+
+
+def verify_many(clauses: list, solutions: list) -> list:
+    """Verify a batch of solutions of one formula, compiling it once.
+
+    Args:
+        clauses: List of clauses, each clause is a list of literals (str or int),
+            and dpll.cardinality constraints
+        solutions: List of variable assignments (Dict[str, bool]) or False
+
+    Returns:
+        List with one bool per solution
+    """
+    return CompiledFormula(clauses).verify_many(solutions)
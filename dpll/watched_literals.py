@@ -3,20 +3,22 @@ from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
 try:
-    from .helpers import parse_literal, negate_literal
+    from .helpers import parse_literal
+    from .cardinality import split_constraints
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
-    from helpers import parse_literal, negate_literal
+    from helpers import parse_literal
+    from cardinality import split_constraints
 
 
 class WatchedClause:
     __slots__ = ['literals', 'watch1', 'watch2']
     
-    def __init__(self, literals: List[str]):
+    def __init__(self, literals: List[int]):
         """Initialize watched clause with two watched literals.
         
         Args:
-            literals: List of literals (str) in the clause
+            literals: List of literals (int) in the clause
         
         Returns:
             None
@@ -26,27 +28,29 @@ class WatchedClause:
         self.watch1 = 0 if n > 0 else -1
         self.watch2 = 1 if n > 1 else -1
     
-    def is_satisfied(self, model: Dict[str, bool]) -> bool:
+    def is_satisfied(self, model: Dict[int, bool]) -> bool:
         """Check if clause is satisfied by current model.
         
         Args:
-            model: Variable assignment mapping variable names to bool
+            model: Variable assignment mapping variables (int) to bool
         
         Returns:
             True if any literal is satisfied, False otherwise (bool)
         """
         for lit in self.literals:
-            var, pos = parse_literal(lit)
-            if var in model and model[var] == pos:
+            if lit > 0:
+                if model.get(lit) is True:
+                    return True
+            elif model.get(-lit) is False:
                 return True
         return False
     
-    def update_watch(self, watched_idx: int, model: Dict[str, bool]) -> Optional[int]:
+    def update_watch(self, watched_idx: int, model: Dict[int, bool]) -> Optional[int]:
         """Find new literal to watch after assignment.
         
         Args:
             watched_idx: Index (int) of current watched literal
-            model: Variable assignment mapping variable names to bool
+            model: Variable assignment mapping variables (int) to bool
         
         Returns:
             Index (int) of new literal to watch, or None if no alternative found
@@ -55,21 +59,19 @@ class WatchedClause:
             if i == self.watch1 or i == self.watch2:
                 continue
             
-            var, pos = parse_literal(lit)
-            if var not in model:
-                return i
-            if model[var] == pos:
+            value = model.get(lit if lit > 0 else -lit)
+            if value is None or value == (lit > 0):
                 return i
         return None
     
-    def get_unit_literal(self, model: Dict[str, bool]) -> Optional[str]:
+    def get_unit_literal(self, model: Dict[int, bool]) -> Optional[int]:
         """Get unit literal if clause is unit under current model.
         
         Args:
-            model: Variable assignment mapping variable names to bool
+            model: Variable assignment mapping variables (int) to bool
         
         Returns:
-            Unit literal (str) if exists, None otherwise
+            Unit literal (int) if exists, None otherwise
         """
         if self.watch1 == -1:
             return None
@@ -94,11 +96,11 @@ class WatchedClause:
         
         return None
     
-    def is_conflicting(self, model: Dict[str, bool]) -> bool:
+    def is_conflicting(self, model: Dict[int, bool]) -> bool:
         """Check if clause conflicts with current model.
         
         Args:
-            model: Variable assignment mapping variable names to bool
+            model: Variable assignment mapping variables (int) to bool
         
         Returns:
             True if both watched literals are falsified, False otherwise (bool)
@@ -115,56 +117,171 @@ class WatchedClause:
         lit2 = self.literals[self.watch2]
         var2, pos2 = parse_literal(lit2)
         
-        return (var1 in model and model[var1] != pos1 and 
+        return (var1 in model and model[var1] != pos1 and
                 var2 in model and model[var2] != pos2)
 
 
+class WatchedConstraint:
+    __slots__ = ['literals', 'k', 'true']
+    
+    def __init__(self, literals: List[int], k: int):
+        """Initialize an at-most-k constraint with an empty counter.
+        
+        Args:
+            literals: List of distinct literals (int)
+            k: Maximum number (int) of true literals, at least 1
+        
+        Returns:
+            None
+        """
+        self.literals = literals
+        self.k = k
+        # Counted true literals in trail order; its length is the counter
+        self.true: List[int] = []
+
+
 class WatchedFormula:
-    def __init__(self, clauses: List[List[str]]):
+    def __init__(self, clauses: List[List[int]]):
         """Initialize watched formula with clauses.
         
+        The list may mix in dpll.cardinality constraints, which are
+        propagated natively (see add_constraint); an exactly-one constraint
+        also contributes the clause of its literals.
+        
         Args:
-            clauses: List of clauses, each clause is a list of literals (str)
+            clauses: List of clauses, each clause is a list of literals (int)
         
         Returns:
             None
         """
+        clauses, constraints = split_constraints(clauses)
+        for constraint in constraints:
+            if constraint.exactly:
+                clauses.append(list(constraint.literals))
+            if constraint.k == 0:
+                clauses.extend([-lit] for lit in constraint.literals)
         self.clauses = [WatchedClause(c) for c in clauses]
         self.watch_lists = {}
+        # Binary clauses skip the watch lists: a literal maps straight to the
+        # (implied literal, clause index) pairs it forces once it is true
+        self.implications: Dict[int, List[Tuple[int, int]]] = {}
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.level: Dict[int, int] = {}
+        self.reason: Dict[int, Optional[int]] = {}
+        self.phase: Dict[int, bool] = {}
+        # Branching heuristic observing assignments (track_assignments)
+        self.listener = None
+        self.qhead = 0
+        # Running totals for search statistics: literals propagated and watch list entries visited
+        self.propagations = 0
+        self.watch_visits = 0
+        # Optional dpll.budget.Budget charged after every propagation round
+        self.budget = None
+        # Cardinality constraints: a literal maps to the constraints it counts
+        # towards once it is true. A literal they imply has reason ~index, and
+        # a conflict in one of them is reported as ~index (see reason_clause).
+        self.constraints: List[WatchedConstraint] = []
+        self.constraint_lists: Dict[int, List[int]] = {}
+        # Trail prefix already added to the constraint counters; it trails
+        # qhead after a conflict, when the rest of the queue is dropped
+        self.counted = 0
+        self.constraint_conflict: Optional[WatchedClause] = None
         self._build_watch_lists()
+        for constraint in constraints:
+            if constraint.k > 0:
+                self.add_constraint(constraint.literals, constraint.k)
     
-    def save_state(self) -> Tuple[Dict[int, Tuple[int, int]], Dict[str, List[Tuple[int, int]]]]:
-        """Save current state of watched literals for backtracking.
+    def decision_level(self) -> int:
+        """Return the current decision level.
         
         Args:
             None
         
         Returns:
-            Tuple of (clause watch positions (Dict), watch lists (Dict))
+            Number of open decision levels (int), 0 before any decision
         """
-        clause_watches = {}
-        for idx, clause in enumerate(self.clauses):
-            clause_watches[idx] = (clause.watch1, clause.watch2)
-        watch_lists = {k: list(v) for k, v in self.watch_lists.items()}
-        return clause_watches, watch_lists
+        return len(self.trail_lim)
+    
+    def new_decision_level(self):
+        """Open a new decision level on the trail.
+        
+        Args:
+            None
+        
+        Returns:
+            None
+        """
+        self.trail_lim.append(len(self.trail))
+    
+    def assign(self, literal: int, model: Dict[int, bool], reason: Optional[int] = None):
+        """Make a literal true and queue it on the trail for propagate().
+        
+        Args:
+            literal: Literal (int) to make true
+            model: Variable assignment dict to update
+            reason: Index (int) of the clause implying the literal, None for decisions
+        
+        Returns:
+            None
+        """
+        var = literal if literal > 0 else -literal
+        model[var] = literal > 0
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(literal)
+        if self.listener is not None:
+            self.listener.on_assign(var)
+    
+    def phase_literal(self, var: int) -> int:
+        """Return the decision literal for a variable under phase saving.
+        
+        Args:
+            var: Variable (int)
+        
+        Returns:
+            var or -var (int), following the last polarity it was assigned (True if never)
+        """
+        return var if self.phase.get(var, True) else -var
     
-    def restore_state(self, state: Tuple[Dict[int, Tuple[int, int]], Dict[str, List[Tuple[int, int]]]]):
-        """Restore saved state of watched literals.
+    def backtrack(self, level: int, model: Dict[int, bool], scorer=None):
+        """Unassign every trail entry above a decision level.
+        
+        Watches are left where they are: a watch that points at a literal
+        falsified above the target level becomes unassigned again, so the
+        two-watched-literal invariant still holds and backtracking costs
+        only the number of undone assignments. The polarity of every undone
+        assignment is saved in phase for the next decision on that variable.
         
         Args:
-            state: Tuple of (clause watch positions (Dict), watch lists (Dict))
+            level: Decision level (int) to return to
+            model: Variable assignment dict to modify
+            scorer: Optional BranchingHeuristic notified of unassigned variables
         
         Returns:
             None
         """
-        clause_watches, watch_lists = state
-        for idx, (w1, w2) in clause_watches.items():
-            self.clauses[idx].watch1 = w1
-            self.clauses[idx].watch2 = w2
-        self.watch_lists = {k: list(v) for k, v in watch_lists.items()}
+        if len(self.trail_lim) <= level:
+            return
+        trail = self.trail
+        phase = self.phase
+        stop = self.trail_lim[level]
+        if self.constraint_lists:
+            self._uncount(stop)
+        for i in range(len(trail) - 1, stop - 1, -1):
+            lit = trail[i]
+            var = lit if lit > 0 else -lit
+            phase[var] = lit > 0
+            del model[var]
+            if scorer is not None:
+                scorer.unassign(var)
+        del trail[stop:]
+        del self.trail_lim[level:]
+        # Literals queued but never counted before a conflict are queued again
+        self.qhead = self.counted = min(self.counted, stop)
     
     def _build_watch_lists(self):
-        """Build initial watch lists for all clauses.
+        """Build initial watch lists and binary implications for all clauses.
         
         Args:
             None
@@ -172,89 +289,417 @@ class WatchedFormula:
         Returns:
             None
         """
+        implications = self.implications
         for idx, clause in enumerate(self.clauses):
-            if clause.watch1 != -1:
-                lit = clause.literals[clause.watch1]
-                neg = negate_literal(lit)
-                if neg not in self.watch_lists:
-                    self.watch_lists[neg] = []
-                self.watch_lists[neg].append((idx, 1))
-            
-            if clause.watch2 != -1:
-                lit = clause.literals[clause.watch2]
-                neg = negate_literal(lit)
-                if neg not in self.watch_lists:
-                    self.watch_lists[neg] = []
-                self.watch_lists[neg].append((idx, 2))
+            literals = clause.literals
+            if len(literals) != 2:
+                self._watch(idx, clause)
+                continue
+            # Inlined binary case of _watch: most clauses of the app encodings
+            a, b = literals
+            implied = implications.get(-a)
+            if implied is None:
+                implications[-a] = [(b, idx)]
+            else:
+                implied.append((b, idx))
+            implied = implications.get(-b)
+            if implied is None:
+                implications[-b] = [(a, idx)]
+            else:
+                implied.append((a, idx))
     
-    def propagate(self, literal: str, model: Dict[str, bool]) -> Tuple[Optional[str], bool]:
-        """Propagate literal assignment through watched literals.
+    def _watch(self, idx: int, clause: WatchedClause):
+        """Register a clause in the implication lists or the watch lists.
         
         Args:
-            literal: Assigned literal (str)
-            model: Variable assignment mapping variable names to bool
+            idx: Index (int) of the clause
+            clause: WatchedClause object
         
         Returns:
-            Tuple of (new unit literal (str or None), conflict detected (bool))
+            None
         """
-        if literal not in self.watch_lists:
-            return None, False
+        if len(clause.literals) == 2:
+            a, b = clause.literals
+            implications = self.implications
+            if -a not in implications:
+                implications[-a] = []
+            implications[-a].append((b, idx))
+            if -b not in implications:
+                implications[-b] = []
+            implications[-b].append((a, idx))
+            return
         
-        watch_list = self.watch_lists[literal]
-        new_watch_list = []
-        unit_literal = None
+        if clause.watch1 != -1:
+            lit = clause.literals[clause.watch1]
+            neg = -lit
+            if neg not in self.watch_lists:
+                self.watch_lists[neg] = []
+            self.watch_lists[neg].append((idx, 1))
+        
+        if clause.watch2 != -1:
+            lit = clause.literals[clause.watch2]
+            neg = -lit
+            if neg not in self.watch_lists:
+                self.watch_lists[neg] = []
+            self.watch_lists[neg].append((idx, 2))
+    
+    def propagate(self, model: Dict[int, bool]) -> Optional[int]:
+        """Propagate every pending trail literal through the watch lists.
+        
+        The trail doubles as a FIFO queue: literals from qhead onwards have
+        been assigned but not yet propagated. Each visit either moves the
+        watch, keeps it because the other watch is true, or finds the clause
+        unit and assigns (and so enqueues) its last literal. Only watch lists
+        are visited; no clause is ever scanned for units. Binary clauses are
+        handled first from the implication lists without touching a clause
+        object; their index only serves as the reason of the implied literal.
+        Before either, a literal bumps the counter of every cardinality
+        constraint it belongs to; only a counter that reaches k looks at the
+        constraint's literals.
+        
+        propagations and watch_visits are bumped once per propagated literal,
+        from locals, so keeping them costs next to nothing. An attached budget
+        is charged on the way out; a round without conflict raises
+        BudgetExhausted there once it is spent, with the queue drained, and
+        a conflict is left to the engine to charge.
         
-        for clause_idx, watch_num in watch_list:
-            clause = self.clauses[clause_idx]
+        Args:
+            model: Variable assignment dict to update
+        
+        Returns:
+            Index (int) of a conflicting clause (negative for a constraint, see
+            conflict_clause), or None if no conflict
+        """
+        clauses = self.clauses
+        watch_lists = self.watch_lists
+        implications = self.implications
+        constraint_lists = self.constraint_lists
+        trail = self.trail
+        start = self.qhead
+        visits = 0
+        
+        while self.qhead < len(trail):
+            literal = trail[self.qhead]
+            self.qhead += 1
             
-            if clause.is_satisfied(model):
-                new_watch_list.append((clause_idx, watch_num))
-                continue
+            if constraint_lists:
+                counts = constraint_lists.get(literal)
+                if counts:
+                    conflict = self._count(literal, counts, model)
+                    if conflict is not None:
+                        self.counted = self.qhead
+                        self.propagations += self.qhead - start
+                        self.watch_visits += visits
+                        if self.budget is not None:
+                            self.budget.propagations += self.qhead - start
+                        self.qhead = len(trail)
+                        return conflict
             
-            watched_idx = clause.watch1 if watch_num == 1 else clause.watch2
-            new_watch_idx = clause.update_watch(watched_idx, model)
+            implied = implications.get(literal)
+            if implied:
+                for other, clause_idx in implied:
+                    value = model.get(other if other > 0 else -other)
+                    if value is None:
+                        self.assign(other, model, clause_idx)
+                    elif value != (other > 0):
+                        self.counted = self.qhead
+                        self.propagations += self.qhead - start
+                        self.watch_visits += visits
+                        if self.budget is not None:
+                            self.budget.propagations += self.qhead - start
+                        self.qhead = len(trail)
+                        return clause_idx
+            
+            watch_list = watch_lists.get(literal)
+            if not watch_list:
+                continue
             
-            if new_watch_idx is not None:
-                if watch_num == 1:
-                    clause.watch1 = new_watch_idx
-                else:
-                    clause.watch2 = new_watch_idx
+            new_watch_list = []
+            i = 0
+            n = len(watch_list)
+            visits += n
+            while i < n:
+                clause_idx, watch_num = watch_list[i]
+                i += 1
+                clause = clauses[clause_idx]
+                other_idx = clause.watch2 if watch_num == 1 else clause.watch1
                 
-                new_lit = clause.literals[new_watch_idx]
-                neg = negate_literal(new_lit)
-                if neg not in self.watch_lists:
-                    self.watch_lists[neg] = []
-                self.watch_lists[neg].append((clause_idx, watch_num))
-            else:
-                new_watch_list.append((clause_idx, watch_num))
+                # Keep the watch while the other watched literal is true; a
+                # watch only rests on a false literal when no other literal
+                # could take it, which keeps backtracking watch-free.
+                other_val = None
+                if other_idx != -1:
+                    other = clause.literals[other_idx]
+                    other_val = model.get(other if other > 0 else -other)
+                    if other_val is not None and other_val == (other > 0):
+                        new_watch_list.append((clause_idx, watch_num))
+                        continue
+                
+                watched_idx = clause.watch1 if watch_num == 1 else clause.watch2
+                new_watch_idx = clause.update_watch(watched_idx, model)
                 
-                if clause.is_conflicting(model):
-                    self.watch_lists[literal] = new_watch_list
-                    return None, True
+                if new_watch_idx is not None:
+                    if watch_num == 1:
+                        clause.watch1 = new_watch_idx
+                    else:
+                        clause.watch2 = new_watch_idx
+                    neg = -clause.literals[new_watch_idx]
+                    if neg not in watch_lists:
+                        watch_lists[neg] = []
+                    watch_lists[neg].append((clause_idx, watch_num))
+                    continue
                 
-                unit = clause.get_unit_literal(model)
-                if unit and unit_literal is None:
-                    unit_literal = unit
+                new_watch_list.append((clause_idx, watch_num))
+                if other_idx == -1 or other_val is not None:
+                    new_watch_list.extend(watch_list[i:])
+                    watch_lists[literal] = new_watch_list
+                    self.counted = self.qhead
+                    self.propagations += self.qhead - start
+                    self.watch_visits += visits - (n - i)
+                    if self.budget is not None:
+                        self.budget.propagations += self.qhead - start
+                    self.qhead = len(trail)
+                    return clause_idx
+                self.assign(other, model, clause_idx)
+            
+            watch_lists[literal] = new_watch_list
         
-        self.watch_lists[literal] = new_watch_list
-        return unit_literal, False
+        self.counted = self.qhead
+        self.propagations += self.qhead - start
+        self.watch_visits += visits
+        if self.budget is not None:
+            self.budget.propagated(self.qhead - start)
+        return None
     
-    def is_satisfied(self, model: Dict[str, bool]) -> bool:
+    def _count(self, literal: int, counts: List[int], model: Dict[int, bool]) -> Optional[int]:
+        """Add a true literal to the counters of its constraints.
+        
+        Every counter is bumped before any is checked, so a conflict never
+        leaves the literal half counted for backtrack to undo.
+        
+        Args:
+            literal: Literal (int) just taken off the queue
+            counts: Indices (int) of the constraints containing it
+            model: Variable assignment dict to update
+        
+        Returns:
+            ~index (int) of a violated constraint, or None if no conflict
+        """
+        constraints = self.constraints
+        for c in counts:
+            constraints[c].true.append(literal)
+        for c in counts:
+            if len(constraints[c].true) >= constraints[c].k:
+                conflict = self._check_constraint(c, model)
+                if conflict is not None:
+                    return conflict
+        return None
+    
+    def _check_constraint(self, c: int, model: Dict[int, bool]) -> Optional[int]:
+        """Propagate a constraint whose counter has reached k.
+        
+        At k every other literal must be false: unassigned ones are assigned
+        false with reason ~c, and one already true but still queued is a
+        conflict. Past k the first k + 1 counted literals are the conflict.
+        
+        Args:
+            c: Index (int) of the constraint
+            model: Variable assignment dict to update
+        
+        Returns:
+            ~c (int) if the constraint is violated, None otherwise
+        """
+        constraint = self.constraints[c]
+        true = constraint.true
+        k = constraint.k
+        if len(true) > k:
+            self.constraint_conflict = WatchedClause([-lit for lit in true[:k + 1]])
+            return ~c
+        if len(true) < k:
+            return None
+        for lit in constraint.literals:
+            value = model.get(lit if lit > 0 else -lit)
+            if value is None:
+                self.assign(-lit, model, ~c)
+            elif value == (lit > 0) and lit not in true:
+                self.constraint_conflict = WatchedClause([-t for t in true] + [-lit])
+                return ~c
+        return None
+    
+    def _uncount(self, stop: int):
+        """Take the counted trail literals from stop onwards off the constraint counters.
+        
+        Args:
+            stop: Trail position (int) backtracking returns to
+        
+        Returns:
+            None
+        """
+        trail = self.trail
+        constraints = self.constraints
+        constraint_lists = self.constraint_lists
+        for i in range(self.counted - 1, stop - 1, -1):
+            counts = constraint_lists.get(trail[i])
+            if counts:
+                for c in counts:
+                    constraints[c].true.pop()
+    
+    def add_constraint(self, literals: List[int], k: int, model: Optional[Dict[int, bool]] = None) -> Optional[int]:
+        """Add an at-most-k constraint, propagated through a counter.
+        
+        Literals already counted on the trail are counted in right away,
+        so a constraint can be added at decision level 0 mid-search; a
+        counter that starts at k or above is checked at once.
+        
+        Args:
+            literals: List of distinct literals (int)
+            k: Maximum number (int) of true literals, at least 1
+            model: Variable assignment dict, needed once literals are assigned
+        
+        Returns:
+            ~index (int) if the constraint is already violated, None otherwise
+        """
+        c = len(self.constraints)
+        constraint = WatchedConstraint(list(literals), k)
+        self.constraints.append(constraint)
+        constraint_lists = self.constraint_lists
+        for lit in constraint.literals:
+            counts = constraint_lists.get(lit)
+            if counts is None:
+                constraint_lists[lit] = [c]
+            else:
+                counts.append(c)
+        if self.counted:
+            members = set(constraint.literals)
+            constraint.true = [lit for lit in self.trail[:self.counted] if lit in members]
+            if len(constraint.true) >= k:
+                return self._check_constraint(c, model)
+        return None
+    
+    def conflict_clause(self, conflict: int) -> WatchedClause:
+        """Return the clause behind a conflict reported by propagate.
+        
+        Args:
+            conflict: Index (int) returned by propagate
+        
+        Returns:
+            The falsified clause, or for a constraint a clause of the negated
+            true literals that violate it (WatchedClause)
+        """
+        if conflict >= 0:
+            return self.clauses[conflict]
+        return self.constraint_conflict
+    
+    def reason_clause(self, var: int) -> WatchedClause:
+        """Return the clause that implied an assigned variable.
+        
+        A constraint explains its implication lazily: the implied literal
+        together with the negations of the k true literals that reached the
+        counter first, which are still assigned while the implication is.
+        
+        Args:
+            var: Implied variable (int), whose reason is not None
+        
+        Returns:
+            Reason clause (WatchedClause) containing the implied literal
+        """
+        reason = self.reason[var]
+        if reason >= 0:
+            return self.clauses[reason]
+        constraint = self.constraints[~reason]
+        for lit in constraint.literals:
+            if lit == var or lit == -var:
+                break
+        return WatchedClause([-lit] + [-t for t in constraint.true[:constraint.k]])
+    
+    def assign_units(self, model: Dict[int, bool]) -> bool:
+        """Enqueue the literal of every unit clause.
+        
+        Args:
+            model: Variable assignment dict to update
+        
+        Returns:
+            False if a unit clause is already falsified, True otherwise
+        """
+        for idx, clause in enumerate(self.clauses):
+            if len(clause.literals) != 1:
+                continue
+            lit = clause.literals[0]
+            value = model.get(lit if lit > 0 else -lit)
+            if value is None:
+                self.assign(lit, model, idx)
+            elif value != (lit > 0):
+                return False
+        return True
+    
+    def is_satisfied(self, model: Dict[int, bool]) -> bool:
         """Check if all clauses are satisfied.
         
         Args:
-            model: Variable assignment mapping variable names to bool
+            model: Variable assignment mapping variables (int) to bool
         
         Returns:
             True if all clauses satisfied, False otherwise (bool)
         """
         return all(c.is_satisfied(model) for c in self.clauses)
     
-    def add_clause(self, literals: List[str]):
+    def remove_clauses(self, doomed: set):
+        """Delete clauses and compact the clause list.
+        
+        Surviving clauses keep their watches; indices shift down, so reasons
+        on the trail are remapped and the watch lists rebuilt. Clauses that
+        are reasons for current assignments must not be removed.
+        
+        Args:
+            doomed: Set of WatchedClause objects to delete
+        
+        Returns:
+            None
+        """
+        remap = {}
+        kept = []
+        for idx, clause in enumerate(self.clauses):
+            if clause in doomed:
+                continue
+            remap[idx] = len(kept)
+            kept.append(clause)
+        self.clauses = kept
+        
+        for lit in self.trail:
+            var = lit if lit > 0 else -lit
+            if self.reason[var] is not None and self.reason[var] >= 0:
+                self.reason[var] = remap[self.reason[var]]
+        
+        self.watch_lists = {}
+        self.implications = {}
+        self._build_watch_lists()
+    
+    def replace_clauses(self, clauses: List[List[int]]):
+        """Swap in a new clause list at decision level 0.
+        
+        Used by inprocessing once it has rewritten the formula. The new
+        clauses must not contain assigned literals, since fresh watches are
+        placed on their first two literals. Level-0 assignments keep their
+        values but lose their reasons, which conflict analysis never reads.
+        
+        Args:
+            clauses: List of clauses, each clause is a list of literals (int)
+        
+        Returns:
+            None
+        """
+        for lit in self.trail:
+            self.reason[lit if lit > 0 else -lit] = None
+        self.clauses = [WatchedClause(c) for c in clauses]
+        self.watch_lists = {}
+        self.implications = {}
+        self._build_watch_lists()
+    
+    def add_clause(self, literals: List[int]):
         """Add a new clause to the formula.
         
         Args:
-            literals: List of literals (str) forming the clause
+            literals: List of literals (int) forming the clause
         
         Returns:
             None
@@ -262,17 +707,4 @@ class WatchedFormula:
         clause = WatchedClause(literals)
         idx = len(self.clauses)
         self.clauses.append(clause)
-        
-        if clause.watch1 != -1:
-            lit = clause.literals[clause.watch1]
-            neg = negate_literal(lit)
-            if neg not in self.watch_lists:
-                self.watch_lists[neg] = []
-            self.watch_lists[neg].append((idx, 1))
-        
-        if clause.watch2 != -1:
-            lit = clause.literals[clause.watch2]
-            neg = negate_literal(lit)
-            if neg not in self.watch_lists:
-                self.watch_lists[neg] = []
-            self.watch_lists[neg].append((idx, 2))
+        self._watch(idx, clause)
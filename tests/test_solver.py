@@ -1,6 +1,40 @@
 import pytest
-from dpll.solver import solve, get_vars
-from dpll.verifier import verify
+from dpll.solver import solve, solve_with_stats, get_vars
+from dpll import verifier
+from dpll.verifier import verify, verify_many, CompiledFormula
+from dpll.helpers import VariableTable
+from dpll.watched_literals import WatchedFormula
+from dpll.arena import ArenaFormula
+from dpll.heuristics import Rephaser, VSIDSScorer
+from dpll.algorithms import solve_iterative, solve_cdcl, solve_bitset
+from dpll.clause_db import ClauseDatabase
+from dpll.restarts import LubyRestarts, GeometricRestarts, luby
+from dpll.preprocess import Preprocessor
+from dpll.inprocess import Prober
+from dpll.incremental import Solver
+from dpll.portfolio import solve_portfolio
+from dpll.cube import CubeGenerator, solve_cube_and_conquer
+from dpll.batch import solve_many
+from dpll.budget import Budget, UNKNOWN
+from dpll.cardinality import AtMostK, ExactlyOne
+from dpll.encodings import ENCODINGS, at_most_k, at_least_k, exactly_k, negate, unary_counter
+from app.sudoku.solver import solve_sudoku, solve_sudoku_batch, example_board
+from app.vertexcover.solver import (solve_vertex_cover, is_valid_cover, example_graph_1, example_graph_2,
+                                    example_graph_3)
+
+
+def pigeonhole(n):
+    """
+    Clauses putting n + 1 pigeons in n holes, which is UNSAT; pigeon i in
+    hole j is variable n * i + j + 1. The first clause makes pigeon 0 sit
+    somewhere, so dropping it leaves a SAT formula.
+    """
+    clauses = [[n * i + j + 1 for j in range(n)] for i in range(n + 1)]
+    for j in range(n):
+        for i1 in range(n + 1):
+            for i2 in range(i1 + 1, n + 1):
+                clauses.append([-(n * i1 + j + 1), -(n * i2 + j + 1)])
+    return clauses
 
 # ====================================================================
 # SATISFIABLE TEST CASES (Expected Result: True)
@@ -164,4 +198,791 @@ def test_branch_heavy_sat():
     ]
     vars_list = get_vars(clauses)
     assert verify(clauses, solve(vars_list, clauses, []))  == True
-    assert verify(clauses, solve(vars_list, clauses, ["unit"]))  == True
\ No newline at end of file
+    assert verify(clauses, solve(vars_list, clauses, ["unit"]))  == True
+
+# ====================================================================
+# LITERAL ENCODING TEST CASES
+# ====================================================================
+
+def test_integer_literals_sat():
+    """
+    DIMACS-style integer literals go straight to the engines and the
+    model comes back keyed by the same integers.
+    Formula: (1 or 2) and (-1 or 2) and (-2 or 3)
+    """
+    clauses = [
+        [1, 2],
+        [-1, 2],
+        [-2, 3]
+    ]
+    vars_list = get_vars(clauses)
+    assert vars_list == [1, 2, 3]
+    for heuristics in ([], ["unit"], ["unit", "pure"], ["2wl"], ["vsids"]):
+        model = solve(vars_list, clauses, heuristics)
+        assert model[2] is True and model[3] is True
+
+def test_variable_table_round_trip():
+    """String literals are interned to ints and decoded back unchanged."""
+    table = VariableTable(['A', 'B'])
+    clauses = [['A', '-B'], ['-C']]
+    assert table.encode_clauses(clauses) == [[1, -2], [-3]]
+    assert [table.decode_literal(lit) for lit in [1, -2, -3]] == ['A', '-B', '-C']
+    assert table.decode_model({1: True, 3: False}) == {'A': True, 'C': False}
+
+def test_verifier(monkeypatch):
+    """
+    Negative literals are satisfied by false variables, constraints are
+    counted, and a compiled formula checks a batch of models the same
+    way with and without NumPy.
+    """
+    clauses = [['A', '-B'], ['-A', 'C'], [-1, 2], AtMostK(['A', 'B', 'C'], 1)]
+    solutions = [{'A': False, 'B': False, 'C': True, 1: False}, {'A': True, 'B': False, 'C': True, 1: True, 2: True},
+                 {'A': True, 'B': False, 'C': False, 1: False}, {'B': False}, False, UNKNOWN]
+    expected = [True, False, False, False, False, False]
+    assert [verify(clauses, solution) for solution in solutions] == expected
+    assert verify_many(clauses, solutions) == expected
+    assert CompiledFormula([ExactlyOne(['A', 'B'])]).verify({'A': False, 'B': False}) is False
+    assert not CompiledFormula([[]]).verify({})
+    monkeypatch.setattr(verifier, "np", None)
+    assert verify_many(clauses, solutions) == expected
+
+# ====================================================================
+# CDCL TEST CASES
+# ====================================================================
+
+def test_cdcl_matches_dpll():
+    """The CDCL engine agrees with plain DPLL on the small formulas above."""
+    formulas = [
+        [['A', 'B'], ['-A', 'B'], ['-B', 'C']],
+        [['A'], ['-A', 'B'], ['-B', 'C'], ['-C']],
+        [['A', 'B'], ['-A', 'B'], ['A', '-B'], ['-A', '-B']],
+        [['A', '-B'], ['B', 'C'], ['-A', 'C']],
+        [['A'], []],
+        [],
+    ]
+    for clauses in formulas:
+        vars_list = get_vars(clauses)
+        expected = solve(vars_list, clauses, []) is not False
+        assert (solve(vars_list, clauses, ["cdcl"]) is not False) == expected
+
+def test_cdcl_learns_on_pigeonhole():
+    """
+    Three pigeons in two holes is UNSAT and needs several conflicts,
+    so the engine has to learn and backjump to refute it.
+    """
+    clauses = pigeonhole(2)
+    assert solve(get_vars(clauses), clauses, ["cdcl"]) is False
+
+def test_clause_db_reduction_keeps_answers():
+    """
+    Aggressive reduction and a tight memory ceiling delete learned clauses
+    mid-search; the compacted formula must still refute six pigeons in
+    five holes and the deletions must show up in the stats.
+    """
+    clauses = pigeonhole(5)
+    vars_list = get_vars(clauses)
+    for clause_db in (ClauseDatabase(reduce_interval=10, reduce_increment=0), ClauseDatabase(max_memory=20000)):
+        stats = {}
+        assert solve_cdcl(vars_list, clauses, {}, None, clause_db, stats) is None
+        assert stats['deleted'] > 0
+
+def test_memory_ceiling_below_locked_clauses():
+    """
+    A ceiling the locked clauses alone exceed defers the next ceiling
+    check by some conflicts instead of reducing at every decision.
+    """
+    clauses = pigeonhole(5)
+    clause_db = ClauseDatabase(max_memory=1)
+    assert solve_cdcl(get_vars(clauses), clauses, {}, None, clause_db) is None
+    assert clause_db.next_ceiling_check > 0 and clause_db.memory > clause_db.max_memory
+    assert not clause_db.should_reduce(clause_db.next_ceiling_check - 1)
+    assert clause_db.should_reduce(clause_db.next_ceiling_check)
+
+def test_learned_memory_ceiling_sat():
+    """A memory ceiling on learned clauses still lets solve find a model."""
+    clauses = pigeonhole(5)[1:]
+    assert solve(get_vars(clauses), clauses, ["cdcl"], max_learned_memory=20000) is not False
+
+def test_luby_sequence():
+    """The Luby restart sequence doubles its runs and starts over."""
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+def test_restarts_keep_solver_state():
+    """
+    In-place restarts unwind to level 0 on the same formula, so frequent
+    restarts still refute the pigeonhole formula and are counted in stats.
+    """
+    clauses = pigeonhole(4)
+    vars_list = get_vars(clauses)
+    for policy in (LubyRestarts(unit=1), GeometricRestarts(first=2)):
+        stats = {}
+        assert solve_cdcl(vars_list, clauses, {}, stats=stats, restart_policy=policy) is None
+        assert stats['restarts'] == policy.restarts > 0
+
+def test_iterative_restarts():
+    """solve_iterative restarts in place under a policy too."""
+    clauses = pigeonhole(4)
+    stats = {}
+    assert solve_iterative(get_vars(clauses), clauses, {}, stats=stats, restart_policy=LubyRestarts(unit=1)) is None
+    assert stats['restarts'] > 0
+
+def test_restart_policy_names():
+    """solve accepts every restart policy by name for 'cdcl' and 'restarts'."""
+    clauses = pigeonhole(4)
+    vars_list = get_vars(clauses)
+    for policy in ("luby", "geometric", "glucose"):
+        assert solve(vars_list, clauses, ["cdcl"], restart_policy=policy) is False
+        assert solve(vars_list, clauses[1:], ["restarts"], restart_policy=policy) is not False
+
+def test_phase_saving():
+    """Backtracking saves the polarity of undone assignments for later decisions."""
+    formula = WatchedFormula([[1, 2], [-1, 3]])
+    model = {}
+    formula.new_decision_level()
+    formula.assign(-1, model)
+    formula.propagate(model)
+    formula.backtrack(0, model)
+    assert model == {}
+    assert formula.phase_literal(1) == -1
+    assert formula.phase_literal(2) == 2
+    assert formula.phase_literal(3) == 3
+
+def test_rephase_engine_sat():
+    """The 'rephase' engine finds a model."""
+    clauses = [['A', 'B'], ['-A', 'B'], ['-B', 'C'], ['-C', '-A', 'D'], ['-D', 'A', 'B']]
+    vars_list = get_vars(clauses)
+    assert verify(clauses, solve(vars_list, clauses, ["rephase"])) == True
+
+def test_rephase_modes():
+    """Every rephase mode keeps the engine correct."""
+    php = pigeonhole(3)
+    for mode in ('original', 'inverted', 'best', 'random'):
+        rephaser = Rephaser(schedule=(mode,), interval=1, increment=0)
+        assert solve_iterative(get_vars(php), php, {}, rephaser=rephaser) is None
+        assert rephaser.rephases > 0
+
+def test_vsids_indexed_heap():
+    """
+    The scorer heap stays bounded by the variable count, follows increase
+    and decrease-key updates, reinserts unassigned variables and rescales
+    scores before the increment overflows.
+    """
+    scorer = VSIDSScorer([[1, 2, 3], [-1, 4], [2, -3, 4], [4]])
+    assert scorer.pick_variable({}) == 4
+    scorer.bump(3)
+    scorer.bump(3)
+    assert scorer.pick_variable({}) == 3
+    scorer.set_score(3, 0.0)
+    assert scorer.pick_variable({}) == 4
+    model = {4: True, 1: False}
+    assert scorer.pick_variable(model) == 2
+    del model[4]
+    scorer.unassign(4)
+    assert scorer.pick_variable(model) == 4
+    for _ in range(20000):
+        scorer.bump(1)
+        scorer.decay()
+    assert scorer.increment < VSIDSScorer.RESCALE_LIMIT
+    assert len(scorer.heap) <= 4
+    assert all(scorer.position[var] == i for i, var in enumerate(scorer.heap))
+
+def test_branching_heuristics_unsat():
+    """
+    Every branching heuristic plugs into the iterative, CDCL and recursive
+    watched-literal engines and refutes the pigeonhole formula.
+    """
+    php = pigeonhole(3)
+    vars_list = get_vars(php)
+    for name in ("vsids", "evsids", "lrb", "chb"):
+        assert solve(vars_list, php, [name]) is False
+        assert solve(vars_list, php, ["cdcl", name]) is False
+        assert solve(vars_list, php, ["2wl", name]) is False
+
+def test_branching_heuristics_sat():
+    """Every branching heuristic finds a model once a pigeon may stay out."""
+    php = pigeonhole(3)[1:]
+    vars_list = get_vars(php)
+    for name in ("vsids", "evsids", "lrb", "chb"):
+        assert solve(vars_list, php, ["cdcl", name]) is not False
+        assert solve(vars_list, php, ["2wl", name]) is not False
+
+def test_unknown_branching_heuristic():
+    """An unknown branching heuristic is rejected."""
+    php = pigeonhole(3)
+    with pytest.raises(ValueError):
+        solve(get_vars(php), php, ["cdcl", "nope"])
+
+def test_solve_with_stats():
+    """
+    Every engine reports its search counters and the phase times, and
+    solving with or without statistics gives the same answer.
+    """
+    php = pigeonhole(3)
+    vars_list = get_vars(php)
+    for heuristics in ([], ["unit"], ["2wl"], ["vsids"], ["restarts"], ["cdcl"], ["cdcl", "preprocess"]):
+        result, stats = solve_with_stats(vars_list, php, heuristics)
+        assert result is False and solve(vars_list, php, heuristics) is False
+        assert stats["decisions"] > 0 and stats["conflicts"] > 0
+        assert stats["time_search"] >= 0 and stats["time_encode"] >= 0
+
+def test_cdcl_stats():
+    """CDCL reports propagation, watch and learning counters."""
+    php = pigeonhole(3)
+    _, stats = solve_with_stats(get_vars(php), php, ["cdcl"])
+    assert stats["propagations"] > 0 and stats["watch_visits"] > 0 and stats["learned"] > 0
+
+def test_preprocess_stats():
+    """Preprocessing adds its own time and counters."""
+    php = pigeonhole(3)
+    _, stats = solve_with_stats(get_vars(php), php, ["cdcl", "preprocess"])
+    assert "time_preprocess" in stats and "eliminated" in stats
+
+def test_stats_on_sat():
+    """A model is decoded, timed and still satisfies the formula."""
+    php = pigeonhole(3)[1:]
+    result, stats = solve_with_stats(get_vars(php), php, ["cdcl"])
+    assert all(any(result[abs(lit)] == (lit > 0) for lit in clause) for clause in php)
+    assert "time_decode" in stats
+
+def test_budget_stops_every_engine():
+    """
+    An exhausted budget stops every engine with UNKNOWN, which is falsy but
+    not False.
+    """
+    php = pigeonhole(5)
+    vars_list = get_vars(php)
+    for heuristics in ([], ["unit"], ["pure"], ["unit", "pure"], ["2wl"], ["2wli"], ["vsids"],
+                       ["restarts"], ["probe"], ["cdcl"]):
+        budget = Budget(decisions=20)
+        assert solve(vars_list, php, heuristics, budget=budget) is UNKNOWN
+        assert budget.reason == "decisions" and not UNKNOWN
+
+def test_budget_limits():
+    """Each limit reports itself as the reason the search stopped."""
+    php = pigeonhole(5)
+    vars_list = get_vars(php)
+    budget = Budget(conflicts=5)
+    assert solve(vars_list, php, ["cdcl"], budget=budget) is UNKNOWN and budget.reason == "conflicts"
+    budget = Budget(propagations=10)
+    assert solve(vars_list, php, ["2wl"], budget=budget) is UNKNOWN and budget.reason == "propagations"
+    budget = Budget(time_limit=0)
+    assert solve(vars_list, php, [], budget=budget) is UNKNOWN and budget.reason == "time"
+
+def test_budget_cancel():
+    """Setting the cancel flag stops the search."""
+    import threading
+
+    php = pigeonhole(5)
+    cancel = threading.Event()
+    cancel.set()
+    budget = Budget(cancel=cancel)
+    assert solve(get_vars(php), php, ["cdcl"], budget=budget) is UNKNOWN and budget.reason == "cancelled"
+
+def test_budget_that_lasts():
+    """A budget that lasts gives the usual answer."""
+    php = pigeonhole(5)
+    assert solve(get_vars(php), php[:12], ["cdcl"], budget=Budget(time_limit=10))
+
+def test_budget_in_wrappers():
+    """The incremental, vertex cover, batch and portfolio APIs pass budgets through."""
+    php = pigeonhole(5)
+    vars_list = get_vars(php)
+    solver = Solver(php)
+    assert solver.solve(budget=Budget(conflicts=3)) is UNKNOWN
+    assert solver.solve() is False
+    assert solve_vertex_cover(example_graph_2, None, ["unit"], Budget(decisions=0)) is UNKNOWN
+    assert solve_vertex_cover(example_graph_2, None, ["incremental"], Budget(conflicts=0)) is UNKNOWN
+    assert list(solve_many([(vars_list, php)], ["cdcl"], workers=1, time_limit=0)) == [UNKNOWN]
+    assert solve_portfolio(vars_list, php, [["cdcl"]], workers=1, time_limit=0) is UNKNOWN
+
+# ====================================================================
+# PREPROCESSING TEST CASES
+# ====================================================================
+
+def test_preprocessing_shrinks_formula():
+    """Subsumption, self-subsumption and variable elimination shrink the formula."""
+    clauses = [[1, 2], [1, 2, 3], [-1, 2, 4], [-2, 5], [-5, 6], [-6, -4, 7], [3, -7]]
+    preprocessor = Preprocessor(clauses)
+    simplified = preprocessor.run()
+    assert preprocessor.stats['subsumed'] >= 1
+    assert preprocessor.stats['strengthened'] >= 1
+    assert preprocessor.stats['eliminated'] >= 1
+    assert len(simplified) < len(clauses)
+
+def test_preprocessing_extends_model():
+    """
+    The reconstruction stack turns a model of what is left into a model
+    of the original clauses.
+    """
+    clauses = [[1, 2], [1, 2, 3], [-1, 2, 4], [-2, 5], [-5, 6], [-6, -4, 7], [3, -7]]
+    preprocessor = Preprocessor(clauses)
+    simplified = preprocessor.run()
+    model = preprocessor.extend_model(solve_cdcl(get_vars(simplified), simplified, {}) or {})
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+def test_preprocessing_unsat():
+    """Preprocessing alone refutes a small contradiction."""
+    assert Preprocessor([[1, 2], [-1, 2], [1, -2], [-1, -2]]).run() is None
+
+def test_preprocess_heuristic():
+    """'preprocess' runs in front of the engines and keeps their answers correct."""
+    php = pigeonhole(3)
+    vars_list = get_vars(php)
+    for heuristics in (["preprocess"], ["cdcl", "preprocess"], ["2wl", "preprocess"]):
+        assert solve(vars_list, php, heuristics) is False
+        model = solve(vars_list, php[1:], heuristics)
+        assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in php[1:])
+
+def test_blocked_clause_elimination():
+    """
+    Blocked clauses are removed on their blocking literal and the
+    reconstruction stack repairs the model so every original clause,
+    including the removed ones, is satisfied.
+    """
+    # [1, 2] is blocked on 1: its only resolvent, with [-1, -2], is a tautology
+    clauses = [[1, 2], [-1, -2], [2, 3, 4], [-2, -3], [-4, 3, 5], [-5, -3]]
+    preprocessor = Preprocessor(clauses)
+    simplified = preprocessor.run(eliminate=False, block=True)
+    assert preprocessor.stats['blocked'] >= 2
+    assert preprocessor.stats['eliminated'] == 0
+    assert len(simplified) < len(clauses)
+    for witness, clause in preprocessor.stack:
+        assert witness in clause
+    model = preprocessor.extend_model({})
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+    named = [['A', 'B'], ['-A', '-B'], ['B', 'C'], ['-C', '-B', 'D'], ['-D', 'A']]
+    for heuristics in (["bce"], ["cdcl", "bce"], ["cdcl", "preprocess", "bce"]):
+        model = solve(get_vars(named), named, heuristics)
+        assert all(any(model[lit.lstrip('-')] == (not lit.startswith('-')) for lit in clause) for clause in named)
+
+def test_failed_literal_probing():
+    """Probing fixes the negation of a failed literal."""
+    # 1 implies both 2 and -2
+    formula = WatchedFormula([[-1, 2], [-1, -2], [2, 3]])
+    model = {}
+    prober = Prober()
+    assert prober.run(formula, model)
+    assert model[1] is False and prober.stats['failed'] == 1
+
+def test_equivalent_literals():
+    """
+    The SCC pass replaces equivalent literals by one representative, and
+    extend_model gives the substituted variables their value back.
+    """
+    # 3 -> 4 -> 5 -> 3 is a cycle
+    clauses = [[-3, 4], [-4, 5], [-5, 3], [3, 6, 7], [-6, -7]]
+    formula = WatchedFormula(clauses)
+    model = {}
+    prober = Prober()
+    assert prober.run(formula, model)
+    assert prober.representative == {4: 3, 5: 3}
+    assert all(abs(lit) not in (4, 5) for clause in formula.clauses for lit in clause.literals)
+    model.update({3: True, 6: False, 7: True})
+    prober.extend_model(model)
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+def test_probing_unsat():
+    """Probing alone refutes a small contradiction."""
+    assert Prober().run(WatchedFormula([[1, 2], [-1, -2], [1, -2], [-1, 2]]), {}) is False
+
+def test_probe_engine():
+    """Probing between restarts keeps the iterative engine correct."""
+    php = pigeonhole(3)
+    vars_list = get_vars(php)
+    prober = Prober()
+    assert solve_iterative(vars_list, php, {}, VSIDSScorer(php), restart_policy=GeometricRestarts(first=2),
+                           prober=prober) is None
+    assert prober.stats['probes'] > 0
+    assert solve(vars_list, php, ["probe"]) is False
+    model = solve(vars_list, php[1:], ["probe", "lrb"])
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in php[1:])
+
+# ====================================================================
+# INCREMENTAL TEST CASES
+# ====================================================================
+
+def test_incremental_assumptions():
+    """
+    The incremental solver answers a sequence of queries under different
+    assumptions and reports which of them failed.
+    """
+    solver = Solver([['A', 'B'], ['-A', 'C'], ['-B', 'C']])
+    model = solver.solve()
+    assert model['C'] is True
+    assert solver.solve(['-C']) is False
+    assert set(solver.failed_assumptions) == {'-C'}
+    assert solver.solve(['D', '-C', 'E']) is False
+    assert '-C' in solver.failed_assumptions and 'D' not in solver.failed_assumptions
+    model = solver.solve(['-A'])
+    assert model['A'] is False and model['B'] is True and model['C'] is True
+
+def test_incremental_add_clause():
+    """Clauses added between calls constrain every later query."""
+    solver = Solver([['A', 'B'], ['-A', 'C'], ['-B', 'C']])
+    solver.add_clause(['-C', 'D'])
+    assert solver.solve(['-D'])  is False
+    assert solver.solve(['D'])['D'] is True
+    solver.add_clause(['-D'])
+    assert solver.solve() is False and solver.failed_assumptions == []
+    assert solver.solve(['A']) is False
+
+def test_incremental_keeps_learned_clauses():
+    """Clauses learned under an assumption speed up the same query later."""
+    php = pigeonhole(3)
+    # Selector 13 switches the fourth pigeon on: UNSAT under 13, SAT without it
+    solver = Solver([clause + [-13] if i == 3 else clause for i, clause in enumerate(php)])
+    assert solver.solve([13]) is False and solver.failed_assumptions == [13]
+    learned = solver.stats['learned']
+    assert learned > 0
+    assert solver.solve([13]) is False
+    assert solver.stats['conflicts'] - learned < learned
+    assert solver.solve([-13]) is not False
+
+def test_incremental_vertex_cover():
+    """Descending bounds on one solver find minimum covers."""
+    for graph in (example_graph_1, example_graph_2, example_graph_3):
+        cover = solve_vertex_cover(graph, None, ["incremental"])
+        assert is_valid_cover(graph, cover)
+        assert len(cover) == len(solve_vertex_cover(graph, None, ["cdcl"]))
+    assert solve_vertex_cover(example_graph_2, 2, ["incremental"]) is False
+
+# ====================================================================
+# PARALLEL TEST CASES
+# ====================================================================
+
+def test_portfolio():
+    """The first configuration to finish answers for the portfolio."""
+    clauses = [['A', 'B'], ['-A', 'C'], ['-B', 'C'], ['-C', 'D']]
+    vars_list = get_vars(clauses)
+    configs = [["cdcl"], {"heuristics": ["cdcl", "lrb"], "seed": 1}, {"heuristics": ["probe"], "seed": 2}]
+    model, config = solve_portfolio(vars_list, clauses, configs, workers=2, return_config=True)
+    assert model['C'] is True and model['D'] is True
+    assert config in ({"heuristics": ["cdcl"]}, configs[1], configs[2])
+    assert solve_portfolio(vars_list, clauses + [['-D']], configs, workers=2) is False
+    assert solve_portfolio(vars_list, clauses, [["cdcl"]], workers=1)['D'] is True
+    with pytest.raises(ValueError):
+        solve_portfolio(vars_list, clauses, [{"heuristics": ["cdcl"], "sed": 1}])
+
+def test_portfolio_queues_configurations():
+    """
+    A configuration that fails is recorded and the next queued one takes
+    its worker; the error is raised only once every configuration failed.
+    """
+    clauses = [['A', 'B'], ['-A', 'C'], ['-B', 'C'], ['-C', 'D']]
+    vars_list = get_vars(clauses)
+    model, config = solve_portfolio(vars_list, clauses, [["nope"], ["cdcl"]], workers=1, return_config=True)
+    assert model['D'] is True and config == {"heuristics": ["cdcl"]}
+    assert solve_portfolio(vars_list, clauses, [["nope"], ["2wl"], ["nope"]], workers=2)['D'] is True
+    with pytest.raises(ValueError):
+        solve_portfolio(vars_list, clauses, [["nope"], ["cdcl", "nope"]], workers=1)
+
+def test_cube_generation():
+    """Cubes stay within the requested depth."""
+    cubes = CubeGenerator(pigeonhole(4)).generate(3)
+    assert 0 < len(cubes) <= 8 and all(len(cube) <= 3 for cube in cubes)
+
+def test_cube_lookahead_failed_literals():
+    """
+    A failed literal found after the best lookahead candidate may assign
+    that candidate; the split must then pick a variable that is still free.
+    """
+    clauses = [[19, 17, 13], [13, 7, -15], [-16, -18, -19], [-2, 16, -4], [19, -6, -8], [-15, -5, -7],
+               [-15, 5, 2], [15, -6, 2], [13, 14, -7], [6, -2, 7], [13, -6, -1], [19, -17, 8], [4, -18, 16],
+               [-14, -15, 18], [-6, -5, -9], [19, 15, -13]]
+    generator = CubeGenerator(clauses)
+    cubes = generator.generate(3)
+    assert cubes and generator.stats['failed'] > 0
+    assert all(len({abs(lit) for lit in cube}) == len(cube) for cube in cubes)
+    model = solve_cube_and_conquer(get_vars(clauses), clauses, workers=1, depth=3)
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+def test_cube_generation_deadline():
+    """Past the deadline the split stops and the root is the only cube."""
+    assert CubeGenerator(pigeonhole(4)).generate(3, deadline=0) == [[]]
+
+def test_cube_and_conquer_unsat():
+    """
+    Cubes cover the search space, so conquering them in or out of process
+    refutes an UNSAT formula, with every cube solved or pruned.
+    """
+    php = pigeonhole(4)
+    vars_list = get_vars(php)
+    for method in ("lookahead", "vsids"):
+        for workers in (1, 2):
+            stats = {}
+            assert solve_cube_and_conquer(vars_list, php, workers, 2, method, stats) is False
+            assert stats['solved'] + stats['pruned'] == stats['cubes']
+
+def test_cube_and_conquer_sat():
+    """A model found in one cube covers every variable."""
+    clauses = [['A', 'B', 'C'], ['-A', 'D'], ['-B', 'D'], ['-D', '-C'], ['E', '-A']]
+    vars_list = get_vars(clauses) + ['F']
+    for workers in (1, 2):
+        model = solve_cube_and_conquer(vars_list, clauses, workers=workers, depth=2)
+        assert set(model) == set(vars_list)
+        assert all(any(model[lit.lstrip('-')] != lit.startswith('-') for lit in clause) for clause in clauses)
+
+def test_solve_many():
+    """Batch results come back per instance, in order or tagged with their index."""
+    instances = [
+        (['A', 'B'], [['A', 'B'], ['-A', 'B']]),
+        ([1, 2], [[1], [-1]]),
+        ([1, 2, 3], [[1, 2], [-2, 3], [-3]]),
+    ] * 3
+    for workers in (1, 2):
+        results = list(solve_many(instances, ["cdcl"], workers=workers, chunksize=2))
+        assert [bool(result) for result in results] == [True, False, True] * 3
+        assert results[0]['B'] is True and results[2] == {1: True, 2: False, 3: False}
+        unordered = dict(solve_many(instances, ["cdcl"], workers=workers, chunksize=2, ordered=False))
+        assert [unordered[i] for i in range(len(instances))] == results
+    
+    board = [row[:] for row in example_board]
+    solved = [row[:] for row in example_board]
+    assert solve_sudoku_batch([board], ["cdcl"], workers=2) == [True]
+    assert solve_sudoku(solved, ["cdcl"]) and board == solved
+
+# ====================================================================
+# WATCHED LITERAL TEST CASES
+# ====================================================================
+
+def test_watched_engines_after_backtracking():
+    """
+    Backtracking leaves watches in place, so a watch resting on a false
+    literal must never hide a clause satisfied by an unwatched literal.
+    Formula: (B or -A) and (B or A or -A) and (-B or -B)
+    """
+    clauses = [
+        ['B', '-A'],
+        ['B', 'A', '-A'],
+        ['-B', '-B']
+    ]
+    vars_list = get_vars(clauses)
+    for heuristics in (["2wl"], ["2wli"], ["vsids"], ["restarts"], ["cdcl"]):
+        model = solve(vars_list, clauses, heuristics)
+        assert model == {'A': False, 'B': False}
+
+def test_propagate_drains_queue():
+    """One propagate() call assigns every literal implied by a decision."""
+    formula = WatchedFormula([[-1, 2], [-1, 3], [-2, -3, 4], [-4, 5]])
+    model = {}
+    formula.new_decision_level()
+    formula.assign(1, model)
+    assert formula.propagate(model) is None
+    assert model == {1: True, 2: True, 3: True, 4: True, 5: True}
+    formula.backtrack(0, model)
+    assert model == {} and formula.trail == []
+
+def test_binary_implications():
+    """
+    Binary clauses propagate through the implication lists instead of the
+    watch lists, keep their clause index as the reason, and report a
+    falsified binary clause as the conflict.
+    """
+    formula = WatchedFormula([[-1, 2], [-2, 3], [-3, -1], [1, 2, 3]])
+    assert all(idx == 3 for lst in formula.watch_lists.values() for idx, _ in lst)
+    model = {}
+    formula.assign(1, model)
+    assert formula.propagate(model) == 1
+    assert model[2] is True and model[3] is False
+    assert formula.reason[2] == 0 and formula.reason[3] == 2
+    
+    formula = WatchedFormula([[1, 2, 3]])
+    formula.add_clause([-1, 2])
+    model = {}
+    formula.assign(1, model)
+    assert formula.propagate(model) is None
+    assert model[2] is True and formula.reason[2] == 1
+
+def test_arena_formula():
+    """
+    The arena keeps every literal in one array with the watches in each
+    clause's first two slots, propagates like WatchedFormula, and backs
+    the watched-literal engines when solve is asked for it.
+    """
+    clauses = [[-1, 2, 3], [-2, -3, 4], [-4, 5], [1, 2, 3, 4]]
+    formula = ArenaFormula(clauses)
+    assert list(formula.arena) == [-1, 2, 3, -2, -3, 4, -4, 5, 1, 2, 3, 4]
+    assert list(formula.starts) == [0, 3, 6, 8] and list(formula.sizes) == [3, 3, 2, 4]
+    assert list(formula.watch_lists[1]) == [0] and formula.clauses[3].literals == [1, 2, 3, 4]
+    model = {}
+    formula.new_decision_level()
+    formula.assign(1, model)
+    formula.assign(-2, model)
+    assert formula.propagate(model) is None
+    assert model[3] is True and formula.reason[3] == 0 and formula.arena[0] == 3
+    formula.assign(4, model)
+    formula.assign(-5, model)
+    assert sorted(formula.conflict_clause(formula.propagate(model)).literals) == [-4, 5]
+    formula.backtrack(0, model)
+    assert model == {} and formula.is_satisfied({1: False, 2: True, 3: False, 4: True, 5: True})
+    
+    clauses = [["A", "B", "C"], ["-A", "-B"], ["-B", "-C", "D"], ["-D", "-A"], ["-C", "B"], ["A", "-D", "C"],
+               ExactlyOne(["A", "C", "E"])]
+    vars_list = get_vars(clauses)
+    for heuristics in (["2wl"], ["2wli"], ["2wl", "vsids"], ["lrb"], ["rephase"], ["restarts"], ["probe"]):
+        model = solve(vars_list, clauses, heuristics, arena=True)
+        assert model == solve(vars_list, clauses, heuristics)
+        assert model["A"] and not model["B"] and not model["D"]
+    assert solve(vars_list, clauses + [["-A"], ["-B"]], ["2wli"], arena=True) is False
+
+def test_arena_remove_clauses():
+    """
+    Deleting added clauses compacts the arena and remaps the reasons,
+    handles and watches of the clauses that stay.
+    """
+    formula = ArenaFormula([[1, 2, 3], [-1, -2, 3]])
+    formula.add_clause([-3, 4, 5])
+    formula.add_clause([-3, -4, 5])
+    formula.add_clause([-5, 6, 7])
+    kept, doomed, last = formula.clauses[2], formula.clauses[3], formula.clauses[4]
+    model = {}
+    formula.new_decision_level()
+    formula.assign(3, model)
+    formula.assign(-4, model)
+    assert formula.propagate(model) is None and formula.reason[5] == 2
+    formula.remove_clauses({doomed})
+    assert formula.clauses[2] is kept and kept.idx == 2 and last.idx == 3
+    assert list(formula.starts) == [0, 3, 6, 9] and sorted(kept.literals) == [-3, 4, 5]
+    assert formula.reason[5] == 2
+    formula.assign(-6, model)
+    assert formula.propagate(model) is None and model[7] is True and formula.reason[7] == 3
+
+def test_arena_cdcl():
+    """CDCL on the arena deletes learned clauses and keeps its answers."""
+    clauses = pigeonhole(5)
+    vars_list = get_vars(clauses)
+    stats = {}
+    clause_db = ClauseDatabase(reduce_interval=10, reduce_increment=0)
+    assert solve_cdcl(vars_list, clauses, {}, None, clause_db, stats, arena=True) is None
+    assert stats['deleted'] > 0
+    model = solve(vars_list, clauses[1:], ["cdcl"], max_learned_memory=20000, arena=True)
+    assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses[1:])
+
+def test_cardinality_constraints():
+    """
+    At-most-k counters force the remaining literals false at k, explain
+    their implications and conflicts as clauses, and give the same answers
+    natively as expanded to clauses.
+    """
+    formula = WatchedFormula([AtMostK([1, 2, 3, 4], 2), [-1, 5]])
+    model = {}
+    formula.new_decision_level()
+    formula.assign(1, model)
+    formula.assign(2, model)
+    assert formula.propagate(model) is None
+    assert model[3] is False and model[4] is False and model[5] is True
+    assert sorted(formula.reason_clause(3).literals) == [-3, -2, -1]
+    formula.backtrack(0, model)
+    assert model == {} and formula.constraints[0].true == []
+    formula.new_decision_level()
+    formula.assign(3, model)
+    formula.assign(4, model)
+    formula.assign(1, model)
+    conflict = formula.propagate(model)
+    assert conflict < 0 and sorted(formula.conflict_clause(conflict).literals) == [-4, -3, -1]
+
+    board = [[ExactlyOne([f"{r}{c}{n}" for n in range(3)]) for c in range(3)] for r in range(3)]
+    clauses = [group for row in board for group in row]
+    for n in range(3):
+        for r in range(3):
+            clauses.append(ExactlyOne([f"{r}{c}{n}" for c in range(3)]))
+            clauses.append(ExactlyOne([f"{c}{r}{n}" for c in range(3)]))
+    vars_list = get_vars(clauses)
+    for heuristics in (["cdcl"], ["2wl"], ["vsids"], ["unit"], ["probe"], ["cdcl", "preprocess"]):
+        model = solve(vars_list, clauses + [["000"], ["111"]], heuristics)
+        assert sum(model[var] for var in vars_list) == 9 and model["222"] is True
+        assert solve(vars_list, clauses + [["000"], ["111"], ["221"]], heuristics) is False
+    solver = Solver(clauses)
+    assert solver.solve(["000", "111", "221"]) is False
+    solver.add_constraint(AtMostK(["000", "011", "022"], 0))
+    model = solver.solve()
+    assert model["000"] is False and model["011"] is False and model["001"] != model["002"]
+    assert list(solve_many([(vars_list, clauses)], ["cdcl"], workers=2)) != [False]
+
+def test_cardinality_encodings():
+    """
+    Every clause encoding of at-most/at-least/exactly-k admits an
+    assignment of the inputs exactly when its count is within the bound,
+    and vertex cover finds the same minimum under each of them.
+    """
+    literals = [1, -2, 3, 4, -5, 6]
+    for encoding in ENCODINGS:
+        for k in range(len(literals) + 1):
+            for encode, holds in ((at_most_k, lambda count: count <= k), (at_least_k, lambda count: count >= k),
+                                  (exactly_k, lambda count: count == k)):
+                clauses = encode(literals, k, encoding)
+                for mask in range(0, 1 << len(literals), 5):
+                    units = [[lit if mask >> i & 1 else -lit] for i, lit in enumerate(literals)]
+                    model = solve(get_vars(clauses + units), clauses + units, ["cdcl"])
+                    assert (model is not False) == holds(bin(mask).count("1")), (encoding, encode, k, mask)
+        cover = solve_vertex_cover(example_graph_2, None, ["cdcl"], encoding=encoding)
+        assert len(cover) == 3 and is_valid_cover(example_graph_2, cover)
+    assert len(at_most_k([f"x{i}" for i in range(30)], 15, "sequential")) < 1000
+
+def test_unary_counter():
+    """Assuming an output of the unary counter false caps the count at its index."""
+    literals = [1, -2, 3, 4, -5]
+    clauses, outputs = unary_counter(literals)
+    assert len(outputs) == len(literals)
+    for mask in range(1 << len(literals)):
+        units = [[lit if mask >> i & 1 else -lit] for i, lit in enumerate(literals)]
+        for k, output in enumerate(outputs):
+            model = solve(get_vars(clauses + units), clauses + units + [[negate(output)]], ["cdcl"])
+            assert (model is not False) == (bin(mask).count("1") <= k)
+
+def test_backjump_skips_unrelated_decisions():
+    """
+    Variables 1-3 are free; 4 and 5 clash whatever they are. Chronological
+    backtracking re-refutes 4/5 under every assignment of 1-3, backjumping
+    refutes it once and stops.
+    """
+    clauses = [[1, 2, 3], [4, 5], [4, -5], [-4, 5], [-4, -5]]
+    vars_list = [1, 2, 3, 4, 5]
+    chronological, backjump = {}, {}
+    assert solve_iterative(vars_list, clauses, {}, None, 0, False, chronological) is None
+    assert solve_iterative(vars_list, clauses, {}, None, 0, True, backjump) is None
+    assert backjump['decisions'] < chronological['decisions']
+
+# ====================================================================
+# BITSET TEST CASES
+# ====================================================================
+
+def test_bitset_propagates_and_branches():
+    """
+    The bitmask engine propagates units to a fixpoint, branches on the
+    first unsatisfied clause and reports its counters.
+    """
+    clauses = [[1, 2, 3], [-1, 2], [-2, 3], [-3, -4], [4, 5], [-5, 1], [6, -6]]
+    stats = {}
+    model = solve_bitset([1, 2, 3, 4, 5, 6], clauses, {}, stats)
+    assert model == {1: True, 2: True, 3: True, 4: False, 5: True, 6: False}
+    assert stats == {'decisions': 1, 'conflicts': 0, 'propagations': 4}
+
+def test_bitset_unsat():
+    """The bitmask engine refutes UNSAT formulas, directly and through solve."""
+    clauses = [[1, 2, 3], [-1, 2], [-2, 3], [-3, -4], [4, 5], [-5, 1], [-2]]
+    assert solve_bitset([1, 2, 3, 4, 5], clauses, {}) is None
+    php = pigeonhole(2)
+    assert solve(get_vars(php), php, ["bitset"]) is False
+
+def test_bitset_initial_model():
+    """The bitmask engine extends the initial assignment it is given."""
+    assert solve_bitset([1, 2], [[1, 2]], {1: False}) == {1: False, 2: True}
+
+def test_bitset_is_opt_in():
+    """Only 'bitset' runs the bitmask engine; 'unit' keeps its own search."""
+    clauses = [[1, 2, 3], [-1, 2], [-2, 3], [-3, -4], [4, 5], [-5, 1], [6, -6]]
+    _, stats = solve_with_stats([1, 2, 3, 4, 5, 6], clauses, ["bitset"])
+    assert 'time_search' in stats and stats['decisions'] == 1
+    _, stats = solve_with_stats([1, 2, 3, 4, 5, 6], clauses, ["unit"])
+    assert stats['decisions'] == 2
+
+def test_auto_heuristic():
+    """'auto' runs the bitmask engine on small formulas and CDCL on larger ones."""
+    clauses = [[1, 2, 3], [-1, 2], [-2, 3], [-3, -4], [4, 5], [-5, 1], [6, -6]]
+    model, stats = solve_with_stats([1, 2, 3, 4, 5, 6], clauses, ["auto"])
+    assert model[3] is True and 'watch_visits' not in stats
+    php = pigeonhole(6)
+    result, stats = solve_with_stats(get_vars(php), php, ["auto"])
+    assert result is False and stats['learned'] > 0